@@ -0,0 +1,92 @@
+"""
+Records a synthetic Sherlock contest into a response archive and replays it.
+
+    python benchmarks/bench_archive.py [--issues 5000] [--polls 500] [--changes 3]
+
+Every poll re-judges `--changes` random issues, the way a contest evolves
+over a judging window. The script reports the archive size against the raw
+JSON volume, the time to open (index) the archive, and the time to rebuild
+the report at every archived poll.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Import the package from this checkout, installed or not.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_family_assembly import SyntheticSherlockAPI
+
+from submission_analyzer.archive import ArchiveReader, ArchiveWriter
+from submission_analyzer.platforms.sherlock.connector import SherlockConnector
+
+CONTEST_ID = 0
+ENDPOINTS = {
+    "titles": f"/api/contest/{CONTEST_ID}/issue_titles",
+    "judge": f"/api/judge/{CONTEST_ID}",
+    "contest": f"/api/contests/{CONTEST_ID}",
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--issues", type=int, default=5_000)
+    parser.add_argument("--polls", type=int, default=500)
+    parser.add_argument("--changes", type=int, default=3)
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    synthetic = SyntheticSherlockAPI(args.issues, max(args.issues // 20, 1))
+    members = [
+        member
+        for family in synthetic.judge["families"]
+        for member in (family["main"], *family["duplicates"])
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "contest.sarc"
+        writer = ArchiveWriter(path)
+        raw_bytes = 0
+        started = time.perf_counter()
+        for poll in range(args.polls):
+            for member in rnd.sample(members, min(args.changes, len(members))):
+                member["escalation_resolved"] = not member["escalation_resolved"]
+            payloads = {
+                "titles": synthetic.getTitles(),
+                "judge": synthetic.getJudge(),
+                "contest": synthetic.getContest(),
+            }
+            for name, payload in payloads.items():
+                body = json.dumps(payload).encode()
+                raw_bytes += len(body)
+                writer.append(ENDPOINTS[name], body, timestamp=float(poll))
+        recorded = time.perf_counter()
+        size = path.stat().st_size
+        print(
+            f"recorded {args.polls} polls in {recorded - started:.2f}s: "
+            f"{raw_bytes / 1e6:.1f} MB of JSON -> {size / 1e6:.2f} MB on disk "
+            f"({raw_bytes / size:.0f}x)"
+        )
+
+        started = time.perf_counter()
+        with ArchiveReader(path) as reader:
+            indexed = time.perf_counter()
+            print(f"opened archive in {(indexed - started) * 1000:.1f} ms")
+            polls = reader.timestamps(ENDPOINTS["judge"])
+            for at in polls:
+                SherlockConnector(CONTEST_ID, None, replay=reader.view(at)).build_report()
+            replayed = time.perf_counter()
+        print(
+            f"rebuilt {len(polls)} reports in {replayed - indexed:.2f}s "
+            f"({(replayed - indexed) / len(polls) * 1000:.1f} ms per poll)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Times Sherlock report assembly on a synthetic spam-heavy contest.
+
+    python benchmarks/bench_family_assembly.py [--issues 50000] [--family-size 5000]
+
+The contest has one family of `--family-size` members, a handful of large
+families and many small ones, which is the shape that used to make
+`SherlockIssue.add_duplicate` quadratic.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Import the package from this checkout, installed or not.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from submission_analyzer.platforms.sherlock.connector import SherlockConnector
+
+
+class SyntheticSherlockAPI:
+    def __init__(self, issues: int, family_size: int, seed: int = 0):
+        rnd = random.Random(seed)
+        self.titles = {
+            str(i): {"number": i, "title": f"Synthetic issue {i}"}
+            for i in range(1, issues + 1)
+        }
+        ids = list(range(1, issues + 1))
+        rnd.shuffle(ids)
+        sizes = [family_size] + [family_size // 10] * 5
+        families = []
+        start = 0
+        while start < len(ids):
+            size = sizes.pop(0) if sizes else rnd.randint(1, 8)
+            members = ids[start : start + size]
+            start += size
+            families.append(
+                {
+                    "primary_severity": rnd.choice((1, 2, 3)),
+                    "main": self._member(members[0], rnd),
+                    "duplicates": [self._member(m, rnd) for m in members[1:]],
+                }
+            )
+        self.judge = {"families": families}
+
+    @staticmethod
+    def _member(issue: int, rnd: random.Random) -> dict:
+        escalated = rnd.random() < 0.05
+        return {
+            "issue": issue,
+            "was_submitted_by_user": rnd.random() < 0.001,
+            "has_escalation_comment": escalated,
+            "escalation_resolved": escalated and rnd.random() < 0.5,
+        }
+
+    def getTitles(self):
+        return self.titles
+
+    def getJudge(self):
+        return self.judge
+
+    def getContest(self):
+        return {"prize_pool": 100_000}
+
+    def getDiscussions(self, issueId):
+        return {"comments": []}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--issues", type=int, default=50_000)
+    parser.add_argument("--family-size", type=int, default=5_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    api = SyntheticSherlockAPI(args.issues, args.family_size)
+    connector = SherlockConnector(0, None, api=api)
+
+    for round_no in range(1, args.rounds + 1):
+        started = time.perf_counter()
+        report = connector.build_report()
+        built = time.perf_counter()
+        report.snapshot()
+        done = time.perf_counter()
+        print(
+            f"round {round_no}: build_report {built - started:.3f}s | "
+            f"snapshot {done - built:.3f}s | "
+            f"{report.total_issues} issues, {len(report.findings)} families"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Measures CLI start-up cost with `python -X importtime`.
+
+    python benchmarks/bench_import_time.py [--rounds 5] [--top 10] [--max-ms 150]
+
+Each entry point module is imported in a fresh interpreter; the script
+reports the median cumulative import time, the slowest imports and whether
+any of the lazily imported dependencies (requests, Sentry, Telegram) were
+pulled in. With `--max-ms` it exits non-zero when a module is over budget
+or one of them is imported eagerly. The test suite runs the same check
+(tests/test_import_time.py) with a generous time bound.
+"""
+from __future__ import annotations
+
+import argparse
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Import the package from this checkout, installed or not.
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+ENTRY_POINTS = (
+    "submission_analyzer.platforms.sherlock.main",
+    "submission_analyzer.platforms.code4rena.main",
+)
+
+# Only needed once a refresh runs (requests) or when SENTRY_DSN / BOT_TOKEN
+# are configured; tests/test_import_time.py checks the same in the suite.
+LAZY_MODULES = ("requests", "sentry_sdk", "telegram")
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds of every module `module` loads."""
+    pythonpath = [str(REPO_ROOT), os.environ.get("PYTHONPATH", "")]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, pythonpath))}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    # Measure imports the way an installed package runs them: from bytecode,
+    # even when PYTHONDONTWRITEBYTECODE kept the checkout from caching it.
+    compileall.compile_dir(REPO_ROOT / "submission_analyzer", quiet=1)
+
+    failed = False
+    for module in ENTRY_POINTS:
+        runs = [import_times(module) for _ in range(args.rounds)]
+        total_ms = statistics.median(run[module] for run in runs) / 1000
+        eager = [name for name in LAZY_MODULES if name in runs[0]]
+        print(f"{module}: {total_ms:.1f} ms (median of {args.rounds})")
+        slowest = sorted(
+            (item for item in runs[0].items() if not module.startswith(item[0])),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        for name, micros in slowest[: args.top]:
+            print(f"    {micros / 1000:8.1f} ms  {name}")
+        if eager:
+            print(f"    eagerly imported: {', '.join(eager)}")
+        if args.max_ms is not None and (total_ms > args.max_ms or eager):
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
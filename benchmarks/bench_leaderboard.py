@@ -0,0 +1,136 @@
+"""
+Times the Code4rena leaderboard on a synthetic audit with many wardens.
+
+    python benchmarks/bench_leaderboard.py [--submissions 50000] [--wardens 5000] [--repeat 5]
+
+Submission pages are served from memory through the connector's replay hook,
+so the timings cover decoding, tallying and the grouped per-warden pass but
+no network. A plain report and a `--leaderboard` report are built from the
+same pages. A warden's leaderboard reward must match the plain report's
+"my reward" for that handle and the payouts must fit in the prize pool; the
+script exits non-zero when they don't.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+# Import the package from this checkout, installed or not.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from submission_analyzer.platforms.code4rena.connector import Code4renaConnector
+
+CONTEST_ID = "bench"
+PER_PAGE = 100
+PRIZE_POOL = 100_000.0
+
+
+class SyntheticPages:
+    """Stands in for an ArchiveView: every submissions page, pre-encoded."""
+
+    def __init__(self, submissions: int, wardens: int, seed: int = 0):
+        rnd = random.Random(seed)
+        subs = []
+        finding = 0
+        while len(subs) < submissions:
+            finding += 1
+            size = min(rnd.choice((1, 1, 2, 3, 5, 8, 20, 60)), submissions - len(subs))
+            severity = rnd.choice(("high", "medium", "medium", "low"))
+            validity = rnd.choice(("valid", "valid", "invalid"))
+            for k in range(size):
+                number = len(subs) + 1
+                subs.append(
+                    {
+                        "uid": f"S-{number}",
+                        "number": number,
+                        "title": f"Submission {number}",
+                        "severity": severity,
+                        "user": {"handle": f"warden{rnd.randrange(wardens)}"},
+                        "evaluations": [{"uid": "e"}],
+                        "latestEvaluations": {"severity": severity, "validity": validity},
+                        "finding": {"uid": f"F-{finding}", "duplicates": size},
+                        "isPrimary": k == 0,
+                    }
+                )
+        self.pages: dict[str, bytes] = {}
+        for start in range(0, len(subs), PER_PAGE):
+            page = start // PER_PAGE + 1
+            more = start + PER_PAGE < len(subs)
+            body = {
+                "data": {"submissions": subs[start : start + PER_PAGE]},
+                "pagination": {"nextPage": page + 1 if more else None},
+            }
+            endpoint = f"/api/v1/audits/{CONTEST_ID}/submissions?perPage={PER_PAGE}&page={page}"
+            self.pages[endpoint] = json.dumps(body).encode()
+
+    def get(self, endpoint: str) -> bytes:
+        return self.pages[endpoint]
+
+
+def best_of(repeat: int, *builds) -> list[tuple[float, object]]:
+    """Best time of each build; runs are interleaved so drift hits all alike."""
+    best = [(math.inf, None)] * len(builds)
+    for _ in range(repeat):
+        for i, build in enumerate(builds):
+            started = time.perf_counter()
+            report = build()
+            elapsed = time.perf_counter() - started
+            if elapsed < best[i][0]:
+                best[i] = (elapsed, report)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--submissions", type=int, default=50_000)
+    parser.add_argument("--wardens", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = SyntheticPages(args.submissions, args.wardens)
+    plain = Code4renaConnector(
+        CONTEST_ID, "", "", prize_pool=PRIZE_POOL, handle="warden0", replay=pages
+    )
+    board = Code4renaConnector(
+        CONTEST_ID,
+        "",
+        "",
+        prize_pool=PRIZE_POOL,
+        handle="warden0",
+        replay=pages,
+        leaderboard=True,
+    )
+    (plain_time, _), (board_time, report) = best_of(
+        args.repeat, plain.build_report, board.build_report
+    )
+
+    print(
+        f"{args.submissions} submissions, {len(report.findings)} findings, "
+        f"{len(report.leaderboard)} wardens"
+    )
+    print(f"report:             {plain_time * 1e3:8.1f} ms")
+    print(
+        f"report+leaderboard: {board_time * 1e3:8.1f} ms "
+        f"(+{(board_time - plain_time) * 1e3:.1f} ms)"
+    )
+    for rank, standing in enumerate(report.ranked_leaderboard()[:3], start=1):
+        print(f"  #{rank} {standing.handle}: ${standing.reward:,.2f}")
+
+    me = report.leaderboard.get("warden0")
+    if me is not None and not math.isclose(me.reward, report.my_reward, abs_tol=1e-6):
+        sys.exit(f"warden0: leaderboard ${me.reward:.2f} != report ${report.my_reward:.2f}")
+    paid = math.fsum(standing.reward for standing in report.leaderboard.values())
+    if paid > PRIZE_POOL + 1e-6:
+        sys.exit(f"leaderboard pays out ${paid:,.2f} of a ${PRIZE_POOL:,.2f} pool")
+    # The rest is the extra shares of wardens who submitted the same finding
+    # twice: each warden is paid one share per finding.
+    print(f"paid out: ${paid:,.2f} of ${PRIZE_POOL:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
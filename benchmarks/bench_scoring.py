@@ -0,0 +1,93 @@
+"""
+Times incremental scoring against full recomputation.
+
+    python benchmarks/bench_scoring.py [--issues 20000] [--polls 200] [--changes 3] [--seed 0]
+
+A synthetic Sherlock contest is polled repeatedly while a few random
+families change between polls (severity flips, duplicates moving between
+families, families appearing or disappearing). Each poll is built by a
+long-lived connector, which re-scores only changed families, and by a fresh
+connector, which scores everything. Both the scoring step alone and the
+whole poll are timed: the models are rebuilt from the payloads every poll
+either way, so the whole-poll saving is much smaller than the scoring one.
+That both agree is checked by tests/test_scoring.py.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Import the package from this checkout, installed or not.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_family_assembly import SyntheticSherlockAPI
+
+from submission_analyzer.platforms.sherlock.connector import SherlockConnector
+
+
+def mutate(judge: dict, rnd: random.Random, changes: int) -> None:
+    families = judge["families"]
+    for _ in range(changes):
+        kind = rnd.random()
+        family = rnd.choice(families)
+        if kind < 0.4:
+            family["primary_severity"] = rnd.choice((1, 2, 3))
+        elif kind < 0.8 and family["duplicates"]:
+            target = rnd.choice(families)
+            target["duplicates"].append(family["duplicates"].pop())
+        elif kind < 0.9 and len(families) > 1:
+            families.remove(family)
+            judge.setdefault("_removed", []).append(family)
+        elif judge.get("_removed"):
+            families.append(judge["_removed"].pop())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--issues", type=int, default=20_000)
+    parser.add_argument("--polls", type=int, default=200)
+    parser.add_argument("--changes", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    api = SyntheticSherlockAPI(args.issues, max(args.issues // 50, 2), seed=args.seed)
+    incremental = SherlockConnector(0, None, api=api)
+
+    scoring = {"incremental": 0.0, "full": 0.0}
+    polls = {"incremental": 0.0, "full": 0.0}
+    titles_raw = json.dumps(api.getTitles())
+    for _ in range(args.polls):
+        mutate(api.judge, rnd, args.changes)
+        judge_raw = json.dumps(api.getJudge())
+        for name, connector in (
+            ("incremental", incremental),
+            ("full", SherlockConnector(0, None, api=api)),
+        ):
+            started = time.perf_counter()
+            # Decode the payloads and build fresh models, as a real poll does.
+            issues = connector._parse_issues(json.loads(titles_raw))
+            findings = connector._build_findings(
+                issues, connector._extract_families(json.loads(judge_raw))
+            )
+            scored = time.perf_counter()
+            total = connector._assign_points(findings)
+            connector._assign_rewards(findings, total, 100_000)
+            finished = time.perf_counter()
+            scoring[name] += finished - scored
+            polls[name] += finished - started
+
+    print(
+        f"{args.polls} polls | scoring: incremental {scoring['incremental'] * 1000:.1f} ms, "
+        f"full {scoring['full'] * 1000:.1f} ms | whole poll: incremental "
+        f"{polls['incremental'] * 1000:.1f} ms, full {polls['full'] * 1000:.1f} ms "
+        f"(last poll re-scored {incremental.scorer.last_changed} families)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import ast
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from types import CodeType
+from typing import Any, NamedTuple
+
+from submission_analyzer.export import ChangeTracker
+from submission_analyzer.table import ContestSummary, ContestTable, TableRow
+
+# What a rule is evaluated against, and the fields it may use.
+SCOPES: dict[str, tuple[str, ...]] = {
+    "issue": TableRow._fields,
+    "report": ContestSummary._fields,
+}
+# Besides fields and these, rules can use `old` (the previous poll's
+# values) and, for issues, `new` (the issue appeared this poll).
+FUNCTIONS = {"abs": abs, "min": min, "max": max, "round": round}
+
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BoolOp, ast.And, ast.Or,
+    ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.In, ast.NotIn,
+    ast.IfExp, ast.Call, ast.Name, ast.Load, ast.Attribute, ast.Constant,
+    ast.Tuple, ast.List,
+)  # fmt: skip
+
+# The "previous values" of an issue that appeared this poll.
+_EMPTY_ROW = TableRow("", "", "none", False, 0, "", False, False, False, 0.0, 0.0)
+
+
+def add_alert_args(parser) -> None:
+    parser.add_argument(
+        "--alert",
+        action="append",
+        default=[],
+        metavar="RULE",
+        help=(
+            "Notify only when RULE matches a change, instead of on every change. "
+            "RULE is `[NAME =] issue|report: EXPRESSION`, e.g. "
+            "'issue: mine and escalation_resolved and not old.escalation_resolved' or "
+            "'reward = report: abs(my_reward - old.my_reward) > 0.05 * old.my_reward'. "
+            "Repeatable."
+        ),
+    )
+    parser.add_argument(
+        "--alerts",
+        metavar="FILE",
+        default=None,
+        help="Read alert rules from FILE, one per line (lines starting with # are skipped).",
+    )
+
+
+def compile_alert_args(args) -> list[AlertRule]:
+    """Compile `--alert` / `--alerts`; raises ValueError (or OSError) on a bad rule."""
+    lines = list(args.alert)
+    if args.alerts:
+        lines.extend(Path(args.alerts).read_text(encoding="utf-8").splitlines())
+    return [
+        compile_rule(line)
+        for line in lines
+        if line.strip() and not line.lstrip().startswith("#")
+    ]
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    name: str
+    scope: str
+    source: str
+    code: CodeType
+    # Fields the expression reads, current or `old.`; it only runs when
+    # one of them changed.
+    fields: frozenset[str]
+
+
+def compile_rule(text: str) -> AlertRule:
+    head, sep, source = text.partition(":")
+    name, _, scope = head.rpartition("=")
+    scope, source = scope.strip(), source.strip()
+    if not sep or scope not in SCOPES:
+        raise ValueError(
+            f"alert rule {text!r} must look like `[NAME =] issue|report: EXPRESSION`"
+        )
+    name = name.strip() or source
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as exc:
+        raise ValueError(f"alert rule {name!r}: {exc.msg}") from None
+    fields = _referenced_fields(tree, SCOPES[scope], name)
+    if not fields:
+        raise ValueError(f"alert rule {name!r} doesn't use any {scope} field")
+    return AlertRule(
+        name=name,
+        scope=scope,
+        source=source,
+        code=compile(tree, f"<alert {name}>", "eval"),
+        fields=frozenset(fields),
+    )
+
+
+def _referenced_fields(tree: ast.AST, fields: tuple[str, ...], name: str) -> set[str]:
+    """Reject anything but plain expressions over the scope's fields."""
+    referenced: set[str] = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"alert rule {name!r}: {type(node).__name__} is not allowed")
+        if isinstance(node, ast.Attribute):
+            if not (isinstance(node.value, ast.Name) and node.value.id == "old"):
+                raise ValueError(f"alert rule {name!r}: only old.FIELD attributes are allowed")
+            if node.attr not in fields:
+                raise ValueError(f"alert rule {name!r}: unknown field old.{node.attr}")
+            referenced.add(node.attr)
+        elif isinstance(node, ast.Call):
+            if not (isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS):
+                raise ValueError(
+                    f"alert rule {name!r}: only {', '.join(FUNCTIONS)} can be called"
+                )
+            if node.keywords:
+                raise ValueError(f"alert rule {name!r}: keyword arguments are not allowed")
+        elif isinstance(node, ast.Name):
+            if node.id in fields:
+                referenced.add(node.id)
+            elif node.id == "new":
+                if "issue_id" not in fields:
+                    raise ValueError(f"alert rule {name!r}: `new` only applies to issue rules")
+                # An issue's id only "changes" when the issue appears.
+                referenced.add("issue_id")
+            elif node.id not in FUNCTIONS and node.id != "old":
+                raise ValueError(
+                    f"alert rule {name!r}: unknown name {node.id!r} "
+                    f"(fields: {', '.join(fields)})"
+                )
+    return referenced
+
+
+class AlertEngine:
+    """
+    Compiled alert rules of one contest. Each poll, a ChangeTracker picks
+    the issues whose row changed since the previous poll, and `evaluate`
+    runs a rule only on those (and on the contest totals) where a field the
+    rule reads changed, so rules only see the changes, not every issue. The
+    first poll only records the baseline.
+    """
+
+    def __init__(self, rules: Iterable[AlertRule]):
+        self.rules = list(rules)
+        self._index: dict[str, dict[str, list[AlertRule]]] = {scope: {} for scope in SCOPES}
+        for rule in self.rules:
+            for field in rule.fields:
+                self._index[rule.scope].setdefault(field, []).append(rule)
+        self._changes = ChangeTracker()
+        # Each issue's row as of the previous poll, for `old.`.
+        self._rows: dict[str, TableRow] = {}
+        self._summary: ContestSummary | None = None
+
+    def evaluate(self, table: ContestTable) -> list[str]:
+        """Messages of the rules matched by what changed since the last call."""
+        messages: list[str] = []
+        summary = table.summary()
+        if self._summary is not None:
+            messages.extend(self._match("report", summary, self._summary, "contest"))
+        self._summary = summary
+
+        if self._index["issue"]:
+            rows = self._rows
+            for event, issue_id, row in self._changes.diff(table.rows(), _issue_id):
+                if event == "removed":
+                    del rows[issue_id]
+                    continue
+                if event == "added":
+                    messages.extend(
+                        self._match("issue", row, _EMPTY_ROW, f"issue {issue_id}", new=True)
+                    )
+                elif event == "changed":
+                    messages.extend(self._match("issue", row, rows[issue_id], f"issue {issue_id}"))
+                rows[issue_id] = row
+        return messages
+
+    def _match(
+        self,
+        scope: str,
+        current: NamedTuple,
+        old: NamedTuple,
+        label: str,
+        new: bool = False,
+    ) -> Iterator[str]:
+        index = self._index[scope]
+        if new:
+            changed = set(current._fields)
+        else:
+            changed = {
+                field
+                for field, now, before in zip(current._fields, current.snapshot(), old.snapshot())
+                if now != before
+            }
+        # Each rule once, in definition order.
+        candidates = {id(rule): rule for field in changed for rule in index.get(field, ())}
+        if not candidates:
+            return
+        namespace: dict[str, Any] = {**FUNCTIONS, **current._asdict(), "old": old, "new": new}
+        for rule in sorted(candidates.values(), key=self.rules.index):
+            try:
+                matched = eval(rule.code, {"__builtins__": {}}, namespace)
+            except Exception:
+                # e.g. comparing against a missing value; not a match.
+                continue
+            if matched and new:
+                yield f"{rule.name}: {label} (new)"
+            elif matched:
+                details = ", ".join(
+                    f"{field} {_format_value(getattr(old, field))} → "
+                    f"{_format_value(getattr(current, field))}"
+                    for field in sorted(rule.fields & changed)
+                )
+                yield f"{rule.name}: {label} ({details})"
+
+
+def _issue_id(row: TableRow) -> str:
+    return row.issue_id
+
+
+def _format_value(value: Any) -> str:
+    return f"{value:,.2f}" if isinstance(value, float) else str(value)
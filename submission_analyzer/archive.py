@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+import mmap
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+FILE_MAGIC = b"SAARCHV1"
+# timestamp, endpoint length, flags, body length, stored length
+RECORD_HEADER = struct.Struct("<dHBII")
+FLAG_REPEAT = 1
+
+
+def add_archive_args(parser) -> None:
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--archive",
+        metavar="PATH",
+        default=None,
+        help="Append every raw API response to a compressed archive at PATH.",
+    )
+    group.add_argument(
+        "--replay",
+        metavar="PATH",
+        default=None,
+        help="Build the report from an archive written by --archive instead of the network.",
+    )
+    parser.add_argument(
+        "--replay-at",
+        metavar="WHEN",
+        type=parse_when,
+        default=None,
+        help="With --replay: use the responses as of WHEN (epoch seconds or ISO date). Defaults to the latest.",
+    )
+
+
+def open_archive_args(args) -> tuple[ArchiveWriter | None, ArchiveView | None]:
+    """The (recorder, replay source) selected by `--archive` / `--replay`."""
+    archive = ArchiveWriter(args.archive) if args.archive else None
+    replay = ArchiveReader(args.replay).view(args.replay_at) if args.replay else None
+    return archive, replay
+
+
+def parse_when(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def archive_key(url: str) -> str:
+    """Endpoint a response is archived under: the URL without its host."""
+    parts = urlsplit(url)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+
+@dataclass(frozen=True)
+class ArchiveEntry:
+    endpoint: str
+    timestamp: float
+    offset: int
+    stored_size: int
+    size: int
+
+
+class ArchiveWriter:
+    """
+    Append-only archive of raw responses. Each record is a small fixed header,
+    the endpoint and the zlib-compressed body; a body identical to the
+    previous one this writer stored for the same endpoint is recorded as a
+    header-only repeat, so polling an unchanged contest costs a few bytes per
+    request.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], level: int = 6):
+        self.path = Path(path)
+        self.level = level
+        self._last_digest: dict[str, bytes] = {}
+
+    def append(self, endpoint: str, body: bytes, timestamp: float | None = None) -> None:
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        repeat = self._last_digest.get(endpoint) == digest
+        stored = b"" if repeat else zlib.compress(body, self.level)
+        name = endpoint.encode()
+        header = RECORD_HEADER.pack(
+            time.time() if timestamp is None else timestamp,
+            len(name),
+            FLAG_REPEAT if repeat else 0,
+            len(body),
+            len(stored),
+        )
+        # Opened per record: nothing to close, and a crash loses at most the
+        # record being written (readers skip a truncated tail).
+        with open(self.path, "ab") as fh:
+            if fh.tell() == 0:
+                fh.write(FILE_MAGIC)
+            fh.write(header + name + stored)
+        self._last_digest[endpoint] = digest
+
+
+class ArchiveReader:
+    """
+    Memory-mapped view of an archive. Opening it only walks the record
+    headers to build a per-endpoint index; bodies are decompressed one at a
+    time when requested.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]):
+        self.path = Path(path)
+        self._entries: dict[str, list[ArchiveEntry]] = {}
+        self._timestamps: dict[str, list[float]] = {}
+        with open(self.path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        if self._map is not None and self._map[: len(FILE_MAGIC)] != FILE_MAGIC:
+            raise ValueError(f"{self.path} is not a submission archive")
+        self._index()
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self) -> ArchiveReader:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def endpoints(self) -> list[str]:
+        return list(self._entries)
+
+    def entries(self, endpoint: str) -> list[ArchiveEntry]:
+        return self._entries.get(endpoint, [])
+
+    def timestamps(self, endpoint: str) -> list[float]:
+        return self._timestamps.get(endpoint, [])
+
+    def latest(self, endpoint: str, at: float | None = None) -> ArchiveEntry | None:
+        entries = self._entries.get(endpoint)
+        if not entries:
+            return None
+        if at is None:
+            return entries[-1]
+        pos = bisect.bisect_right(self._timestamps[endpoint], at)
+        return entries[pos - 1] if pos else None
+
+    def read(self, entry: ArchiveEntry) -> bytes:
+        stored = self._map[entry.offset : entry.offset + entry.stored_size]
+        return zlib.decompress(stored)
+
+    def view(self, at: float | None = None) -> ArchiveView:
+        return ArchiveView(self, at)
+
+    def _index(self) -> None:
+        data = self._map
+        if data is None:
+            return
+        end = len(data)
+        offset = len(FILE_MAGIC)
+        while offset + RECORD_HEADER.size <= end:
+            timestamp, name_len, flags, size, stored_size = RECORD_HEADER.unpack_from(
+                data, offset
+            )
+            name_start = offset + RECORD_HEADER.size
+            body_start = name_start + name_len
+            if body_start + stored_size > end:
+                break  # truncated tail from an interrupted write
+            endpoint = data[name_start:body_start].decode()
+            entries = self._entries.setdefault(endpoint, [])
+            if flags & FLAG_REPEAT and entries:
+                previous = entries[-1]
+                entry = ArchiveEntry(
+                    endpoint, timestamp, previous.offset, previous.stored_size, previous.size
+                )
+            else:
+                entry = ArchiveEntry(endpoint, timestamp, body_start, stored_size, size)
+            entries.append(entry)
+            self._timestamps.setdefault(endpoint, []).append(timestamp)
+            offset = body_start + stored_size
+
+
+class ArchiveView:
+    """The archived responses as they were at `at` (the latest when None)."""
+
+    def __init__(self, reader: ArchiveReader, at: float | None = None):
+        self.reader = reader
+        self.at = at
+
+    def get(self, endpoint: str) -> bytes:
+        entry = self.reader.latest(endpoint, self.at)
+        if entry is None:
+            raise LookupError(f"{endpoint} is not in archive {self.reader.path}")
+        return self.reader.read(entry)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import heapq
+import shutil
+import sys
+from collections import Counter
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from typing import Any, TextIO, TypeVar
+
+from submission_analyzer.profiling import phase
+
+T = TypeVar("T")
+
+CLEAR_SCREEN = "\033[2J\033[H"
+CLEAR_LINE = "\033[K"
+DISABLE_WRAP = "\033[?7l"
+ENABLE_WRAP = "\033[?7h"
+
+
+def select_page(
+    items: Iterable[T],
+    *,
+    key: Callable[[T], Any],
+    limit: int | None = None,
+    page: int = 1,
+    reverse: bool = False,
+) -> list[T]:
+    """
+    Return the `page`-th block of `limit` items in `key` order.
+    Only the first `page * limit` items are ever ordered (bounded heap), so
+    showing the top rows of a large contest does not sort every finding.
+    """
+    if not limit or limit <= 0:
+        return sorted(items, key=key, reverse=reverse)
+    page = max(page, 1)
+    select = heapq.nlargest if reverse else heapq.nsmallest
+    selected = select(page * limit, items, key=key)
+    return selected[(page - 1) * limit :]
+
+
+def stale_banner(saved_at: float) -> str:
+    saved = datetime.fromtimestamp(saved_at).strftime("%d/%m/%Y - %H:%M:%S")
+    return f"STALE as of {saved} — refreshing…"
+
+
+def changed_rows(previous: list[str], lines: list[str]) -> list[str]:
+    """
+    `lines` reduced to what differs from `previous`: the header row, then
+    rows that disappeared (`-`) and rows that are new (`+`).
+    """
+    old = Counter(previous[1:])
+    new = Counter(lines[1:])
+    removed = old - new
+    added = new - old
+    if not removed and not added:
+        return [f"{lines[0]} — no changes since the cached report"]
+    rows = [f"{lines[0]} — changes since the cached report:"]
+    for line in previous[1:]:
+        if removed[line]:
+            removed[line] -= 1
+            rows.append(f"- {line}")
+    for line in lines[1:]:
+        if added[line]:
+            added[line] -= 1
+            rows.append(f"+ {line}")
+    return rows
+
+
+@phase("render")
+def render_report(
+    report: Any,
+    args: Any,
+    format_report: Callable[[Any, Any], list[str]],
+    dashboard: LiveDashboard | None = None,
+    *,
+    banner: str | None = None,
+    previous: list[str] | None = None,
+) -> list[str]:
+    """
+    Print `report` as formatted by `format_report` (or draw it on
+    `dashboard`) and return the rendered rows. `banner` replaces the
+    timestamp row (e.g. to mark a stale report); with `previous`, plain
+    output only shows the rows that changed since those rows were printed.
+    """
+    lines = format_report(report, args)
+    if banner is not None:
+        lines[0] = banner
+    if dashboard is not None:
+        dashboard.draw(lines)
+        return lines
+    shown = changed_rows(previous, lines) if previous is not None else lines
+    sys.stdout.write("\n".join(shown) + "\n")
+    sys.stdout.flush()
+    return lines
+
+
+class LiveDashboard:
+    """
+    Keeps a report on screen and repaints only the rows that changed between
+    frames. Each frame is assembled in memory and flushed with a single write.
+    """
+
+    def __init__(self, stream: TextIO | None = None):
+        self.stream = stream or sys.stdout
+        self._previous: list[str] = []
+
+    def draw(self, lines: list[str]) -> None:
+        height = shutil.get_terminal_size().lines
+        lines = lines[: max(height - 1, 1)]
+
+        buffer: list[str] = []
+        if not self._previous:
+            buffer.append(DISABLE_WRAP + CLEAR_SCREEN)
+        for row, line in enumerate(lines):
+            if row < len(self._previous) and self._previous[row] == line:
+                continue
+            buffer.append(f"\033[{row + 1};1H{line}{CLEAR_LINE}")
+        for row in range(len(lines), len(self._previous)):
+            buffer.append(f"\033[{row + 1};1H{CLEAR_LINE}")
+        buffer.append(f"\033[{len(lines) + 1};1H")
+
+        self.stream.write("".join(buffer))
+        self.stream.flush()
+        self._previous = list(lines)
+
+    def invalidate(self) -> None:
+        """Force a full repaint on the next frame (e.g. after stray output)."""
+        self._previous = []
+
+    def close(self) -> None:
+        self.stream.write(ENABLE_WRAP)
+        self.stream.flush()
+
+
+def add_dashboard_args(parser) -> None:
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help="Keep the report on screen and redraw only the rows that change.",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=None,
+        help="Only show the N highest-ranked findings (page size for --page).",
+    )
+    parser.add_argument(
+        "--page",
+        type=int,
+        default=1,
+        help="Page of --top findings to show (default: 1).",
+    )
+    parser.add_argument(
+        "--no-warm-start",
+        dest="warm_start",
+        action="store_false",
+        help="With -t, don't show the last cached report while the first refresh runs.",
+    )
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, TextIO
+
+EXPORT_FORMATS = ("table", "jsonl", "csv")
+EVENT_FIELDS = ("event", "contest_id")
+
+
+def add_export_args(parser) -> None:
+    parser.add_argument(
+        "--format",
+        choices=EXPORT_FORMATS,
+        default="table",
+        help=(
+            "Output format. jsonl/csv stream one record per issue/finding "
+            "(one record per change event with -t) instead of the table. Records "
+            "are written once each refresh is scored, since rewards depend on "
+            "every finding's points."
+        ),
+    )
+    parser.add_argument(
+        "--schema",
+        choices=("platform", "contest"),
+        default="platform",
+        help=(
+            "Record layout for jsonl/csv: the platform's own issue/finding fields, or "
+            "the cross-platform contest table (same columns for every platform)."
+        ),
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="Write jsonl/csv records to this file instead of stdout.",
+    )
+
+
+class RecordWriter:
+    """Writes flat records as JSON lines or CSV rows, one at a time."""
+
+    def __init__(
+        self,
+        fmt: str,
+        stream: TextIO,
+        fieldnames: Iterable[str],
+        close_stream: bool = False,
+    ):
+        if fmt not in ("jsonl", "csv"):
+            raise ValueError(f"Unsupported export format: {fmt}")
+        self.format = fmt
+        self.stream = stream
+        self.fieldnames = tuple(fieldnames)
+        self._close_stream = close_stream
+        self._csv: csv.DictWriter | None = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(
+                stream, fieldnames=self.fieldnames, extrasaction="ignore"
+            )
+            self._csv.writeheader()
+
+    def write(self, record: dict[str, Any]) -> None:
+        if self._csv is not None:
+            self._csv.writerow({k: _csv_value(v) for k, v in record.items()})
+        else:
+            self.stream.write(json.dumps(record, default=str) + "\n")
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        except BrokenPipeError:
+            # The reading end of the pipe went away; silence the final flush
+            # the interpreter performs on exit.
+            os.dup2(os.open(os.devnull, os.O_WRONLY), self.stream.fileno())
+        if self._close_stream:
+            self.stream.close()
+
+
+def open_record_writer(
+    fmt: str, path: str | None, fieldnames: Iterable[str]
+) -> RecordWriter:
+    if path:
+        stream = open(path, "w", encoding="utf-8", newline="")
+        return RecordWriter(fmt, stream, fieldnames, close_stream=True)
+    return RecordWriter(fmt, sys.stdout, fieldnames)
+
+
+class ChangeTracker:
+    """
+    Remembers a digest of every exported item's snapshot so later polls only
+    yield the items that were added, changed or removed since the previous
+    one. That is one integer per item, not a copy of the report; with
+    `track=False` (one-shot runs) nothing is kept at all.
+    """
+
+    def __init__(self, track: bool = True):
+        self.track = track
+        self._digests: dict[str, int] | None = None
+
+    def diff(
+        self, items: Iterable[Any], key: Callable[[Any], str]
+    ) -> Iterator[tuple[str, str, Any | None]]:
+        previous = self._digests
+        current: dict[str, int] | None = {} if self.track else None
+        for item in items:
+            item_key = key(item)
+            if previous is None:
+                if current is not None:
+                    current[item_key] = hash(item.snapshot())
+                yield "snapshot", item_key, item
+                continue
+            digest = hash(item.snapshot())
+            current[item_key] = digest
+            old = previous.pop(item_key, None)
+            if old is None:
+                yield "added", item_key, item
+            elif old != digest:
+                yield "changed", item_key, item
+        for item_key in previous or ():
+            yield "removed", item_key, None
+        self._digests = current
+
+
+def export_changes(
+    writer: RecordWriter | None,
+    tracker: ChangeTracker,
+    items: Iterable[Any],
+    *,
+    key: Callable[[Any], str],
+    key_field: str = "id",
+    contest_id: Any,
+) -> list[tuple[str, str]]:
+    """
+    Diff `items` against the previous poll, streaming one record per change
+    to `writer` (when given). A removed item's record only holds its key,
+    under `key_field` (the record field `key` reads). Returns the
+    `(event, key)` pairs of the changes.
+    """
+    changed: list[tuple[str, str]] = []
+    for event, item_key, item in tracker.diff(items, key):
+        changed.append((event, item_key))
+        if writer is None:
+            continue
+        record = item.to_record() if item is not None else {key_field: item_key}
+        writer.write({"event": event, "contest_id": contest_id, **record})
+    if writer is not None:
+        writer.flush()
+    return changed
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (list, tuple, dict)):
+        return json.dumps(value, default=str)
+    return value
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from typing import Any
+
+FIRST_RETRY_DELAY = 10.0
+MAX_RETRY_DELAY = 300.0
+
+
+class RefreshHealth:
+    """
+    Consecutive refresh failures of a watcher. While failures persist the
+    watcher is degraded: it keeps its last good report and retries on a
+    doubling schedule capped at `max_delay` seconds.
+    """
+
+    def __init__(
+        self,
+        first_delay: float = FIRST_RETRY_DELAY,
+        max_delay: float = MAX_RETRY_DELAY,
+    ):
+        self.first_delay = first_delay
+        self.max_delay = max_delay
+        self.failures = 0
+        self.last_success: float | None = None
+        self.last_error: str | None = None
+        self.next_delay: float = 0.0
+
+    @property
+    def degraded(self) -> bool:
+        return self.failures > 0
+
+    def succeeded(self) -> int:
+        """Record a good refresh; returns how many failures it ended."""
+        ended = self.failures
+        self.failures = 0
+        self.last_error = None
+        self.next_delay = 0.0
+        self.last_success = time.time()
+        return ended
+
+    def failed(self, exc: BaseException) -> float:
+        """Record a failed refresh; returns the delay before the next attempt."""
+        self.failures += 1
+        self.last_error = str(exc) or type(exc).__name__
+        self.next_delay = min(
+            self.first_delay * 2 ** (self.failures - 1), self.max_delay
+        )
+        return self.next_delay
+
+    def banner(self) -> str:
+        since = (
+            datetime.fromtimestamp(self.last_success).strftime("%d/%m/%Y - %H:%M:%S")
+            if self.last_success
+            else "never"
+        )
+        return (
+            f"STALE as of {since} — {self.failures} failed refreshes, "
+            f"retrying in {self.next_delay:.0f}s ({self.last_error})"
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "status": "degraded" if self.degraded else "ok",
+            "failures": self.failures,
+            "last_success": self.last_success,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any
+
+DEFAULT_LEASE = 120.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    platform TEXT NOT NULL,
+    contest_id TEXT NOT NULL,
+    options TEXT NOT NULL,
+    interval REAL NOT NULL,
+    due REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    failures INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    PRIMARY KEY (platform, contest_id)
+);
+CREATE INDEX IF NOT EXISTS jobs_due ON jobs (due);
+CREATE TABLE IF NOT EXISTS results (
+    platform TEXT NOT NULL,
+    contest_id TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    finished_at REAL NOT NULL,
+    changed_at REAL NOT NULL,
+    digest TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    report TEXT NOT NULL,
+    PRIMARY KEY (platform, contest_id)
+);
+"""
+
+
+@dataclass(frozen=True)
+class Job:
+    """A contest to refresh every `interval` seconds (once, when 0)."""
+
+    platform: str
+    contest_id: str
+    options: dict[str, Any]
+    interval: float
+    due: float
+    lease_owner: str | None = None
+    lease_expires: float | None = None
+    failures: int = 0
+    last_error: str | None = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.platform}:{self.contest_id}"
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> Job:
+        return cls(
+            platform=row["platform"],
+            contest_id=row["contest_id"],
+            options=json.loads(row["options"]),
+            interval=row["interval"],
+            due=row["due"],
+            lease_owner=row["lease_owner"],
+            lease_expires=row["lease_expires"],
+            failures=row["failures"],
+            last_error=row["last_error"],
+        )
+
+
+@dataclass(frozen=True)
+class JobResult:
+    """The latest report published for a contest."""
+
+    platform: str
+    contest_id: str
+    worker: str
+    finished_at: float
+    changed_at: float
+    digest: str
+    summary: str
+    report: dict[str, Any]
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> JobResult:
+        return cls(
+            platform=row["platform"],
+            contest_id=row["contest_id"],
+            worker=row["worker"],
+            finished_at=row["finished_at"],
+            changed_at=row["changed_at"],
+            digest=row["digest"],
+            summary=row["summary"],
+            report=json.loads(row["report"]),
+        )
+
+
+class JobQueue:
+    """
+    Refresh jobs shared by any number of worker processes through one SQLite
+    file (WAL mode, so it also works for workers on one host or a shared
+    local disk).
+
+    A contest is queued at most once: adding it again updates its options
+    and interval. A worker claims a due job together with a lease; until the
+    lease expires, no other worker gets that contest, and a worker that died
+    mid-refresh simply lets it lapse. Completing or failing a job only takes
+    effect until another worker claimed it, so a worker that stalled past
+    its lease can't overwrite the result of the one that took over.
+
+    Calls may come from any thread (a worker runs them through
+    `asyncio.to_thread`, since one can wait up to `timeout` for the write
+    lock); they share one connection and take turns on it.
+    """
+
+    def __init__(self, path: str | Path, timeout: float = 30.0):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            self.path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # IMMEDIATE takes the write lock up front, so two workers can't both
+        # read the same job as free.
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def _fetch(self, sql: str, params: tuple[Any, ...] = ()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def add(
+        self,
+        platform: str,
+        contest_id: Any,
+        options: dict[str, Any] | None = None,
+        interval: float = 0.0,
+    ) -> bool:
+        """Queue a contest, due now; returns False when it was already queued."""
+        with self._transaction() as db:
+            updated = db.execute(
+                "UPDATE jobs SET options = ?, interval = ? WHERE platform = ? AND contest_id = ?",
+                (json.dumps(options or {}), interval, platform, str(contest_id)),
+            ).rowcount
+            if not updated:
+                db.execute(
+                    "INSERT INTO jobs (platform, contest_id, options, interval, due) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (platform, str(contest_id), json.dumps(options or {}), interval, time.time()),
+                )
+        return not updated
+
+    def remove(self, platform: str, contest_id: Any) -> bool:
+        with self._transaction() as db:
+            return bool(
+                db.execute(
+                    "DELETE FROM jobs WHERE platform = ? AND contest_id = ?",
+                    (platform, str(contest_id)),
+                ).rowcount
+            )
+
+    def claim(self, worker: str, lease: float = DEFAULT_LEASE) -> Job | None:
+        """Lease the most overdue job no one else holds, if any is due."""
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT * FROM jobs WHERE due <= ? "
+                "AND (lease_owner IS NULL OR lease_expires <= ?) "
+                "ORDER BY due LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET lease_owner = ?, lease_expires = ? "
+                "WHERE platform = ? AND contest_id = ?",
+                (worker, now + lease, row["platform"], row["contest_id"]),
+            )
+        return replace(Job.from_row(row), lease_owner=worker, lease_expires=now + lease)
+
+    def renew(self, job: Job, lease: float = DEFAULT_LEASE) -> bool:
+        """Extend `job`'s lease; False when it was lost to another worker."""
+        with self._transaction() as db:
+            return bool(
+                db.execute(
+                    "UPDATE jobs SET lease_expires = ? "
+                    "WHERE platform = ? AND contest_id = ? AND lease_owner = ?",
+                    (time.time() + lease, job.platform, job.contest_id, job.lease_owner),
+                ).rowcount
+            )
+
+    def complete(self, job: Job, report: dict[str, Any], summary: str, digest: str) -> bool | None:
+        """
+        Publish `job`'s report and release it until its next run (or drop a
+        one-off job). Returns whether the report changed since the last
+        published one, or None when the lease was lost and nothing was done.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            if not self._holds(db, job):
+                return None
+            previous = db.execute(
+                "SELECT digest, changed_at FROM results WHERE platform = ? AND contest_id = ?",
+                (job.platform, job.contest_id),
+            ).fetchone()
+            changed = previous is None or previous["digest"] != digest
+            db.execute(
+                "INSERT OR REPLACE INTO results "
+                "(platform, contest_id, worker, finished_at, changed_at, digest, summary, report) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.platform,
+                    job.contest_id,
+                    job.lease_owner,
+                    now,
+                    now if changed else previous["changed_at"],
+                    digest,
+                    summary,
+                    json.dumps(report, default=str),
+                ),
+            )
+            self._release(db, job, due=now + job.interval)
+        return changed
+
+    def fail(self, job: Job, error: str, retry_in: float) -> bool:
+        """Release `job` after a failed refresh, due again in `retry_in` seconds."""
+        with self._transaction() as db:
+            if not self._holds(db, job):
+                return False
+            self._release(db, job, due=time.time() + retry_in, error=error)
+        return True
+
+    def _holds(self, db: sqlite3.Connection, job: Job) -> bool:
+        # An expired lease is still ours until another worker claims the job.
+        row = db.execute(
+            "SELECT lease_owner FROM jobs WHERE platform = ? AND contest_id = ?",
+            (job.platform, job.contest_id),
+        ).fetchone()
+        return row is not None and row["lease_owner"] == job.lease_owner
+
+    def _release(
+        self,
+        db: sqlite3.Connection,
+        job: Job,
+        due: float,
+        error: str | None = None,
+    ) -> None:
+        if job.interval <= 0 and error is None:
+            db.execute(
+                "DELETE FROM jobs WHERE platform = ? AND contest_id = ?",
+                (job.platform, job.contest_id),
+            )
+            return
+        db.execute(
+            "UPDATE jobs SET due = ?, lease_owner = NULL, lease_expires = NULL, "
+            "failures = CASE WHEN ? IS NULL THEN 0 ELSE failures + 1 END, last_error = ? "
+            "WHERE platform = ? AND contest_id = ?",
+            (due, error, error, job.platform, job.contest_id),
+        )
+
+    def next_due(self) -> float | None:
+        """When the earliest unleased job is due (now or in the past when ready)."""
+        now = time.time()
+        (row,) = self._fetch(
+            "SELECT MIN(CASE WHEN lease_owner IS NULL OR lease_expires <= ? "
+            "THEN due ELSE MAX(due, lease_expires) END) AS due FROM jobs",
+            (now,),
+        )
+        return row["due"]
+
+    def jobs(self) -> list[Job]:
+        rows = self._fetch("SELECT * FROM jobs ORDER BY due")
+        return [Job.from_row(row) for row in rows]
+
+    def results(self) -> list[JobResult]:
+        rows = self._fetch("SELECT * FROM results ORDER BY platform, contest_id")
+        return [JobResult.from_row(row) for row in rows]
+
+    def result(self, platform: str, contest_id: Any) -> JobResult | None:
+        rows = self._fetch(
+            "SELECT * FROM results WHERE platform = ? AND contest_id = ?",
+            (platform, str(contest_id)),
+        )
+        return JobResult.from_row(rows[0]) if rows else None
@@ -2,9 +2,6 @@ from __future__ import annotations
 
 import os
 
-import sentry_sdk
-from sentry_sdk.integrations.asyncio import AsyncioIntegration
-
 
 def setup_sentry():
     """
@@ -15,6 +12,10 @@ def setup_sentry():
     if not dsn:
         return
 
+    # Imported here: sentry_sdk is slow to import and most runs have no DSN.
+    import sentry_sdk
+    from sentry_sdk.integrations.asyncio import AsyncioIntegration
+
     sentry_sdk.init(
         dsn=dsn,
         integrations=[AsyncioIntegration()],
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from .queue import coalesce_messages
+
+
+@dataclass
+class ChangeEvent:
+    platform: str
+    contest_id: Any
+    summary: str
+    created_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def event_key(event: ChangeEvent) -> tuple[str, str]:
+    """Events are only coalesced with events of the same contest."""
+    return event.platform, str(event.contest_id)
+
+
+def merge_events(events: list[ChangeEvent]) -> ChangeEvent:
+    """One event for a batch of one contest's events (see `event_key`)."""
+    latest = events[-1]
+    return ChangeEvent(
+        platform=latest.platform,
+        contest_id=latest.contest_id,
+        summary=coalesce_messages([event.summary for event in events]),
+        created_at=latest.created_at,
+    )
+
+
+class Notifier:
+    """
+    A sink for change events. Subclasses implement `send` and may tune how
+    their queue batches (`coalesce_window`) and paces (`min_interval`) sends.
+    """
+
+    name = "notifier"
+    coalesce_window = 0.0
+    min_interval = 0.0
+
+    async def send(self, event: ChangeEvent) -> None:
+        raise NotImplementedError
+
+
+NotifierFactory = Callable[[str | None], Notifier]
+
+NOTIFIERS: dict[str, NotifierFactory] = {}
+
+
+def register_notifier(name: str) -> Callable[[NotifierFactory], NotifierFactory]:
+    def decorator(factory: NotifierFactory) -> NotifierFactory:
+        NOTIFIERS[name] = factory
+        return factory
+
+    return decorator
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from .base import ChangeEvent, Notifier, register_notifier
+
+
+@register_notifier("file")
+class FileNotifier(Notifier):
+    """Appends each event as one JSON line to `path`."""
+
+    name = "file"
+
+    def __init__(self, path: str | None):
+        if not path:
+            raise ValueError("file notifier requires a path (file=alerts.log)")
+        self.path = path
+
+    async def send(self, event: ChangeEvent) -> None:
+        await asyncio.to_thread(self._append, json.dumps(event.to_dict()) + "\n")
+
+    def _append(self, line: str) -> None:
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(line)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from collections.abc import Awaitable, Callable, Hashable
+from datetime import timedelta
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+# Telegram rejects messages longer than this.
+MAX_MESSAGE_LENGTH = 4096
+
+
+class NotificationQueue(Generic[T]):
+    """
+    Delivers notifications from a background task so the polling loop never
+    waits on (or fails because of) the notifier.
+
+    Messages pushed within `coalesce_window` seconds of each other are sent as
+    one message (one per `key`, when given, in order of arrival), consecutive sends are spaced by at least `min_interval`
+    seconds, and failed sends are retried with exponential backoff (honouring
+    any `retry_after` hint from the API) without touching the caller. Each
+    attempt is bounded by `send_timeout`, and at most `max_pending` messages
+    wait in the queue: when it is full the oldest one is dropped.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[T], Awaitable[None]],
+        *,
+        coalesce: Callable[[list[T]], T] | None = None,
+        key: Callable[[T], Hashable] | None = None,
+        name: str = "notifier",
+        coalesce_window: float = 5.0,
+        min_interval: float = 3.0,
+        max_attempts: int = 5,
+        first_retry_delay: float = 2.0,
+        max_retry_delay: float = 300.0,
+        max_pending: int = 100,
+        send_timeout: float | None = None,
+    ):
+        self._send = send
+        self._coalesce = coalesce or coalesce_messages
+        self._key = key
+        self.name = name
+        self.send_timeout = send_timeout
+        self.coalesce_window = coalesce_window
+        self.min_interval = min_interval
+        self.max_attempts = max_attempts
+        self.first_retry_delay = first_retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._queue: asyncio.Queue[T] = asyncio.Queue(maxsize=max_pending)
+        self._task: asyncio.Task | None = None
+        self._last_sent: float | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def push(self, message: T) -> None:
+        if not message:
+            return
+        if self._queue.full():
+            # Drop the oldest pending message; newer summaries supersede it.
+            self._queue.get_nowait()
+            self._queue.task_done()
+        self._queue.put_nowait(message)
+
+    async def close(self, timeout: float = 30.0) -> None:
+        """Wait (up to `timeout` seconds) for pending messages, then stop."""
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            print(f"[{self.name}] dropping undelivered notifications", file=sys.stderr)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.coalesce_window
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                for group in self._groups(batch):
+                    await self._deliver(self._coalesce(group))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _groups(self, batch: list[T]) -> list[list[T]]:
+        if self._key is None:
+            return [batch]
+        groups: dict[Hashable, list[T]] = {}
+        for message in batch:
+            groups.setdefault(self._key(message), []).append(message)
+        return list(groups.values())
+
+    async def _deliver(self, message: T) -> None:
+        loop = asyncio.get_running_loop()
+        delay = self.first_retry_delay
+        for attempt in range(1, self.max_attempts + 1):
+            if self._last_sent is not None:
+                wait = self._last_sent + self.min_interval - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            try:
+                await asyncio.wait_for(self._send(message), self.send_timeout)
+                self._last_sent = loop.time()
+                return
+            except Exception as exc:
+                self._last_sent = loop.time()
+                if attempt == self.max_attempts:
+                    print(
+                        f"[{self.name}] giving up after {attempt} attempts: {exc!r}",
+                        file=sys.stderr,
+                    )
+                    return
+                sleep_time = _retry_after(exc) or delay
+                print(
+                    f"[{self.name}] send failed ({exc!r}), retrying in {sleep_time}s",
+                    file=sys.stderr,
+                )
+                await asyncio.sleep(sleep_time)
+                delay = min(delay * 2, self.max_retry_delay)
+
+
+def coalesce_messages(messages: list[str]) -> str:
+    unique: list[str] = []
+    for message in messages:
+        if not unique or unique[-1] != message:
+            unique.append(message)
+    text = "\n".join(unique)
+    while len(text) > MAX_MESSAGE_LENGTH and len(unique) > 1:
+        unique.pop(0)
+        text = "\n".join(unique)
+    return text[-MAX_MESSAGE_LENGTH:]
+
+
+def _retry_after(exc: Exception) -> float | None:
+    retry_after = getattr(exc, "retry_after", None)
+    if isinstance(retry_after, timedelta):
+        return retry_after.total_seconds()
+    if isinstance(retry_after, (int, float)):
+        return float(retry_after)
+    return None
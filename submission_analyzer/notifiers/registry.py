@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from collections.abc import Iterable
+
+from .base import NOTIFIERS, ChangeEvent, Notifier, event_key, merge_events
+from .queue import NotificationQueue
+
+# Importing the sink modules registers them in NOTIFIERS.
+from . import file_notifier, stdout_notifier, telegram_notifier, webhook_notifier  # noqa: F401
+
+DEFAULT_SEND_TIMEOUT = 10.0
+
+
+def add_notify_args(parser) -> None:
+    parser.add_argument(
+        "--notify",
+        action="append",
+        default=[],
+        metavar="SINK[=TARGET]",
+        help=(
+            "Send change notifications to an extra sink; repeatable. "
+            f"Available: {', '.join(sorted(NOTIFIERS))} "
+            "(e.g. --notify webhook=http://localhost:8080/hook --notify file=alerts.log)."
+        ),
+    )
+
+
+def notify_specs(cli_specs: Iterable[str] = ()) -> list[str]:
+    """
+    Combine `--notify` specs with the NOTIFY_SINKS environment variable
+    (comma separated), adding Telegram whenever BOT_TOKEN is configured.
+    """
+    specs = list(cli_specs)
+    env_specs = os.getenv("NOTIFY_SINKS") or ""
+    specs.extend(spec.strip() for spec in env_specs.split(",") if spec.strip())
+    if os.getenv("BOT_TOKEN") and not any(
+        spec.partition("=")[0] == "telegram" for spec in specs
+    ):
+        specs.append("telegram")
+    return specs
+
+
+def build_notifiers(specs: Iterable[str]) -> list[Notifier]:
+    notifiers: list[Notifier] = []
+    for spec in specs:
+        name, _, target = spec.partition("=")
+        factory = NOTIFIERS.get(name.strip())
+        if factory is None:
+            raise ValueError(
+                f"Unknown notifier '{name}'. Available: {', '.join(sorted(NOTIFIERS))}"
+            )
+        notifiers.append(factory(target.strip() or None))
+    return notifiers
+
+
+class NotifierHub:
+    """
+    Fans each change event out to every notifier. Every sink gets its own
+    background queue, so sinks deliver concurrently, a slow sink only delays
+    itself (bounded by `send_timeout`), and pushing never blocks the caller.
+    """
+
+    def __init__(
+        self,
+        notifiers: Iterable[Notifier],
+        *,
+        coalesce: bool = True,
+        send_timeout: float = DEFAULT_SEND_TIMEOUT,
+        max_pending: int = 100,
+    ):
+        self.notifiers = list(notifiers)
+        self._queues: list[NotificationQueue[ChangeEvent]] = [
+            NotificationQueue(
+                notifier.send,
+                coalesce=merge_events,
+                key=event_key,
+                name=notifier.name,
+                coalesce_window=notifier.coalesce_window if coalesce else 0.0,
+                min_interval=notifier.min_interval,
+                max_pending=max_pending,
+                send_timeout=send_timeout,
+            )
+            for notifier in self.notifiers
+        ]
+
+    def start(self) -> None:
+        for queue in self._queues:
+            queue.start()
+
+    def push(self, event: ChangeEvent) -> None:
+        for queue in self._queues:
+            queue.push(event)
+
+    async def close(self, timeout: float = 30.0) -> None:
+        await asyncio.gather(*(queue.close(timeout) for queue in self._queues))
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+
+from .base import ChangeEvent, Notifier, register_notifier
+
+
+@register_notifier("stdout")
+class StdoutNotifier(Notifier):
+    """
+    Prints each event to the console. It writes to stderr, so it never mixes
+    into `--format jsonl/csv` records or `--live` frames on stdout.
+    """
+
+    name = "stdout"
+
+    def __init__(self, target: str | None = None):
+        pass
+
+    async def send(self, event: ChangeEvent) -> None:
+        timestamp = datetime.fromtimestamp(event.created_at).strftime("%H:%M:%S")
+        print(
+            f"[{timestamp}] {event.platform} {event.contest_id}: {event.summary}",
+            file=sys.stderr,
+            flush=True,
+        )
@@ -1,4 +1,6 @@
-from telegram import Bot
+import os
+
+from .base import ChangeEvent, Notifier, register_notifier
 
 
 class TelegramBot:
@@ -6,6 +8,8 @@ class TelegramBot:
         if token == None or token == "":
             self.bot = None
         else:
+            from telegram import Bot
+
             self.bot = Bot(token)
         if chatId == None or chatId == "":
             self.chatId = None
@@ -17,3 +21,16 @@ class TelegramBot:
            return
        await  self.bot.send_message(chat_id=self.chatId, text=text)
 
+
+@register_notifier("telegram")
+class TelegramNotifier(Notifier):
+    name = "telegram"
+    coalesce_window = 5.0
+    # Telegram allows roughly one message per second per chat (less in groups).
+    min_interval = 3.0
+
+    def __init__(self, chat_id: str | None = None):
+        self.bot = TelegramBot(os.getenv("BOT_TOKEN"), chat_id or os.getenv("CHAT_ID"))
+
+    async def send(self, event: ChangeEvent) -> None:
+        await self.bot.sendMessage(event.summary)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import asyncio
+
+from .base import ChangeEvent, Notifier, register_notifier
+
+# Statuses whose Retry-After header tells the queue when to try again.
+_RETRY_STATUSES = (429, 503)
+
+
+class WebhookRetry(Exception):
+    """The endpoint asked us to back off for `retry_after` seconds."""
+
+    def __init__(self, status: int, retry_after: float):
+        super().__init__(f"HTTP {status}, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+@register_notifier("webhook")
+class WebhookNotifier(Notifier):
+    """POSTs each event as JSON to `url` (e.g. a local consumer)."""
+
+    name = "webhook"
+
+    def __init__(self, url: str | None, timeout: float = 10.0):
+        if not url:
+            raise ValueError("webhook notifier requires a URL (webhook=http://...)")
+        self.url = url
+        self.timeout = timeout
+
+    async def send(self, event: ChangeEvent) -> None:
+        await asyncio.to_thread(self._post, event.to_dict())
+
+    def _post(self, payload: dict) -> None:
+        import requests
+
+        resp = requests.post(self.url, json=payload, timeout=self.timeout)
+        if resp.status_code in _RETRY_STATUSES:
+            retry_after = _seconds(resp.headers.get("Retry-After"))
+            if retry_after is not None:
+                raise WebhookRetry(resp.status_code, retry_after)
+        resp.raise_for_status()
+
+
+def _seconds(value: str | None) -> float | None:
+    # Only the delay-seconds form; an HTTP date falls back to the backoff.
+    try:
+        return max(float(value), 0.0) if value else None
+    except ValueError:
+        return None
@@ -1,42 +1,171 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import re
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
-from dotenv import load_dotenv  # noqa: F401
-
-from submission_analyzer.utils import get_json_with_retry
+from submission_analyzer.archive import ArchiveView, ArchiveWriter, archive_key
+from submission_analyzer.profiling import phase
+from submission_analyzer.utils import get_json_with_retry, get_with_retry
 
 from .models import Code4renaIssue
-import requests as r
+
+_PAGINATION_KEY = re.compile(rb'"pagination"\s*:\s*')
+_DECODER = json.JSONDecoder()
 
 
 class Code4renaAPI:
     baseUrl = "https://code4rena.com/api/v1"
+    perPage = 100
 
-    def __init__(self, contest_id: str, username: str, password: str):
+    def __init__(
+        self,
+        contest_id: str,
+        username: str,
+        password: str,
+        archive: ArchiveWriter | None = None,
+        replay: ArchiveView | None = None,
+    ):
         self.contest_id = contest_id
-        self.s = r.sessions.Session()
-        self.login(username, password)
+        self.archive = archive
+        self.replay = replay
+        self.s = None
+        if replay is None:
+            import requests
+
+            self.s = requests.Session()
+            self.login(username, password)
 
     def login(self, username, password) -> str:
-        nonce = self._get_json(f"{self.baseUrl}/users/nonce?handle={username}")["nonce"]
+        # Not archived: these responses are credentials, not contest data.
+        nonce = get_json_with_retry(
+            f"{self.baseUrl}/users/nonce?handle={username}", session=self.s
+        )["nonce"]
         payload = {"nonce": nonce, "handle": username, "password": password}
         resp = self.s.post(f"{self.baseUrl}/users/session?type=password", payload)
 
     def getAllSubmissions(self) -> list[Code4renaIssue]:
-        page = 1
-        perPage = 100
         total_submissions: list[Code4renaIssue] = []
-        while True:
-            resp = self._get_json(
-                f"{self.baseUrl}/audits/{self.contest_id}/submissions?perPage={perPage}&page={page}"
-            )
-            submissions = resp.get("data", {}).get("submissions", [])
-            for sub in submissions:
-                total_submissions.append(Code4renaIssue.from_api(sub))
+        for page in self.iterSubmissionPages():
+            total_submissions.extend(page)
+        return total_submissions
+
+    def iterSubmissions(self, prefetch: bool = True) -> Iterator[Code4renaIssue]:
+        for page in self.iterSubmissionPages(prefetch=prefetch):
+            yield from page
+
+    def iterSubmissionPages(
+        self, prefetch: bool = True
+    ) -> Iterator[list[Code4renaIssue]]:
+        """
+        Yield submissions one page at a time. With `prefetch`, the request for
+        the next page is already in flight while the caller handles this one.
+        """
+        for _, raw in self.iterRawSubmissionPages(prefetch=prefetch):
+            yield self._parse_submissions_page(decode_page(raw))
+
+    def iterRawSubmissionPages(self, prefetch: bool = True) -> Iterator[tuple[int, bytes]]:
+        """
+        Yield `(page, body)` for every submissions page, undecoded: only the
+        page's `pagination` object is parsed to find the next one.
+        """
+        if not prefetch:
+            page = 1
+            while True:
+                raw = self._get_submissions_raw(page)
+                yield page, raw
+                if not has_next_page(raw):
+                    return
+                page += 1
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            page = 1
+            pending = pool.submit(self._get_submissions_raw, page)
+            while pending is not None:
+                raw = pending.result()
+                pending = (
+                    pool.submit(self._get_submissions_raw, page + 1)
+                    if has_next_page(raw)
+                    else None
+                )
+                yield page, raw
+                page += 1
+
+    async def aiterSubmissionPages(self) -> AsyncIterator[list[Code4renaIssue]]:
+        """Async variant of iterSubmissionPages; requests run in a worker thread."""
+        page = 1
+        pending = asyncio.ensure_future(
+            asyncio.to_thread(self._get_submissions_page, page)
+        )
+        while pending is not None:
+            _, resp = await pending
             page += 1
-            if not resp.get("pagination", {}).get("nextPage"):
-                return total_submissions
+            pending = (
+                asyncio.ensure_future(
+                    asyncio.to_thread(self._get_submissions_page, page)
+                )
+                if self._has_next_page(resp)
+                else None
+            )
+            yield self._parse_submissions_page(resp)
+
+    def _get_submissions_page(self, page: int) -> tuple[bytes, dict[str, Any]]:
+        raw = self._get_submissions_raw(page)
+        return raw, decode_page(raw)
+
+    def _get_submissions_raw(self, page: int) -> bytes:
+        return self._get_raw(
+            f"{self.baseUrl}/audits/{self.contest_id}/submissions?perPage={self.perPage}&page={page}"
+        )
+
+    @staticmethod
+    def _parse_submissions_page(resp: dict[str, Any]) -> list[Code4renaIssue]:
+        return [Code4renaIssue.from_api(sub) for sub in submissions_of(resp)]
+
+    @staticmethod
+    def _has_next_page(resp: dict[str, Any]) -> bool:
+        return bool(resp.get("pagination", {}).get("nextPage"))
 
     def _get_json(self, url: str) -> dict[str, Any]:
-        return get_json_with_retry(url, session=self.s)
+        raw = self._get_raw(url)
+        with phase("decode"):
+            return json.loads(raw)
+
+    @phase("fetch")
+    def _get_raw(self, url: str) -> bytes:
+        if self.replay is not None:
+            return self.replay.get(archive_key(url))
+        body = get_with_retry(url, session=self.s).content
+        if self.archive is not None:
+            self.archive.append(archive_key(url), body)
+        return body
+
+
+def submissions_of(resp: dict[str, Any]) -> list[dict[str, Any]]:
+    return resp.get("data", {}).get("submissions", [])
+
+
+def decode_page(raw: bytes) -> dict[str, Any]:
+    with phase("decode"):
+        return json.loads(raw)
+
+
+def has_next_page(raw: bytes) -> bool:
+    """
+    Whether the submissions page `raw` has a next page, decoding only its
+    `pagination` object (the last one in the body, i.e. the top-level one).
+    Falls back to decoding the whole page if that isn't where expected.
+    """
+    start = raw.rfind(b'"pagination"')
+    match = _PAGINATION_KEY.match(raw, start) if start >= 0 else None
+    if match is not None:
+        try:
+            pagination, _ = _DECODER.raw_decode(raw[match.end() :].decode())
+        except ValueError:
+            pagination = None
+        if isinstance(pagination, dict) and "nextPage" in pagination:
+            return bool(pagination["nextPage"])
+    return Code4renaAPI._has_next_page(decode_page(raw))
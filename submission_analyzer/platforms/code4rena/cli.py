@@ -5,9 +5,12 @@ import sys
 from collections.abc import Iterable
 from datetime import datetime
 
+from submission_analyzer.dashboard import select_page
+from submission_analyzer.team import format_team
 from submission_analyzer.utils import truncate, yesno
+from submission_analyzer.watch import add_watch_args, check_watch_args
 
-from .models import Code4renaReport, Finding
+from .models import Code4renaReport, Finding, WardenStanding
 
 
 def parse_code4rena_args():
@@ -29,7 +32,10 @@ def parse_code4rena_args():
     parser.add_argument(
         "-u",
         "--user",
-        help="Your Code4rena handle. Defaults to the CODE4RENA_HANDLE environment variable.",
+        help=(
+            "Your Code4rena handle. Defaults to the CODE4RENA_HANDLE environment variable. "
+            "A comma-separated list (yours first) also tracks your teammates."
+        ),
     )
     parser.add_argument(
         "-t",
@@ -38,6 +44,14 @@ def parse_code4rena_args():
         default=None,
         help="Seconds between refreshes; runs once when omitted.",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Keep submissions cached on disk and only re-parse pages and "
+            "submissions that changed since the previous poll."
+        ),
+    )
     parser.add_argument(
         "--include-invalid",
         action="store_true",
@@ -54,40 +68,59 @@ def parse_code4rena_args():
         action="store_true",
         help="Highlight findings that belong to you when supported by the terminal.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--leaderboard",
+        action="store_true",
+        help=(
+            "Rank every warden in the audit by expected payout instead of listing "
+            "findings (with --format, stream one record per warden)."
+        ),
+    )
+    add_watch_args(parser)
+    args = parser.parse_args()
+    check_watch_args(parser, args)
+    if args.leaderboard and args.schema != "platform":
+        parser.error("--leaderboard exports one record per warden; drop --schema")
+    return args
 
 
-def render_report(report: Code4renaReport, args) -> None:
+def format_report(report: Code4renaReport, args) -> list[str]:
     timestamp = datetime.now().strftime("%d/%m/%Y - %H:%M:%S")
     has_prize_pool = report.prize_pool > 0
     title_width = max(20, args.max_title)
 
-    print(f"{timestamp}")
-    print(f"=== Code4rena {report.contest_id} — Findings ===")
-    print(
+    lines = [
+        f"{timestamp}",
+        f"=== Code4rena {report.contest_id} — Findings ===",
         f"Submissions: {report.total_submissions} (primary: {report.total_primary}) | "
-        f"Judged: {report.total_judged}"
-    )
-    print(
+        f"Judged: {report.total_judged}",
         f"Valid findings: {report.total_valid_findings}/{report.total_primary} | "
-        f"Total points: {report.total_points:.2f}"
-    )
+        f"Total points: {report.total_points:.2f}",
+    ]
     if has_prize_pool:
-        print(f"Prize pool: ${report.prize_pool:,.2f}")
+        lines.append(f"Prize pool: ${report.prize_pool:,.2f}")
     if report.my_total_submissions:
-        print(
+        lines.append(
             f"My submissions: {report.my_total_submissions} total "
             f"My valid findings: {report.my_valid_findings}"
         )
     if has_prize_pool and report.my_reward:
-        print(f"My expected reward: ${report.my_reward:,.2f}")
+        lines.append(f"My expected reward: ${report.my_reward:,.2f}")
+
+    if report.team:
+        lines.append("")
+        lines.extend(format_team(report.team.values(), show_reward=has_prize_pool))
 
-    print()
+    lines.append("")
+
+    if args.leaderboard:
+        lines.extend(_format_leaderboard(report, args, has_prize_pool))
+        return lines
 
     findings_to_show = _filter_findings(report.findings.values(), args.include_invalid)
     if not findings_to_show:
-        print("No findings available to display.")
-        return
+        lines.append("No findings available to display.")
+        return lines
 
     header = (
         f"{'#':<4} "
@@ -101,21 +134,24 @@ def render_report(report: Code4renaReport, args) -> None:
     header += f" {'Mine':>5}"
 
     divider = "-" * len(header)
-    print(header)
-    print(divider)
+    lines.append(header)
+    lines.append(divider)
 
-    sorted_findings = sorted(
+    sorted_findings = select_page(
         findings_to_show,
         key=lambda f: (
             -(f.reward if has_prize_pool else f.points),
             -f.points,
             f.title.lower(),
         ),
+        limit=args.top,
+        page=args.page,
     )
+    first_rank = (max(args.page, 1) - 1) * args.top + 1 if args.top else 1
 
     highlight_mine = args.highlight_mine and _stdout_supports_color()
 
-    for idx, finding in enumerate(sorted_findings, start=1):
+    for idx, finding in enumerate(sorted_findings, start=first_rank):
         title = truncate(finding.title, title_width)
         severity = (finding.severity or "-").capitalize()
         reward = f"${finding.reward:,.2f}" if has_prize_pool else "-"
@@ -131,7 +167,58 @@ def render_report(report: Code4renaReport, args) -> None:
         row += f"{yesno(finding.mine):>5}"
         if highlight_mine and finding.mine:
             row = _highlight(row)
-        print(row)
+        lines.append(row)
+
+    if len(sorted_findings) < len(findings_to_show):
+        lines.append(divider)
+        lines.append(
+            f"Page {args.page}: showing {len(sorted_findings)} of {len(findings_to_show)} findings"
+        )
+    return lines
+
+
+def _format_leaderboard(
+    report: Code4renaReport, args, has_prize_pool: bool
+) -> list[str]:
+    standings = report.leaderboard.values()
+    if not standings:
+        return ["No submissions to rank."]
+    width = max(12, *(len(s.handle) for s in standings))
+    header = f"{'#':<5} {'Warden':<{width}} {'Subs':>5} {'Valid':>5} {'Pts':>9}"
+    if has_prize_pool:
+        header += f" {'Reward':>12}"
+    header += f" {'Mine':>5}"
+    divider = "-" * len(header)
+    lines = [header, divider]
+
+    ranked = select_page(
+        standings,
+        key=WardenStanding.rank_key,
+        limit=args.top,
+        page=args.page,
+    )
+    first_rank = (max(args.page, 1) - 1) * args.top + 1 if args.top else 1
+    highlight_mine = args.highlight_mine and _stdout_supports_color()
+
+    for idx, standing in enumerate(ranked, start=first_rank):
+        row = (
+            f"{str(idx):<5} "
+            f"{standing.handle:<{width}} "
+            f"{standing.submissions:>5} "
+            f"{standing.valid:>5} "
+            f"{standing.points:>9.4f}"
+        )
+        if has_prize_pool:
+            row += f" {f'${standing.reward:,.2f}':>12}"
+        row += f"{yesno(standing.mine):>5}"
+        if highlight_mine and standing.mine:
+            row = _highlight(row)
+        lines.append(row)
+
+    if len(ranked) < len(standings):
+        lines.append(divider)
+        lines.append(f"Page {args.page}: showing {len(ranked)} of {len(standings)} wardens")
+    return lines
 
 
 def _filter_findings(findings: Iterable[Finding], include_invalid: bool) -> list[Finding]:
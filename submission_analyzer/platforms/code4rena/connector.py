@@ -1,7 +1,20 @@
 from __future__ import annotations
 
-from .api import Code4renaAPI
-from .models import Code4renaIssue, Code4renaReport, Finding
+import json
+import math
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+
+from submission_analyzer.archive import ArchiveView, ArchiveWriter
+from submission_analyzer.profiling import phase
+from submission_analyzer.scoring import IncrementalScorer
+from submission_analyzer.team import MemberTally
+from submission_analyzer.utils import cache_path
+from submission_analyzer.workers import imap_bounded, make_pool, pool_size
+
+from .api import Code4renaAPI, submissions_of
+from .models import Code4renaIssue, Code4renaReport, Finding, WardenStanding
+from .sync import SubmissionSync
 
 
 class Code4renaConnector:
@@ -12,15 +25,55 @@ class Code4renaConnector:
         password: str,
         prize_pool: float | None = None,
         handle: str | None = "",
+        incremental: bool = False,
+        workers: int | None = None,
+        archive: ArchiveWriter | None = None,
+        replay: ArchiveView | None = None,
+        team: Iterable[str] = (),
+        leaderboard: bool = False,
+        table: bool = False,
     ):
-        self.api = Code4renaAPI(contest_id, username, password)
+        self.api = Code4renaAPI(
+            contest_id, username, password, archive=archive, replay=replay
+        )
         self.contest_id = contest_id
         self.prize_pool = float(prize_pool) if prize_pool not in (None, "") else 0.0
         self.handle = (handle or "").strip()
+        # Every tracked handle, yours first; all are tallied in the same pass.
+        self.handles = list(
+            dict.fromkeys(h for h in (self.handle, *(t.strip() for t in team)) if h)
+        )
+        self.leaderboard = leaderboard
+        # Submitters the tally groups findings for; None groups every one.
+        self._tracked = None if leaderboard else frozenset(self.handles)
+        # Whether reports keep one entry per submission for `to_table()`
+        # (`--schema contest`, `--alert`); otherwise memory stays per finding.
+        self.table = table
+        self.sync = (
+            SubmissionSync(self.api, cache_path("code4rena", f"{contest_id}.json"))
+            if incremental
+            else None
+        )
+        # The incremental sync already avoids re-parsing, so it stays inline.
+        self._pool = make_pool(workers) if not incremental else None
+        # Pages handed to the pool but not merged yet; keeps the raw bodies
+        # alive for a few pages per worker rather than the whole contest.
+        self._in_flight = 2 * pool_size(workers) if self._pool is not None else 0
+        self.scorer: IncrementalScorer[str, tuple[str, str, int]] = IncrementalScorer(
+            lambda sig: Code4renaConnector._points_for_finding(*sig)
+        )
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
 
     def getAllSubmissions(self) -> list[Code4renaIssue]:
         return self.api.getAllSubmissions()
 
+    def iterSubmissions(self) -> Iterator[Code4renaIssue]:
+        return self.api.iterSubmissions()
+
     def getAllPrimary(self, subs: list[Code4renaIssue]) -> list[Code4renaIssue]:
         return [s for s in subs if s.is_primary]
 
@@ -32,56 +85,60 @@ class Code4renaConnector:
     def getTotalJudged(self, subs: list[Code4renaIssue]) -> int:
         return sum(1 for s in subs if s.evaluations)
 
-    def getFindingTotalPoints(self, severity: str, subs: int) -> float:
+    @staticmethod
+    def getFindingTotalPoints(severity: str, subs: int) -> float:
         if severity == "high":
             return 10 * (0.85 ** (subs - 1))
         if severity == "medium":
             return 3 * (0.85 ** (subs - 1))
         return 0.0
 
+    @phase("build")
     def build_report(self) -> Code4renaReport:
-        submissions = self.getAllSubmissions()
-        primaries = self.getAllPrimary(submissions)
-        findings: dict[str, Finding] = {}
-        total_points = 0.0
-
-        for sub in primaries:
-            latest = sub.latest_evaluations
-            severity = (
-                (
-                    latest.severity
-                    if latest and latest.severity
-                    else sub.submitted_severity or ""
-                )
-                .lower()
-                .strip()
-            )
-            validity = (
-                latest.validity if latest and latest.validity else ""
-            ).lower().strip() or "unknown"
-            duplicates = sub.finding_duplicates or 1
-            finding_id = sub.finding_uid or sub.uid
-            points = self._points_for_finding(severity, validity, duplicates)
-
-            findings[finding_id] = Finding(
-                id=finding_id,
-                title=sub.title or "",
-                subs=duplicates,
-                severity=severity or "-",
-                validity=validity,
-                points=points,
-            )
-            total_points += points
+        if self._pool is not None:
+            return self._finish_report(self._tally_in_pool())
+        tally = _ReportTally(submissions=[] if self.table else None)
+        pages = (
+            self.sync.iterSubmissionPages()
+            if self.sync
+            else self.api.iterSubmissionPages()
+        )
+        for page in pages:
+            for sub in page:
+                tally.add(sub, self._tracked)
+        return self._finish_report(tally)
 
-        my_total_submissions = 0
-        if self.handle:
-            for sub in submissions:
-                if sub.submitter_handle == self.handle:
-                    my_total_submissions += 1
-                    finding = findings.get(sub.finding_uid or sub.uid)
-                    if finding:
-                        finding.mine = True
+    def _tally_in_pool(self) -> _ReportTally:
+        # Workers get the raw page bytes (cheap to ship), decode them and
+        # send back only the page's aggregates; pages are merged in order so
+        # later pages win exactly as in the inline pass.
+        pages = (raw for _, raw in self.api.iterRawSubmissionPages())
+        tally = _ReportTally(submissions=[] if self.table else None)
+        for page_tally in imap_bounded(
+            self._pool,
+            _tally_page,
+            pages,
+            self._tracked,
+            self.table,
+            in_flight=self._in_flight,
+        ):
+            tally.merge(page_tally)
+        return tally
 
+    @phase("score")
+    def _finish_report(self, tally: _ReportTally) -> Code4renaReport:
+        findings = tally.findings
+        for finding_id in tally.member_finding_ids.get(self.handle, ()):
+            finding = findings.get(finding_id)
+            if finding:
+                finding.mine = True
+
+        # Only findings whose severity, validity or duplicate count changed
+        # since the previous poll are re-scored.
+        scorer = self.scorer
+        for f in findings.values():
+            f.points = scorer.score(f.id, (f.severity, f.validity, f.subs))
+        total_points = scorer.finish()
         prize_pool = self.prize_pool
 
         my_reward = 0.0
@@ -96,22 +153,39 @@ class Code4renaConnector:
                     my_valid_findings += 1
                     my_reward += f.reward
 
+        standings = (
+            _standings(tally, findings, mine=self.handles)
+            if self.leaderboard or len(self.handles) > 1
+            else {}
+        )
+        team: dict[str, MemberTally] = {}
+        if len(self.handles) > 1:
+            for handle in self.handles:
+                standing = standings.get(handle) or WardenStanding(handle)
+                team[handle] = MemberTally(
+                    handle, standing.submissions, standing.valid, standing.reward
+                )
+
         return Code4renaReport(
             contest_id=self.contest_id,
             findings=findings,
             total_points=total_points,
-            total_submissions=len(submissions),
-            total_primary=len(primaries),
-            total_judged=self.getTotalJudged(submissions),
+            total_submissions=tally.total_submissions,
+            total_primary=tally.total_primary,
+            total_judged=tally.total_judged,
             prize_pool=prize_pool,
-            my_total_submissions=my_total_submissions,
+            my_total_submissions=tally.member_submissions.get(self.handle, 0),
             total_valid_findings=total_valid_findings,
             my_valid_findings=my_valid_findings,
             my_reward=my_reward,
+            handle=self.handle,
+            team=team,
+            leaderboard=standings if self.leaderboard else {},
+            submissions=tally.submissions,
         )
 
+    @staticmethod
     def _points_for_finding(
-        self,
         severity: str,
         validity: str,
         duplicates: int,
@@ -121,4 +195,134 @@ class Code4renaConnector:
         if severity not in {"high", "medium"}:
             return 0.0
         duplicates = max(int(duplicates or 1), 1)
-        return float(self.getFindingTotalPoints(severity, duplicates))
+        return float(Code4renaConnector.getFindingTotalPoints(severity, duplicates))
+
+
+@dataclass
+class _ReportTally:
+    """Running aggregates for one build_report pass over the submission pages."""
+
+    findings: dict[str, Finding] = field(default_factory=dict)
+    total_submissions: int = 0
+    total_primary: int = 0
+    total_judged: int = 0
+    # Per submitter handle, for the tracked handles (every handle when None).
+    member_submissions: dict[str, int] = field(default_factory=dict)
+    member_finding_ids: dict[str, set[str]] = field(default_factory=dict)
+    # (uid, finding id, submitter) per submission; None when not collected.
+    submissions: list[tuple[str, str, str]] | None = None
+
+    def add(self, sub: Code4renaIssue, handles: frozenset[str] | None) -> None:
+        self.total_submissions += 1
+        if sub.evaluations:
+            self.total_judged += 1
+        submitter = sub.submitter_handle
+        if self.submissions is not None:
+            self.submissions.append(
+                (sub.uid, sub.finding_uid or sub.uid, submitter or "")
+            )
+        if submitter and (handles is None or submitter in handles):
+            member_submissions = self.member_submissions
+            member_submissions[submitter] = member_submissions.get(submitter, 0) + 1
+            # Not setdefault(submitter, set()): that builds a set per submission.
+            finding_ids = self.member_finding_ids.get(submitter)
+            if finding_ids is None:
+                finding_ids = self.member_finding_ids[submitter] = set()
+            finding_ids.add(sub.finding_uid or sub.uid)
+        if not sub.is_primary:
+            return
+
+        self.total_primary += 1
+        latest = sub.latest_evaluations
+        severity = (
+            (
+                latest.severity
+                if latest and latest.severity
+                else sub.submitted_severity or ""
+            )
+            .lower()
+            .strip()
+        )
+        validity = (
+            latest.validity if latest and latest.validity else ""
+        ).lower().strip() or "unknown"
+        duplicates = sub.finding_duplicates or 1
+        finding_id = sub.finding_uid or sub.uid
+
+        # Points are filled in by the connector's scorer in _finish_report.
+        self.findings[finding_id] = Finding(
+            id=finding_id,
+            title=sub.title or "",
+            subs=duplicates,
+            severity=severity or "-",
+            validity=validity,
+            points=0.0,
+        )
+
+    def merge(self, other: _ReportTally) -> None:
+        self.findings.update(other.findings)
+        self.total_submissions += other.total_submissions
+        self.total_primary += other.total_primary
+        self.total_judged += other.total_judged
+        if self.submissions is not None and other.submissions is not None:
+            self.submissions.extend(other.submissions)
+        for handle, count in other.member_submissions.items():
+            self.member_submissions[handle] = (
+                self.member_submissions.get(handle, 0) + count
+            )
+        for handle, finding_ids in other.member_finding_ids.items():
+            mine = self.member_finding_ids.get(handle)
+            if mine is None:
+                self.member_finding_ids[handle] = finding_ids
+            else:
+                mine.update(finding_ids)
+
+
+def _standings(
+    tally: _ReportTally, findings: dict[str, Finding], mine: Iterable[str] = ()
+) -> dict[str, WardenStanding]:
+    """
+    Expected share of every tallied handle, in one grouped pass: each valid
+    finding's per-duplicate points and reward are looked up once, then
+    summed per handle over the findings it has a submission in.
+
+    Like `my_reward`, a handle earns one share per finding however many of
+    its submissions the finding holds. The finding's other shares are
+    counted in its duplicate count but paid to no one here, so the board
+    sums to slightly less than the pool when a warden duplicated their own
+    submission.
+    """
+    shares = {
+        finding_id: (finding.getSinglePoints(), finding.reward)
+        for finding_id, finding in findings.items()
+        if finding.is_valid
+    }
+    mine = set(mine)
+    member_finding_ids = tally.member_finding_ids
+    standings: dict[str, WardenStanding] = {}
+    for handle, submissions in tally.member_submissions.items():
+        hits = [
+            shares[finding_id]
+            for finding_id in member_finding_ids.get(handle, ())
+            if finding_id in shares
+        ]
+        points, rewards = zip(*hits) if hits else ((), ())
+        standings[handle] = WardenStanding(
+            handle,
+            submissions=submissions,
+            valid=len(hits),
+            points=math.fsum(points),
+            reward=math.fsum(rewards),
+            mine=handle in mine,
+        )
+    return standings
+
+
+def _tally_page(
+    raw: bytes, handles: frozenset[str] | None, table: bool = False
+) -> _ReportTally:
+    """Worker-side: decode one submissions page and tally it."""
+    tally = _ReportTally(submissions=[] if table else None)
+    for payload in submissions_of(json.loads(raw)):
+        tally.add(Code4renaIssue.from_api(payload), handles)
+    return tally
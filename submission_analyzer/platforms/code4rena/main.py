@@ -2,76 +2,87 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import os
-import traceback
-
-from dotenv import load_dotenv
 
+from submission_analyzer.archive import open_archive_args
+from submission_analyzer.export import EVENT_FIELDS
 from submission_analyzer.monitoring import setup_sentry
-from submission_analyzer.notifiers.telegram_notifier import TelegramBot
+from submission_analyzer.table import COLUMNS
+from submission_analyzer.watch import Watch, watch
 
-from .cli import parse_code4rena_args, render_report
+from .cli import format_report, parse_code4rena_args
 from .connector import Code4renaConnector
+from .models import Finding, WardenStanding
+
+PLATFORM = "code4rena"
 
-MAX_RETRIES = 5
-FALLBACK_RETRY_DELAY = 600
+_EXPORT_FIELDS = (*EVENT_FIELDS, *Finding.record_fields())
+_LEADERBOARD_FIELDS = (*EVENT_FIELDS, *WardenStanding.record_fields())
+_TABLE_FIELDS = (*EVENT_FIELDS, *COLUMNS)
 
 
 async def main():
     args = parse_code4rena_args()
 
+    from dotenv import load_dotenv
+
     load_dotenv()
     setup_sentry()
 
-    username = os.getenv("CODE4_USER").strip()
-    password = os.getenv("CODE4_PASS").strip()
-
-    contest_id = args.contestId
-    handle = (args.user if args.user else username).strip()
-    prize_pool = args.prize_pool
-
-    connector = Code4renaConnector(
-        contest_id,
+    username = (os.getenv("CODE4_USER") or "").strip()
+    password = (os.getenv("CODE4_PASS") or "").strip()
+    handles = [h.strip() for h in (args.user or username).split(",") if h.strip()]
+    archive, replay = open_archive_args(args)
+    # Logging in is a network round trip: the loop runs it in a thread,
+    # after the warm-start render, and retries it like a failed refresh.
+    connect = functools.partial(
+        Code4renaConnector,
+        args.contestId,
         username,
         password,
-        prize_pool=prize_pool,
-        handle=handle,
+        prize_pool=args.prize_pool,
+        handle=handles[0] if handles else "",
+        team=handles[1:],
+        leaderboard=args.leaderboard,
+        # Only the contest table needs a row per submission.
+        table=args.schema == "contest" or bool(args.alert_rules),
+        incremental=args.incremental,
+        workers=args.workers,
+        archive=archive,
+        replay=replay,
     )
-
-    telegram_bot = TelegramBot(os.getenv("BOT_TOKEN"), os.getenv("CHAT_ID"))
-
-    last_snapshot = None
-    retries = 0
-    timeout = args.timeout
-    retry_delay = (
-        args.timeout if args.timeout and args.timeout > 0 else FALLBACK_RETRY_DELAY
+    await watch(
+        Watch(
+            platform=PLATFORM,
+            args=args,
+            connect=connect,
+            build=lambda connector: connector.build_report(),
+            format_report=format_report,
+            summary=lambda report, connector: _build_notification_summary(
+                report, connector.handle
+            ),
+            export_items=lambda report: _export_items(report, args),
+            export_fields=_export_fields(args),
+        )
     )
 
-    while retries < MAX_RETRIES:
-        try:
-            report = connector.build_report()
-            snapshot = report.snapshot()
-            if snapshot != last_snapshot:
-                render_report(report, args)
-                summary = _build_notification_summary(report, connector.handle)
-                if summary:
-                    await telegram_bot.sendMessage(summary)
-                last_snapshot = snapshot
-            retries = 0
-            if timeout is None:
-                return
-            await asyncio.sleep(timeout)
-        except Exception as exc:
-            retries += 1
-            print(f"[code4rena] error while refreshing data: {exc}")
-            traceback.print_exc()
-            if retries >= MAX_RETRIES:
-                raise RuntimeError("Exceeded maximum retries") from exc
-            await asyncio.sleep(retry_delay)
-
-    raise RuntimeError("Exceeded maximum retries")
+
+def _export_fields(args) -> tuple[str, ...]:
+    if args.leaderboard:
+        return _LEADERBOARD_FIELDS
+    if args.schema == "contest":
+        return _TABLE_FIELDS
+    return _EXPORT_FIELDS
 
 
+def _export_items(report, args):
+    """The records streamed by --format/--serve, their keys and key field."""
+    if args.leaderboard:
+        return report.ranked_leaderboard(), lambda standing: standing.handle, "handle"
+    if args.schema == "contest":
+        return report.to_table().rows(), lambda row: row.issue_id, "issue_id"
+    return report.findings.values(), lambda finding: finding.id, "id"
 
 
 def _build_notification_summary(report, handle: str | None) -> str:
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import math
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from typing import Any
 
+from submission_analyzer.table import ContestTable
+from submission_analyzer.team import MemberTally
+
 
 def _parse_datetime(value: str | None) -> datetime | None:
     if not value:
@@ -171,12 +175,51 @@ class Finding:
             self.mine,
         )
 
+    @classmethod
+    def record_fields(cls) -> tuple[str, ...]:
+        return tuple(f.name for f in fields(cls))
+
+    def to_record(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.record_fields()}
+
     def __eq__(self, other):
         if not isinstance(other, Finding):
             return NotImplemented
         return self.snapshot() == other.snapshot()
 
 
+@dataclass
+class WardenStanding:
+    """One submitter's expected share of the contest (`--leaderboard`)."""
+
+    handle: str
+    submissions: int = 0
+    valid: int = 0
+    points: float = 0.0
+    reward: float = 0.0
+    mine: bool = False
+
+    def rank_key(self) -> tuple[float, float, str]:
+        return (-self.reward, -self.points, self.handle.lower())
+
+    def snapshot(self):
+        return (
+            self.handle,
+            self.submissions,
+            self.valid,
+            round(self.points, 6),
+            round(self.reward, 2),
+            self.mine,
+        )
+
+    @classmethod
+    def record_fields(cls) -> tuple[str, ...]:
+        return tuple(f.name for f in fields(cls))
+
+    def to_record(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.record_fields()}
+
+
 @dataclass
 class Code4renaReport:
     contest_id: str
@@ -190,6 +233,67 @@ class Code4renaReport:
     total_valid_findings: int
     my_valid_findings: int
     my_reward: float
+    # Your handle (the first `-u` handle); empty when none is configured.
+    handle: str = ""
+    # Tracked handles (`-u a,b,c`), keyed by handle; empty for a single handle.
+    team: dict[str, MemberTally] = field(default_factory=dict)
+    # Every submitter, keyed by handle; only built with `--leaderboard`.
+    leaderboard: dict[str, WardenStanding] = field(default_factory=dict)
+    # (submission uid, finding id, submitter handle) of every submission;
+    # only collected for `to_table()` (connector built with `table=True`).
+    submissions: list[tuple[str, str, str]] | None = field(default=None, repr=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        summary = {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if f.name not in ("findings", "team", "leaderboard", "submissions")
+        }
+        summary["team"] = [member.to_dict() for member in self.team.values()]
+        summary["leaderboard"] = [
+            standing.to_record() for standing in self.ranked_leaderboard()
+        ]
+        summary["findings"] = [finding.to_record() for finding in self.findings.values()]
+        return summary
+
+    def to_table(self) -> ContestTable:
+        if self.submissions is None:
+            raise ValueError(
+                "report has no per-submission rows; build it with Code4renaConnector(table=True)"
+            )
+        table = ContestTable("code4rena", self.contest_id)
+        for uid, finding_id, handle in self.submissions:
+            mine = bool(self.handle) and handle == self.handle
+            finding = self.findings.get(finding_id)
+            if finding is None:
+                # Its primary submission isn't visible (yet).
+                table.append(
+                    uid, finding_id, "none", False, 1, owner=handle, mine=mine
+                )
+                continue
+            table.append(
+                uid,
+                finding_id,
+                finding.severity,
+                finding.is_valid,
+                finding.subs,
+                owner=handle,
+                mine=mine,
+                points=finding.getSinglePoints(),
+                reward=finding.reward,
+            )
+        # A finding pays you once however many of your submissions it holds,
+        # so your totals are the report's, not the sums over your rows.
+        my_findings = [f for f in self.findings.values() if f.mine and f.is_valid]
+        table.totals = {
+            "my_valid": self.my_valid_findings,
+            "my_points": math.fsum(f.getSinglePoints() for f in my_findings),
+            "my_reward": self.my_reward,
+        }
+        return table
+
+    def ranked_leaderboard(self) -> list[WardenStanding]:
+        return sorted(self.leaderboard.values(), key=WardenStanding.rank_key)
 
     def snapshot(self):
         findings_snap = tuple(
@@ -206,5 +310,9 @@ class Code4renaReport:
             self.total_valid_findings,
             self.my_valid_findings,
             round(self.my_reward, 2),
+            tuple(member.snapshot() for member in self.team.values()),
+            tuple(
+                sorted(standing.snapshot() for standing in self.leaderboard.values())
+            ),
             findings_snap,
         )
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .api import Code4renaAPI, decode_page, submissions_of
+from .models import Code4renaIssue
+
+STATE_VERSION = 1
+
+
+@dataclass
+class SyncStats:
+    pages: int = 0
+    unchanged_pages: int = 0
+    changed_submissions: int = 0
+    removed_submissions: int = 0
+
+
+class SubmissionSync:
+    """
+    Disk-backed copy of an audit's submissions that is refreshed incrementally.
+
+    Every page body is hashed before it is decoded; pages whose hash matches
+    the previous sync are never decoded. On changed pages only submissions
+    whose payload differs from the cached copy are re-parsed into
+    `Code4renaIssue` objects. The submissions endpoint can't be ordered by
+    update time, so there is no point to stop paging early: every page is
+    still requested, and the saving is in decoding and model building.
+    """
+
+    def __init__(self, api: Code4renaAPI, path: Path):
+        self.api = api
+        self.path = path
+        self.last_stats = SyncStats()
+        self._pages: dict[int, dict[str, Any]] = {}
+        self._payloads: dict[str, dict[str, Any]] = {}
+        self._issues: dict[str, Code4renaIssue] = {}
+        self._load()
+
+    def iterSubmissionPages(self) -> Iterator[list[Code4renaIssue]]:
+        """Sync, then yield the cached submissions in API page order."""
+        self.sync()
+        for page in sorted(self._pages):
+            yield [self._issue(uid) for uid in self._pages[page]["uids"]]
+
+    def sync(self) -> SyncStats:
+        stats = SyncStats()
+        seen_pages: set[int] = set()
+        for page, raw in self.api.iterRawSubmissionPages():
+            stats.pages += 1
+            seen_pages.add(page)
+            digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+            cached = self._pages.get(page)
+            if cached and cached["hash"] == digest:
+                stats.unchanged_pages += 1
+                continue
+            uids: list[str] = []
+            for payload in submissions_of(decode_page(raw)):
+                uid = payload.get("uid")
+                uids.append(uid)
+                if self._payloads.get(uid) != payload:
+                    self._payloads[uid] = payload
+                    self._issues.pop(uid, None)
+                    stats.changed_submissions += 1
+            self._pages[page] = {"hash": digest, "uids": uids}
+
+        dirty = stats.unchanged_pages != stats.pages
+        for page in set(self._pages) - seen_pages:
+            del self._pages[page]
+            dirty = True
+        if dirty:
+            live = {uid for entry in self._pages.values() for uid in entry["uids"]}
+            for uid in set(self._payloads) - live:
+                del self._payloads[uid]
+                self._issues.pop(uid, None)
+                stats.removed_submissions += 1
+            self._save()
+        self.last_stats = stats
+        return stats
+
+    def _issue(self, uid: str) -> Code4renaIssue:
+        issue = self._issues.get(uid)
+        if issue is None:
+            issue = Code4renaIssue.from_api(self._payloads[uid])
+            self._issues[uid] = issue
+        return issue
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                state = json.load(fh)
+        except (OSError, ValueError):
+            return
+        if state.get("version") != STATE_VERSION:
+            return
+        self._pages = {int(page): entry for page, entry in state["pages"].items()}
+        self._payloads = state["submissions"]
+
+    def _save(self) -> None:
+        state = {
+            "version": STATE_VERSION,
+            "pages": self._pages,
+            "submissions": self._payloads,
+        }
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(state, fh, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
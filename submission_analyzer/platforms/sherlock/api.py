@@ -1,24 +1,34 @@
 from __future__ import annotations
 
-from submission_analyzer.utils import get_json_with_retry
+import json
+
+from submission_analyzer.archive import ArchiveView, ArchiveWriter, archive_key
+from submission_analyzer.profiling import phase
+from submission_analyzer.utils import get_with_retry
 
 
 class SherlockAPI:
-    def __init__(self, contest_id: int, session_id: str | None):
+    def __init__(
+        self,
+        contest_id: int,
+        session_id: str | None,
+        archive: ArchiveWriter | None = None,
+        replay: ArchiveView | None = None,
+    ):
         self.contest_id = contest_id
-        if not session_id:
+        if not session_id and replay is None:
             raise ValueError("SESSION_SHERLOCK is not set")
         self.session_id = session_id
+        self.archive = archive
+        self.replay = replay
 
-    def getTitles(self):
-        return self._get_json(
-            f"https://audits.sherlock.xyz/api/contest/{self.contest_id}/issue_titles"
-        )
+    def getTitles(self, raw: bool = False):
+        url = f"https://audits.sherlock.xyz/api/contest/{self.contest_id}/issue_titles"
+        return self._get_raw(url) if raw else self._get_json(url)
 
-    def getJudge(self):
-        return self._get_json(
-            f"https://audits.sherlock.xyz/api/judge/{self.contest_id}"
-        )
+    def getJudge(self, raw: bool = False):
+        url = f"https://audits.sherlock.xyz/api/judge/{self.contest_id}"
+        return self._get_raw(url) if raw else self._get_json(url)
 
     def getDiscussions(self, issueId):
         return self._get_json(
@@ -31,5 +41,18 @@ class SherlockAPI:
         )
 
     def _get_json(self, url):
-        headers = {"Cookie": f"session={self.session_id};"}
-        return get_json_with_retry(url, headers=headers)
+        raw = self._get_raw(url)
+        with phase("decode"):
+            return json.loads(raw)
+
+    @phase("fetch")
+    def _get_raw(self, url) -> bytes:
+        if self.replay is not None:
+            return self.replay.get(archive_key(url))
+        body = get_with_retry(url, headers=self._headers()).content
+        if self.archive is not None:
+            self.archive.append(archive_key(url), body)
+        return body
+
+    def _headers(self) -> dict[str, str]:
+        return {"Cookie": f"session={self.session_id};"}
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import argparse
-from collections.abc import Iterable
 from datetime import datetime
 import sys
 
+from submission_analyzer.dashboard import select_page
+from submission_analyzer.team import format_team
 from submission_analyzer.utils import truncate, yesno
+from submission_analyzer.watch import add_watch_args, check_watch_args
 
-from .models import SherlockFinding, SherlockIssue, SherlockReport
+from .comments import CommentHit, since_timestamp
+from .models import SherlockFinding, SherlockReport
+
+# Comments listed by --search/--mentions/--by/--since, newest first.
+SEARCH_RESULTS = 20
 
 
 def parse_sherlock_args():
@@ -32,7 +38,55 @@ def parse_sherlock_args():
         action="store_true",
         help=(
             "Fetch discussion comments for each issue. "
-            "Enabling this requires one request per issue and can be slow."
+            "Enabling this requires one request per issue and can be slow. "
+            "Your issues go first, then unresolved escalations, valid mains and the rest."
+        ),
+    )
+    parser.add_argument(
+        "--comments-budget",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help=(
+            "With -c: stop fetching discussions after SECONDS per refresh; the rest "
+            "keep their last comments and are refreshed on later polls."
+        ),
+    )
+    parser.add_argument(
+        "--comments-limit",
+        type=int,
+        default=None,
+        metavar="N",
+        help=(
+            "With -c: fetch at most N discussions per refresh; the rest keep their "
+            "last comments and are refreshed on later polls."
+        ),
+    )
+    parser.add_argument(
+        "--search",
+        default=None,
+        metavar="WORDS",
+        help="With -c: list the comments containing all of WORDS.",
+    )
+    parser.add_argument(
+        "--mentions",
+        default=None,
+        metavar="HANDLE",
+        help="With -c: list the comments mentioning @HANDLE.",
+    )
+    parser.add_argument(
+        "--by",
+        default=None,
+        metavar="ROLE",
+        help="With -c: list the comments by ROLE (e.g. lead_judge).",
+    )
+    parser.add_argument(
+        "--since",
+        default=None,
+        metavar="WHEN",
+        help=(
+            "With -c: list the comments made since WHEN (epoch seconds, ISO date, "
+            "or an age such as 12h or 2d)."
         ),
     )
     parser.add_argument(
@@ -47,50 +101,72 @@ def parse_sherlock_args():
         action="store_true",
         help="Highlight findings submitted by you when supported by the terminal.",
     )
-    return parser.parse_args()
-
-
-def render_report(report: SherlockReport, args) -> None:
+    add_watch_args(parser)
+    args = parser.parse_args()
+    check_watch_args(parser, args)
+    budgeted = args.comments_budget is not None or args.comments_limit is not None
+    if budgeted and not args.comments:
+        parser.error("--comments-budget/--comments-limit need -c")
+    if _searching(args) and not args.comments:
+        parser.error("--search/--mentions/--by/--since need -c")
+    if args.since is not None:
+        try:
+            since_timestamp(args.since)
+        except ValueError:
+            parser.error(f"--since: can't parse {args.since!r}")
+    return args
+
+
+def format_report(report: SherlockReport, args) -> list[str]:
     timestamp = datetime.now().strftime("%d/%m/%Y - %H:%M:%S")
-    print(f"{timestamp}")
-    print(f"=== Sherlock {report.contest_id} — Findings ===")
-
-    print(
+    lines = [
+        f"{timestamp}",
+        f"=== Sherlock {report.contest_id} — Findings ===",
         f"Total issues: {report.total_issues} "
-        f"(valid: {report.total_valid_issues}, invalid: {report.total_invalid_issues})"
-    )
-    print(f"Total points: {report.total_points:.4f}")
+        f"(valid: {report.total_valid_issues}, invalid: {report.total_invalid_issues})",
+        f"Total points: {report.total_points:.4f}",
+    ]
     if report.prize_pool:
-        print(f"Prize pool: ${report.prize_pool:,.2f}")
+        lines.append(f"Prize pool: ${report.prize_pool:,.2f}")
 
-    print(
+    lines.append(
         f"My issues: {report.my_total_issues} "
         f"(valid: {report.my_valid_issues}, invalid: {report.my_total_issues - report.my_valid_issues})"
     )
-    print(f"My expected reward: ${report.my_total_reward:,.2f}")
+    lines.append(f"My expected reward: ${report.my_total_reward:,.2f}")
 
     if args.escalations:
         pending = max(report.total_escalated - report.total_resolved, 0)
-        print(
+        lines.append(
             f"Escalations: {report.total_escalated} escalated | "
             f"{report.total_resolved} resolved | {pending} pending"
         )
 
     if args.comments:
-        _render_comment_stats(report.issues.values())
+        lines.extend(_format_comment_stats(report))
+        hits = search_comments(report, args)
+        if hits is not None:
+            lines.extend(_format_comment_search(hits, report))
 
-    print()
+    if report.team:
+        lines.append("")
+        lines.extend(format_team(report.team.values(), show_reward=bool(report.prize_pool)))
 
-    valid_findings = sorted(
-        report.valid_findings,
+    lines.append("")
+
+    valid_findings = report.valid_findings
+    if not valid_findings:
+        lines.append("No valid findings available to display.")
+        return lines
+
+    shown_findings = select_page(
+        valid_findings,
         key=lambda finding: finding.main.reward,
+        limit=args.top,
+        page=args.page,
         reverse=True,
     )
 
-    if not valid_findings:
-        print("No valid findings available to display.")
-        return
-
     header = (
         f"{'#':<5} "
         f"{'Title':<73} "
@@ -105,44 +181,75 @@ def render_report(report: SherlockReport, args) -> None:
 
     divider = "-" * len(header)
 
-    print(header)
-    print(divider)
+    lines.append(header)
+    lines.append(divider)
 
     highlight_mine = args.highlight_mine and _stdout_supports_color()
 
-    for finding in valid_findings:
+    for finding in shown_findings:
         row = _format_finding_row(finding, args.escalations)
         if highlight_mine and finding.mine:
             row = _highlight(row)
-        print(row)
+        lines.append(row)
 
-    print(divider)
+    lines.append(divider)
+    if len(shown_findings) < len(valid_findings):
+        lines.append(
+            f"Page {args.page}: showing {len(shown_findings)} of {len(valid_findings)} valid findings"
+        )
 
     if args.escalations:
-        _render_invalid_escalations(report)
+        lines.extend(_format_invalid_escalations(report))
+    return lines
 
 
-def _render_comment_stats(issues: Iterable[SherlockIssue]) -> None:
-    issues_list = list(issues)
-    commented_invalid = sum(
-        1 for issue in issues_list if issue.severity == 3 and issue.lead_judge_comments
-    )
-    print(f"LJ commented on {commented_invalid} invalid issues")
-
-    last_comment = None
-    last_issue: SherlockIssue | None = None
-    for issue in issues_list:
-        for comment in issue.lead_judge_comments:
-            candidate_ts = comment.get("created_at") or 0
-            if last_comment is None or candidate_ts > (last_comment.get("created_at") or 0):
-                last_comment = comment
-                last_issue = issue
+def _format_comment_stats(report: SherlockReport) -> list[str]:
+    lines = [f"LJ commented on {report.lead_judge_commented_invalid} invalid issues"]
 
+    last_comment = report.last_lead_judge_comment
+    last_issue = report.last_lead_judge_issue
     if last_comment and last_issue:
         created_at = last_comment.get("created_at")
         if created_at:
             timestamp = datetime.fromtimestamp(created_at).strftime("%Y-%m-%d %H:%M:%S")
-            print(f"LJ last commented at {timestamp} on issue {last_issue.number}")
+            lines.append(f"LJ last commented at {timestamp} on issue {last_issue.number}")
+    if report.comments_pending:
+        lines.append(
+            f"{report.comments_pending} discussions not fetched yet (first in line next refresh)"
+        )
+    return lines
+
+
+def _searching(args) -> bool:
+    return any(
+        value is not None for value in (args.search, args.mentions, args.by, args.since)
+    )
+
+
+def search_comments(report: SherlockReport, args) -> list[CommentHit] | None:
+    """The comments selected by --search/--mentions/--by/--since, if any is given."""
+    if not _searching(args) or report.comment_index is None:
+        return None
+    # Relative --since values move with each refresh.
+    since = since_timestamp(args.since) if args.since is not None else None
+    return report.comment_index.search(
+        args.search or "", mentions=args.mentions, role=args.by, since=since
+    )
+
+
+def _format_comment_search(hits: list[CommentHit], report: SherlockReport) -> list[str]:
+    issue_ids = {hit.issue_id for hit in hits}
+    lines = ["", f"{len(hits)} matching comments on {len(issue_ids)} issues"]
+    for hit in hits[:SEARCH_RESULTS]:
+        issue = report.issues.get(hit.issue_id)
+        number = issue.number if issue is not None else hit.issue_id
+        timestamp = datetime.fromtimestamp(hit.created_at).strftime("%Y-%m-%d %H:%M")
+        roles = ",".join(sorted(hit.roles))
+        body = " ".join(hit.body.split())
+        lines.append(f"{timestamp}  #{number:<6} {roles:<12} {truncate(body)}")
+    if len(hits) > SEARCH_RESULTS:
+        lines.append(f"... and {len(hits) - SEARCH_RESULTS} more")
+    return lines
 
 
 def _format_finding_row(finding: SherlockFinding, include_escalations: bool) -> str:
@@ -164,16 +271,16 @@ def _format_finding_row(finding: SherlockFinding, include_escalations: bool) ->
     return row
 
 
-def _render_invalid_escalations(report: SherlockReport) -> None:
+def _format_invalid_escalations(report: SherlockReport) -> list[str]:
     issues = sorted(
         report.invalid_escalated_issues,
         key=lambda issue: issue.escalation_resolved,
         reverse=True,
     )
     if not issues:
-        return
+        return []
 
-    print("\n=== Invalid issues (escalated) ===\n")
+    lines = ["", "=== Invalid issues (escalated) ===", ""]
     header = (
         f"{'#':<5} "
         f"{'Title':<73} "
@@ -183,8 +290,8 @@ def _render_invalid_escalations(report: SherlockReport) -> None:
         f"{'Res':>5}"
     )
     divider = "-" * len(header)
-    print(header)
-    print(divider)
+    lines.append(header)
+    lines.append(divider)
     for issue in issues:
         row = (
             f"{issue.number:<5} "
@@ -194,8 +301,9 @@ def _render_invalid_escalations(report: SherlockReport) -> None:
             f"{yesno(issue.escalation_escalated):>5} "
             f"{yesno(issue.escalation_resolved):>5}"
         )
-        print(row)
-    print(divider)
+        lines.append(row)
+    lines.append(divider)
+    return lines
 
 
 def _highlight(text: str) -> str:
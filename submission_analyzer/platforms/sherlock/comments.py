@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import bisect
+import re
+import time
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+from submission_analyzer.archive import parse_when
+
+_WORD = re.compile(r"\w+")
+_MENTION = re.compile(r"@([\w-]*\w)")
+# Role of a comment without any `is_*` flag (a Watson, the sponsor, ...).
+DEFAULT_ROLE = "participant"
+_AGE = re.compile(r"(\d+(?:\.\d+)?)([smhd])")
+_AGE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class CommentHit(NamedTuple):
+    issue_id: str
+    created_at: float
+    roles: frozenset[str]
+    comment: dict[str, Any]
+
+    @property
+    def body(self) -> str:
+        return comment_text(self.comment)
+
+
+def comment_text(comment: dict[str, Any]) -> str:
+    return str(comment.get("body") or comment.get("content") or "")
+
+
+def comment_roles(comment: dict[str, Any]) -> frozenset[str]:
+    """`is_lead_judge: true` -> "lead_judge", and so on for every `is_*` flag."""
+    roles = frozenset(
+        key[3:] for key, value in comment.items() if key.startswith("is_") and value is True
+    )
+    return roles or frozenset((DEFAULT_ROLE,))
+
+
+def since_timestamp(value: str, now: float | None = None) -> float:
+    """`--since` value: epoch seconds, an ISO date, or an age such as 30m, 12h or 2d."""
+    match = _AGE.fullmatch(value.strip())
+    if match:
+        return (time.time() if now is None else now) - float(match[1]) * _AGE_UNITS[match[2]]
+    return parse_when(value)
+
+
+def tokenize(text: str) -> set[str]:
+    """Lowercased words, plus `@handle` for every mention."""
+    text = text.lower()
+    tokens = set(_WORD.findall(text))
+    tokens.update("@" + handle for handle in _MENTION.findall(text))
+    return tokens
+
+
+class CommentIndex:
+    """
+    Inverted index over the discussion comments of a contest: words and
+    @mentions, roles (`lead_judge`, ...) and creation times, so searches
+    like "LJ comments mentioning 'invalid' since yesterday" only touch the
+    matching comments instead of every issue's discussion.
+
+    `update` replaces one issue's comments and is a no-op when they didn't
+    change, so a connector can feed it every discussion it refetched.
+    """
+
+    def __init__(self):
+        self._comments: dict[int, CommentHit] = {}
+        self._by_issue: dict[str, list[int]] = {}
+        self._fingerprints: dict[str, tuple[Any, ...]] = {}
+        self._tokens: dict[str, set[int]] = {}
+        self._roles: dict[str, set[int]] = {}
+        self._timeline: list[tuple[float, int]] = []  # sorted (created_at, key)
+        self._next_key = 0
+
+    def __len__(self) -> int:
+        return len(self._comments)
+
+    def update(self, issue_id: str, comments: Iterable[dict[str, Any]]) -> bool:
+        """Index `comments` as all of `issue_id`'s; returns whether anything changed."""
+        comments = list(comments)
+        fingerprint = tuple(
+            (c.get("id"), c.get("created_at"), comment_text(c)) for c in comments
+        )
+        if self._fingerprints.get(issue_id) == fingerprint:
+            return False
+        self.remove(issue_id)
+        keys = []
+        for comment in comments:
+            key = self._next_key
+            self._next_key += 1
+            hit = CommentHit(
+                issue_id, float(comment.get("created_at") or 0), comment_roles(comment), comment
+            )
+            self._comments[key] = hit
+            for token in tokenize(hit.body):
+                self._tokens.setdefault(token, set()).add(key)
+            for role in hit.roles:
+                self._roles.setdefault(role, set()).add(key)
+            bisect.insort(self._timeline, (hit.created_at, key))
+            keys.append(key)
+        self._by_issue[issue_id] = keys
+        self._fingerprints[issue_id] = fingerprint
+        return True
+
+    def remove(self, issue_id: str) -> None:
+        self._fingerprints.pop(issue_id, None)
+        for key in self._by_issue.pop(issue_id, ()):
+            hit = self._comments.pop(key)
+            for token in tokenize(hit.body):
+                _discard(self._tokens, token, key)
+            for role in hit.roles:
+                _discard(self._roles, role, key)
+            at = bisect.bisect_left(self._timeline, (hit.created_at, key))
+            del self._timeline[at]
+
+    def retain(self, issue_ids: Iterable[str]) -> None:
+        """Drop the comments of issues not in `issue_ids` (e.g. deleted issues)."""
+        for issue_id in self._by_issue.keys() - set(issue_ids):
+            self.remove(issue_id)
+
+    def search(
+        self,
+        text: str = "",
+        *,
+        mentions: str | None = None,
+        role: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> list[CommentHit]:
+        """
+        Comments containing every word of `text`, mentioning `@mentions`, by
+        an author with `role`, created in `[since, until)`; newest first.
+        """
+        sets: list[set[int]] = []
+        tokens = set(_WORD.findall(text.lower()))
+        if mentions:
+            tokens.add("@" + mentions.lstrip("@").lower())
+        for token in tokens:
+            sets.append(self._tokens.get(token, set()))
+        if role:
+            sets.append(self._roles.get(role, set()))
+
+        timeline = self._timeline
+        if since is not None or until is not None:
+            start = 0 if since is None else bisect.bisect_left(timeline, (since, -1))
+            stop = len(timeline) if until is None else bisect.bisect_left(timeline, (until, -1))
+            smallest = min(sets, key=len) if sets else None
+            if smallest is None or stop - start < len(smallest):
+                sets.append({key for _, key in timeline[start:stop]})
+            else:
+                # Fewer keys to check than to collect: filter by time instead.
+                sets.append(
+                    {
+                        key
+                        for key in smallest
+                        if (since is None or self._comments[key].created_at >= since)
+                        and (until is None or self._comments[key].created_at < until)
+                    }
+                )
+        if not sets:
+            keys: Iterable[int] = self._comments
+        else:
+            sets.sort(key=len)
+            keys = sets[0].intersection(*sets[1:])
+        hits = [self._comments[key] for key in keys]
+        hits.sort(key=lambda hit: hit.created_at, reverse=True)
+        return hits
+
+    def issues(self, text: str = "", **filters: Any) -> set[str]:
+        """Ids of the issues with at least one comment matching `search`."""
+        return {hit.issue_id for hit in self.search(text, **filters)}
+
+    def latest(self, role: str | None = None) -> CommentHit | None:
+        """The newest comment, optionally by an author with `role`."""
+        members = self._roles.get(role) if role else None
+        if role and members is None:
+            return None
+        for _, key in reversed(self._timeline):
+            if members is None or key in members:
+                return self._comments[key]
+        return None
+
+
+def _discard(index: dict[str, set[int]], name: str, key: int) -> None:
+    keys = index.get(name)
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            del index[name]
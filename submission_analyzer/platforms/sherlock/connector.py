@@ -1,53 +1,159 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+import json
+import time
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
 from typing import Any
 
+from submission_analyzer.archive import ArchiveView, ArchiveWriter
+from submission_analyzer.profiling import phase
+from submission_analyzer.scoring import IncrementalScorer
+from submission_analyzer.team import MemberTally
+from submission_analyzer.workers import make_pool
+
 from .api import SherlockAPI
+from .comments import CommentIndex
 from .models import SherlockFinding, SherlockIssue, SherlockReport
+from .utils import family_issue_points
 
 ProgressCallback = Callable[[int, int, SherlockIssue | None], None]
 
+# Name of your own row in the team table when SHERLOCK_HANDLE isn't set.
+DEFAULT_HANDLE = "me"
+
 
 class SherlockConnector:
-    def __init__(self, contest_id: int, session_id: str | None):
-        self.api = SherlockAPI(contest_id, session_id)
+    def __init__(
+        self,
+        contest_id: int,
+        session_id: str | None,
+        api: SherlockAPI | None = None,
+        workers: int | None = None,
+        archive: ArchiveWriter | None = None,
+        replay: ArchiveView | None = None,
+        members: Mapping[str, str] | None = None,
+        comments_budget: float | None = None,
+        comments_limit: int | None = None,
+        handle: str | None = None,
+    ):
+        self.api = api or SherlockAPI(
+            contest_id, session_id, archive=archive, replay=replay
+        )
+        # Other team members' sessions. Only their judge payload differs
+        # (`was_submitted_by_user`), so that is all that is fetched for them.
+        self.member_apis = {
+            name: SherlockAPI(contest_id, member_session)
+            for name, member_session in (members or {}).items()
+        }
+        self._member_pool = (
+            ThreadPoolExecutor(max_workers=len(self.member_apis))
+            if self.member_apis
+            else None
+        )
+        # Your own row in the team table.
+        self.handle = (handle or "").strip() or DEFAULT_HANDLE
+        # Each member's last tally that could be refreshed.
+        self._member_tallies: dict[str, MemberTally] = {}
         self.contest_id = contest_id
+        # With -c: seconds / requests one refresh may spend on discussions;
+        # whatever is left waits for the next poll (None = no limit).
+        self.comments_budget = comments_budget
+        self.comments_limit = comments_limit
+        # Issue id -> (monotonic time of the last fetch, its comments).
+        self._discussions: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+        # Kept up to date from the refetched discussions only.
+        self.comment_index = CommentIndex()
+        self._pool = make_pool(workers)
+        self.scorer: IncrementalScorer[str, tuple[bool, int | None, int]] = (
+            IncrementalScorer(family_issue_points, weight=lambda sig: sig[2])
+        )
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        if self._member_pool is not None:
+            self._member_pool.shutdown(cancel_futures=True)
+            self._member_pool = None
 
+    @phase("build")
     def build_report(
         self,
         include_comments: bool = False,
         progress_callback: ProgressCallback | None = None,
     ) -> SherlockReport:
-        issues = self._fetch_issues()
-        families = self._extract_families(self.api.getJudge())
-        findings = self._build_findings(issues, families)
+        # Members' judge payloads download while the shared ones are handled.
+        member_judges: dict[str, Future] = {
+            name: self._member_pool.submit(api.getJudge)
+            for name, api in self.member_apis.items()
+        }
+        if self._pool is not None:
+            # Both payloads are decoded in parallel worker processes, which
+            # send back only the fields the models read; the models are built
+            # here, so no object graph has to be pickled back.
+            titles = self._pool.submit(_compact_titles, self.api.getTitles(raw=True))
+            judge = self._pool.submit(_compact_families, self.api.getJudge(raw=True))
+            issues = self._parse_issues(titles.result())
+            findings = self._build_findings(issues, judge.result())
+        else:
+            issues = self._parse_issues(self.api.getTitles())
+            findings = self._build_findings(
+                issues, self._extract_families(self.api.getJudge())
+            )
 
+        comments_pending = 0
         if include_comments:
-            self._attach_comments(issues, progress_callback)
+            comments_pending = self._attach_comments(issues, progress_callback)
 
         total_points = self._assign_points(findings)
         contest = self.api.getContest() or {}
         prize_pool = float(contest.get("prize_pool") or 0.0)
         self._assign_rewards(findings, total_points, prize_pool)
 
-        return SherlockReport.from_data(
+        report = SherlockReport.from_data(
             contest_id=self.contest_id,
             issues=issues,
             findings=findings,
             prize_pool=prize_pool,
             total_points=total_points,
         )
+        report.comments_pending = comments_pending
+        report.handle = self.handle
+        if include_comments:
+            report.comment_index = self.comment_index
+        if member_judges:
+            report.team = {self.handle: _member_tally(self.handle, report.my_issues)}
+            for name, judge in member_judges.items():
+                report.team[name] = self._refresh_member(name, judge, issues)
+        return report
+
+    def _refresh_member(
+        self, name: str, judge: Future, issues: dict[str, SherlockIssue]
+    ) -> MemberTally:
+        """A teammate's tally; one failing session doesn't fail the refresh."""
+        try:
+            submitted = self._submitted_issue_ids(self._extract_families(judge.result()))
+        except Exception as exc:
+            previous = self._member_tallies.get(name)
+            if previous is None:
+                return MemberTally(name, error=_describe(exc))
+            return replace(previous, error=_describe(exc), stale=True)
+        tally = _member_tally(name, (issues[i] for i in submitted if i in issues))
+        self._member_tallies[name] = tally
+        return tally
 
-    def _fetch_issues(self) -> dict[str, SherlockIssue]:
-        titles_payload = self.api.getTitles() or {}
+    @staticmethod
+    def _parse_issues(titles_payload: Any) -> dict[str, SherlockIssue]:
         issues: dict[str, SherlockIssue] = {}
-        for issue_id, data in titles_payload.items():
+        for issue_id, data in (titles_payload or {}).items():
             issue_key = str(issue_id)
             issues[issue_key] = SherlockIssue.from_api(issue_key, data or {})
         return issues
 
-    def _extract_families(self, judge_payload: Any) -> list[dict[str, Any]]:
+    @staticmethod
+    def _extract_families(judge_payload: Any) -> list[dict[str, Any]]:
         if isinstance(judge_payload, dict):
             families = judge_payload.get("families") or []
             if isinstance(families, list):
@@ -61,8 +167,19 @@ class SherlockConnector:
                         return families
         return []
 
+    @staticmethod
+    def _submitted_issue_ids(families: list[dict[str, Any]]) -> set[str]:
+        submitted: set[str] = set()
+        for family in families:
+            if not isinstance(family, dict):
+                continue
+            for member in (family.get("main"), *(family.get("duplicates") or [])):
+                if member and member.get("was_submitted_by_user"):
+                    submitted.add(str(member.get("issue")))
+        return submitted
+
+    @staticmethod
     def _build_findings(
-        self,
         issues: dict[str, SherlockIssue],
         families: list[dict[str, Any]],
     ) -> list[SherlockFinding]:
@@ -77,23 +194,71 @@ class SherlockConnector:
         self,
         issues: dict[str, SherlockIssue],
         progress_callback: ProgressCallback | None,
-    ) -> None:
-        total = len(issues)
-        for idx, issue in enumerate(issues.values(), start=1):
+    ) -> int:
+        """
+        Refresh discussions until the comment budget runs out: never fetched
+        ones first (by tier, see `_comment_priority`), then the stalest by
+        time since their last fetch weighted by tier, so a tier-3 discussion
+        waits at most `_TIER_WEIGHTS[0]` times as long as a tier-0 one but is
+        never starved. Issues left over keep the comments of their previous
+        fetch. Returns how many discussions were never fetched yet.
+        """
+        discussions = self._discussions
+        for issue_id in discussions.keys() - issues.keys():
+            del discussions[issue_id]
+        self.comment_index.retain(issues.keys())
+        now = time.monotonic()
+
+        def urgency(issue: SherlockIssue) -> tuple[Any, ...]:
+            tier = _comment_priority(issue)
+            cached = discussions.get(issue.id)
+            if cached is None:
+                return (0, tier, 0.0, issue.number)
+            return (1, 0, (cached[0] - now) * _TIER_WEIGHTS[tier], issue.number)
+
+        queue = sorted(issues.values(), key=urgency)
+        deadline = (
+            time.monotonic() + self.comments_budget
+            if self.comments_budget is not None
+            else None
+        )
+        limit = len(queue) if self.comments_limit is None else self.comments_limit
+        total = len(queue)
+        fetched = 0
+        for issue in queue:
+            if fetched >= limit or (deadline is not None and time.monotonic() >= deadline):
+                break
+            fetched += 1
             if progress_callback:
-                progress_callback(idx, total, issue)
+                progress_callback(fetched, total, issue)
             discussion = self.api.getDiscussions(issue.id) or {}
             comments = discussion.get("comments") or []
-            issue.attach_comments(comments)
+            discussions[issue.id] = (time.monotonic(), comments)
+            self.comment_index.update(issue.id, comments)
         if progress_callback:
             progress_callback(total, total, None)
 
+        pending = 0
+        for issue in issues.values():
+            cached = discussions.get(issue.id)
+            if cached is not None:
+                issue.attach_comments(cached[1])
+            else:
+                pending += 1
+        return pending
+
+    @phase("score")
     def _assign_points(self, findings: list[SherlockFinding]) -> float:
-        total_points = 0.0
+        # Only families whose severity, validity or size changed since the
+        # previous poll are re-scored; the total is updated from their deltas.
+        scorer = self.scorer
         for finding in findings:
-            total_points += finding.assign_points()
-        return total_points
+            finding.set_points(
+                scorer.score(finding.main.id, finding.score_signature())
+            )
+        return scorer.finish()
 
+    @phase("score")
     def _assign_rewards(
         self,
         findings: list[SherlockFinding],
@@ -102,3 +267,64 @@ class SherlockConnector:
     ) -> None:
         for finding in findings:
             finding.assign_rewards(total_points, prize_pool)
+
+
+# What SherlockIssue.from_api / SherlockFinding.from_api read from the payloads.
+_TITLE_KEYS = ("number", "title")
+_MEMBER_KEYS = ("issue", "was_submitted_by_user", "has_escalation_comment", "escalation_resolved")
+
+
+def _compact_titles(titles_raw: bytes) -> dict[str, dict[str, Any]]:
+    """Worker-side: decode the titles payload, keeping only the fields used."""
+    return {
+        str(issue_id): _pick(data or {}, _TITLE_KEYS)
+        for issue_id, data in (json.loads(titles_raw) or {}).items()
+    }
+
+
+def _compact_families(judge_raw: bytes) -> list[dict[str, Any]]:
+    """Worker-side: decode the judge payload, keeping only the fields used."""
+    return [
+        {
+            "primary_severity": family.get("primary_severity"),
+            "main": _pick(family.get("main") or {}, _MEMBER_KEYS),
+            "duplicates": [
+                _pick(member, _MEMBER_KEYS) for member in family.get("duplicates") or []
+            ],
+        }
+        for family in SherlockConnector._extract_families(json.loads(judge_raw))
+        if isinstance(family, dict)
+    ]
+
+
+def _pick(payload: dict[str, Any], keys: tuple[str, ...]) -> dict[str, Any]:
+    return {key: payload[key] for key in keys if key in payload}
+
+
+# How much faster a discussion of each tier ages (see _attach_comments).
+_TIER_WEIGHTS = (8.0, 4.0, 2.0, 1.0)
+
+
+def _comment_priority(issue: SherlockIssue) -> int:
+    """Which discussions are refreshed first: lower tiers go first."""
+    if issue.mine:
+        return 0
+    if issue.escalation_escalated and not issue.escalation_resolved:
+        return 1
+    if issue.is_main and issue.is_valid:
+        return 2
+    return 3
+
+
+def _describe(exc: Exception) -> str:
+    return str(exc) or type(exc).__name__
+
+
+def _member_tally(name: str, issues: Iterable[SherlockIssue]) -> MemberTally:
+    tally = MemberTally(name)
+    for issue in issues:
+        tally.submissions += 1
+        if issue.is_valid:
+            tally.valid += 1
+            tally.reward += issue.reward
+    return tally
@@ -2,68 +2,83 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import os
-import traceback
 from typing import Any
 
-from dotenv import load_dotenv
-
+from submission_analyzer.archive import open_archive_args
+from submission_analyzer.export import EVENT_FIELDS
 from submission_analyzer.monitoring import setup_sentry
-from submission_analyzer.notifiers.telegram_notifier import TelegramBot
+from submission_analyzer.table import COLUMNS
+from submission_analyzer.team import parse_members
+from submission_analyzer.watch import Watch, watch
 
-from .cli import parse_sherlock_args, render_report
+from .cli import format_report, parse_sherlock_args, search_comments
 from .connector import ProgressCallback, SherlockConnector
 from .models import SherlockIssue, SherlockReport
 
-MAX_RETRIES = 5
-FALLBACK_RETRY_DELAY = 600
+PLATFORM = "sherlock"
+
+_EXPORT_FIELDS = (*EVENT_FIELDS, *SherlockIssue.record_fields())
+_TABLE_FIELDS = (*EVENT_FIELDS, *COLUMNS)
 
 
 async def main():
     args = parse_sherlock_args()
 
+    from dotenv import load_dotenv
+
     load_dotenv()
     setup_sentry()
 
-    session_id = os.getenv("SESSION_SHERLOCK")
-    telegram_bot = TelegramBot(os.getenv("BOT_TOKEN"), os.getenv("CHAT_ID"))
-    connector = SherlockConnector(args.contestId, session_id)
-
-    last_snapshot: tuple[Any, ...] | None = None
-    retries = 0
-    timeout = args.timeout
-    retry_delay = timeout if timeout and timeout > 0 else FALLBACK_RETRY_DELAY
-
+    archive, replay = open_archive_args(args)
+    connect = functools.partial(
+        SherlockConnector,
+        args.contestId,
+        os.getenv("SESSION_SHERLOCK"),
+        workers=args.workers,
+        archive=archive,
+        replay=replay,
+        # An archive only holds the main session's responses.
+        members=None if replay else parse_members(os.getenv("SESSION_SHERLOCK_TEAM")),
+        comments_budget=args.comments_budget,
+        comments_limit=args.comments_limit,
+        handle=os.getenv("SHERLOCK_HANDLE"),
+    )
+    exporting = args.format != "table"
     progress_callback: ProgressCallback | None = (
-        _comment_progress if args.comments else None
+        _comment_progress if args.comments and not (exporting and not args.output) else None
+    )
+
+    def snapshot(report: SherlockReport) -> tuple[Any, ...]:
+        hits = search_comments(report, args)
+        if hits is None:
+            return report.snapshot()
+        # New matching comments are a change worth showing.
+        return (report.snapshot(), [(h.issue_id, h.comment.get("id")) for h in hits])
+
+    await watch(
+        Watch(
+            platform=PLATFORM,
+            args=args,
+            connect=connect,
+            build=lambda connector: connector.build_report(
+                include_comments=args.comments, progress_callback=progress_callback
+            ),
+            format_report=format_report,
+            summary=lambda report, connector: _build_notification_summary(report),
+            export_items=lambda report: _export_items(report, args),
+            export_fields=_TABLE_FIELDS if args.schema == "contest" else _EXPORT_FIELDS,
+            snapshot=snapshot,
+        )
     )
 
-    while retries < MAX_RETRIES:
-        try:
-            report = connector.build_report(
-                include_comments=args.comments,
-                progress_callback=progress_callback,
-            )
-            snapshot = report.snapshot()
-            if snapshot != last_snapshot:
-                render_report(report, args)
-                summary = _build_notification_summary(report)
-                if summary:
-                    await telegram_bot.sendMessage(summary)
-                last_snapshot = snapshot
-            retries = 0
-            if timeout is None:
-                return
-            await asyncio.sleep(timeout)
-        except Exception as exc:
-            retries += 1
-            print(f"[sherlock] error while refreshing data: {exc}")
-            traceback.print_exc()
-            if retries >= MAX_RETRIES:
-                raise RuntimeError("Exceeded maximum retries") from exc
-            await asyncio.sleep(retry_delay)
-
-    raise RuntimeError("Exceeded maximum retries")
+
+def _export_items(report: SherlockReport, args):
+    """The records streamed by --format/--serve, their keys and key field."""
+    if args.schema == "contest":
+        return report.to_table().rows(), lambda row: row.issue_id, "issue_id"
+    return report.issues.values(), lambda issue: issue.id, "id"
 
 
 def _build_notification_summary(report: SherlockReport) -> str:
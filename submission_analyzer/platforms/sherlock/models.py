@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Any
 
+from submission_analyzer.table import ContestTable
+from submission_analyzer.team import MemberTally
+
+from .comments import CommentIndex
+from .utils import family_issue_points
 
 SEVERITY_LABELS = {1: "High", 2: "Medium"}
+# Sherlock severity -> ContestTable severity (3 is low/invalid).
+TABLE_SEVERITIES = {1: "high", 2: "medium", 3: "low"}
 
 
 @dataclass
@@ -22,6 +29,14 @@ class SherlockIssue:
     reward: float = 0.0
     escalation_escalated: bool = False
     escalation_resolved: bool = False
+    # Lead-judge comments, filtered from `_lead_judge_source` (the comments
+    # list they were taken from) and refiltered once `comments` changes.
+    _lead_judge_comments: list[dict[str, Any]] = field(
+        default_factory=list, init=False, repr=False
+    )
+    _lead_judge_source: tuple[Any, int] | None = field(default=None, init=False, repr=False)
+    # Membership index over duplicate_ids so huge families stay linear to build.
+    _duplicate_set: set[str] = field(default_factory=set, init=False, repr=False)
 
     @classmethod
     def from_api(cls, issue_id: str, payload: dict[str, Any]) -> "SherlockIssue":
@@ -57,7 +72,10 @@ class SherlockIssue:
             self.duplicate_of = main_issue_id
 
     def add_duplicate(self, duplicate_id: str) -> None:
-        if duplicate_id not in self.duplicate_ids:
+        if len(self._duplicate_set) != len(self.duplicate_ids):
+            self._duplicate_set = set(self.duplicate_ids)
+        if duplicate_id not in self._duplicate_set:
+            self._duplicate_set.add(duplicate_id)
             self.duplicate_ids.append(duplicate_id)
 
     def attach_comments(self, comments: list[dict[str, Any]]) -> None:
@@ -74,7 +92,11 @@ class SherlockIssue:
 
     @property
     def lead_judge_comments(self) -> list[dict[str, Any]]:
-        return [c for c in self.comments if c.get("is_lead_judge")]
+        source = self._lead_judge_source
+        if source is None or source[0] is not self.comments or source[1] != len(self.comments):
+            self._lead_judge_comments = [c for c in self.comments if c.get("is_lead_judge")]
+            self._lead_judge_source = (self.comments, len(self.comments))
+        return self._lead_judge_comments
 
     @property
     def is_valid(self) -> bool:
@@ -92,15 +114,22 @@ class SherlockIssue:
             self.severity,
             self.is_main,
             self.duplicate_of,
-            tuple(sorted(self.duplicate_ids)),
+            frozenset(self.duplicate_ids),
             self.is_submitted_by_user,
             round(self.points, 8),
             round(self.reward, 8),
             self.escalation_escalated,
             self.escalation_resolved,
-            tuple(sorted(c.get("id") for c in self.lead_judge_comments)),
+            frozenset(c.get("id") for c in self.lead_judge_comments),
         )
 
+    @classmethod
+    def record_fields(cls) -> tuple[str, ...]:
+        return tuple(f.name for f in fields(cls) if not f.name.startswith("_"))
+
+    def to_record(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.record_fields()}
+
     def __eq__(self, other):
         if not isinstance(other, SherlockIssue):
             return NotImplemented
@@ -160,63 +189,55 @@ class SherlockFinding:
     def submissions_count(self) -> int:
         return 1 + len(self.duplicates)
 
-    @property
-    def mine(self) -> bool:
-        if self.main.mine:
-            return True
-        return any(dup.mine for dup in self.duplicates)
-
     @property
     def is_valid(self) -> bool:
         return self.main.is_valid
 
+    # Family-level flags, read from the members each time so they can't go
+    # stale; only rendered rows ask for them.
+    @property
+    def mine(self) -> bool:
+        return any(issue.mine for issue in self.iter_issues())
+
     @property
     def escalation_escalated(self) -> bool:
-        if self.main.escalation_escalated:
-            return True
-        return any(dup.escalation_escalated for dup in self.duplicates)
+        return any(issue.escalation_escalated for issue in self.iter_issues())
 
     @property
     def escalation_resolved(self) -> bool:
-        escalated_members = [
-            issue
-            for issue in [self.main, *self.duplicates]
-            if issue.escalation_escalated
-        ]
-        if not escalated_members:
-            return False
-        return all(issue.escalation_resolved for issue in escalated_members)
+        escalated = [issue for issue in self.iter_issues() if issue.escalation_escalated]
+        return bool(escalated) and all(issue.escalation_resolved for issue in escalated)
 
     def iter_issues(self) -> tuple[SherlockIssue, ...]:
         return (self.main, *self.duplicates)
 
-    def assign_points(self) -> float:
-        issues = self.iter_issues()
-        for issue in issues:
-            issue.points = 0.0
-
-        if not self.main.is_main or not self.main.is_valid:
-            return 0.0
+    def score_signature(self) -> tuple[bool, int | None, int]:
+        """Everything the family's points depend on."""
+        return (
+            self.main.is_main and self.main.is_valid,
+            self.main.severity,
+            self.submissions_count,
+        )
 
-        from .utils import calculate_issue_points
+    def assign_points(self) -> float:
+        return self.set_points(family_issue_points(self.score_signature()))
 
-        submissions_count = self.submissions_count
-        points = calculate_issue_points(submissions_count, self.main.severity)
+    def set_points(self, points: float) -> float:
+        """Give every issue of the family `points`; returns the family total."""
+        issues = self.iter_issues()
         for issue in issues:
             issue.points = points
-        return points * submissions_count
+        return points * len(issues)
 
     def assign_rewards(self, total_points: float, prize_pool: float) -> None:
-        issues = self.iter_issues()
-        if total_points <= 0 or prize_pool <= 0:
-            for issue in issues:
-                issue.reward = 0.0
-            return
-        for issue in issues:
-            if issue.points <= 0:
-                issue.reward = 0.0
-            else:
-                issue.reward = (issue.points / total_points) * prize_pool
+        # Every issue of a family has the same points, hence the same reward.
+        points = self.main.points
+        if total_points <= 0 or prize_pool <= 0 or points <= 0:
+            reward = 0.0
+        else:
+            reward = (points / total_points) * prize_pool
+        for issue in self.iter_issues():
+            issue.reward = reward
 
 
 @dataclass
@@ -231,31 +252,32 @@ class SherlockReport:
     my_valid_issues: int
     total_escalated: int
     total_resolved: int
+    # Indexes built once by from_data so rendering never rescans the contest.
+    total_valid_issues: int = 0
+    my_issues: list[SherlockIssue] = field(default_factory=list)
+    invalid_escalated_issues: list[SherlockIssue] = field(default_factory=list)
+    valid_findings: list[SherlockFinding] = field(default_factory=list)
+    lead_judge_commented_invalid: int = 0
+    last_lead_judge_comment: dict[str, Any] | None = None
+    last_lead_judge_issue: SherlockIssue | None = None
+    # Tracked team members (SESSION_SHERLOCK_TEAM), keyed by name.
+    team: dict[str, MemberTally] = field(default_factory=dict)
+    # Your handle (SHERLOCK_HANDLE); the owner of your rows in `to_table()`.
+    handle: str = ""
+    # With -c: discussions never fetched yet (comment budget spent); they go
+    # first next poll.
+    comments_pending: int = 0
+    # With -c: the connector's index over every fetched comment.
+    comment_index: CommentIndex | None = field(default=None, repr=False)
 
     @property
     def total_issues(self) -> int:
         return len(self.issues)
 
-    @property
-    def total_valid_issues(self) -> int:
-        return sum(1 for issue in self.issues.values() if issue.is_valid)
-
     @property
     def total_invalid_issues(self) -> int:
         return self.total_issues - self.total_valid_issues
 
-    @property
-    def valid_findings(self) -> list[SherlockFinding]:
-        return [finding for finding in self.findings if finding.is_valid]
-
-    @property
-    def invalid_escalated_issues(self) -> list[SherlockIssue]:
-        return [
-            issue
-            for issue in self.issues.values()
-            if issue.severity == 3 and issue.escalation_escalated
-        ]
-
     @classmethod
     def from_data(
         cls,
@@ -267,21 +289,46 @@ class SherlockReport:
         total_points: float,
     ) -> "SherlockReport":
         my_total_reward = 0.0
-        my_total_issues = 0
         my_valid_issues = 0
-        total_escalated = 0
+        total_valid_issues = 0
         total_resolved = 0
+        my_issues: list[SherlockIssue] = []
+        total_escalated = 0
+        invalid_escalated_issues: list[SherlockIssue] = []
+        lead_judge_commented_invalid = 0
+        last_comment: dict[str, Any] | None = None
+        last_issue: SherlockIssue | None = None
 
         for issue in issues.values():
+            is_valid = issue.is_valid
+            if is_valid:
+                total_valid_issues += 1
             if issue.mine:
-                my_total_issues += 1
-                if issue.is_valid:
+                my_issues.append(issue)
+                if is_valid:
                     my_valid_issues += 1
                     my_total_reward += issue.reward
             if issue.escalation_escalated:
                 total_escalated += 1
+                if issue.severity == 3:
+                    invalid_escalated_issues.append(issue)
             if issue.escalation_resolved:
                 total_resolved += 1
+            lj_comments = issue.lead_judge_comments
+            if lj_comments:
+                if issue.severity == 3:
+                    lead_judge_commented_invalid += 1
+                latest = max(lj_comments, key=lambda c: c.get("created_at") or 0)
+                if last_comment is None or (latest.get("created_at") or 0) > (
+                    last_comment.get("created_at") or 0
+                ):
+                    last_comment = latest
+                    last_issue = issue
+
+        valid_findings: list[SherlockFinding] = []
+        for finding in findings:
+            if finding.is_valid:
+                valid_findings.append(finding)
 
         return cls(
             contest_id=contest_id,
@@ -290,16 +337,63 @@ class SherlockReport:
             prize_pool=prize_pool,
             total_points=total_points,
             my_total_reward=my_total_reward,
-            my_total_issues=my_total_issues,
+            my_total_issues=len(my_issues),
             my_valid_issues=my_valid_issues,
             total_escalated=total_escalated,
             total_resolved=total_resolved,
+            total_valid_issues=total_valid_issues,
+            my_issues=my_issues,
+            invalid_escalated_issues=invalid_escalated_issues,
+            valid_findings=valid_findings,
+            lead_judge_commented_invalid=lead_judge_commented_invalid,
+            last_lead_judge_comment=last_comment,
+            last_lead_judge_issue=last_issue,
         )
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "contest_id": self.contest_id,
+            "prize_pool": self.prize_pool,
+            "total_points": self.total_points,
+            "total_issues": self.total_issues,
+            "total_valid_issues": self.total_valid_issues,
+            "my_total_reward": self.my_total_reward,
+            "my_total_issues": self.my_total_issues,
+            "my_valid_issues": self.my_valid_issues,
+            "total_escalated": self.total_escalated,
+            "total_resolved": self.total_resolved,
+            "comments_pending": self.comments_pending,
+            "team": [member.to_dict() for member in self.team.values()],
+            "issues": [issue.to_record() for issue in self.issues.values()],
+        }
+
+    def to_table(self) -> ContestTable:
+        family_sizes: dict[str, int] = {}
+        for finding in self.findings:
+            size = 1 + len(finding.duplicates)
+            family_sizes[finding.main.id] = size
+            for duplicate in finding.duplicates:
+                family_sizes[duplicate.id] = size
+        table = ContestTable("sherlock", self.contest_id)
+        for issue in self.issues.values():
+            table.append(
+                issue.id,
+                issue.duplicate_of or issue.id,
+                TABLE_SEVERITIES.get(issue.severity, "none"),
+                issue.is_valid,
+                family_sizes.get(issue.id, 1),
+                owner=self.handle if issue.mine else "",
+                mine=issue.mine,
+                escalated=issue.escalation_escalated,
+                escalation_resolved=issue.escalation_resolved,
+                points=issue.points,
+                reward=issue.reward,
+            )
+        return table
+
     def snapshot(self) -> tuple[Any, ...]:
-        issues_snapshot = tuple(
-            sorted((issue.id, issue.snapshot()) for issue in self.issues.values())
-        )
+        # A dict compares order-independently without sorting every poll.
+        issues_snapshot = {issue.id: issue.snapshot() for issue in self.issues.values()}
         return (
             self.contest_id,
             round(self.prize_pool, 2),
@@ -309,5 +403,7 @@ class SherlockReport:
             self.my_valid_issues,
             self.total_escalated,
             self.total_resolved,
+            tuple(member.snapshot() for member in self.team.values()),
+            self.comments_pending,
             issues_snapshot,
         )
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
+from typing import TYPE_CHECKING
 
-from .models import SherlockIssue
+if TYPE_CHECKING:
+    from .models import SherlockIssue
 
 
 def get_valids(issues: Iterable[SherlockIssue]) -> list[SherlockIssue]:
@@ -17,6 +19,14 @@ def get_invalids_escalated(issues: Iterable[SherlockIssue]) -> list[SherlockIssu
     ]
 
 
+def family_issue_points(signature: tuple[bool, int | None, int]) -> float:
+    """Points of each issue in a family, from `SherlockFinding.score_signature`."""
+    scored, severity, submissions_count = signature
+    if not scored:
+        return 0.0
+    return calculate_issue_points(submissions_count, severity)
+
+
 def calculate_issue_points(submissions_count: int, severity: int | None) -> float:
     if severity is None:
         return 0.0
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, TextIO
+
+if TYPE_CHECKING:
+    import cProfile
+    import pstats
+
+# Reporting order; any other phase name is listed after these.
+PHASES = ("fetch", "decode", "build", "score", "snapshot", "render")
+
+_active: RefreshProfile | None = None
+
+
+def add_profile_args(parser) -> None:
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Profile the first refresh: print wall/CPU time per phase (fetch, decode, "
+            "build, score, snapshot, render) and the hottest functions to stderr. "
+            "With PATH, also write the cProfile stats there (snakeviz, flameprof, gprof2dot)."
+        ),
+    )
+
+
+def open_profile_args(args) -> RefreshProfile | None:
+    return RefreshProfile(args.profile or None) if args.profile is not None else None
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Charge the enclosed work to phase `name` of the refresh being profiled;
+    a no-op otherwise. Also usable as a decorator.
+    """
+    profile = _active
+    if profile is None:
+        yield
+        return
+    with profile.phase(name):
+        yield
+
+
+class RefreshProfile:
+    """
+    Wall and CPU time per phase of one refresh cycle, plus a cProfile of it.
+
+    Phases nest and time is charged to the innermost one, so "build" is the
+    model building left once the fetches, decoding and scoring it triggers
+    are taken out. Every thread keeps its own phase stack, CPU clock and
+    profiler, so helper threads (page prefetch, teammates' sessions) are
+    counted too; their wall time overlaps the main thread's.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self.wall: dict[str, float] = defaultdict(float)
+        self.cpu: dict[str, float] = defaultdict(float)
+        self.calls: dict[str, int] = defaultdict(int)
+        self.elapsed = 0.0
+        self._started = 0.0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profilers: list[cProfile.Profile] = []
+
+    def start(self) -> None:
+        global _active
+        self.wall.clear()
+        self.cpu.clear()
+        self.calls.clear()
+        self._local = threading.local()
+        self._profilers = []
+        self._started = time.perf_counter()
+        _active = self
+
+    def stop(self) -> None:
+        global _active
+        if _active is self:
+            _active = None
+        self.elapsed = time.perf_counter() - self._started
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        local = self._local
+        stack: list[list[float]] | None = getattr(local, "stack", None)
+        if stack is None:
+            # Only imported once --profile is on.
+            import cProfile
+
+            stack = local.stack = []
+            local.profiler = cProfile.Profile()
+            with self._lock:
+                self._profilers.append(local.profiler)
+        if not stack:
+            local.profiler.enable()
+        nested = [0.0, 0.0]  # wall, CPU spent in phases opened inside this one
+        stack.append(nested)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            stack.pop()
+            if stack:
+                stack[-1][0] += wall
+                stack[-1][1] += cpu
+            else:
+                local.profiler.disable()
+            with self._lock:
+                self.wall[name] += wall - nested[0]
+                self.cpu[name] += cpu - nested[1]
+                self.calls[name] += 1
+
+    def stats(self) -> pstats.Stats | None:
+        if not self._profilers:
+            return None
+        import pstats
+
+        return pstats.Stats(*self._profilers)
+
+    def format(self, top: int = 12) -> list[str]:
+        lines = [
+            f"Refresh profile: {self.elapsed:.3f}s wall",
+            f"{'Phase':<10} {'Calls':>6} {'Wall (s)':>9} {'CPU (s)':>9}",
+        ]
+        lines.append("-" * len(lines[1]))
+        names = [*PHASES, *sorted(set(self.calls) - set(PHASES))]
+        for name in names:
+            if name in self.calls:
+                lines.append(
+                    f"{name:<10} {self.calls[name]:>6} "
+                    f"{self.wall[name]:>9.3f} {self.cpu[name]:>9.3f}"
+                )
+
+        stats = self.stats()
+        if stats is not None and top:
+            import pstats
+
+            lines.append("")
+            lines.append(f"{'Own (s)':>9} {'Cum (s)':>9}  Function")
+            # The phase bookkeeping itself is profiled too; leave it out.
+            hot = [f for f in stats.sort_stats("tottime").fcn_list if f[0] != __file__]
+            for func in hot[:top]:
+                _, _, own, cumulative, _ = stats.stats[func]
+                lines.append(
+                    f"{own:>9.3f} {cumulative:>9.3f}  {pstats.func_std_string(func)}"
+                )
+        return lines
+
+    def report(self, stream: TextIO) -> None:
+        """Print the breakdown to `stream` and write the profile file, if any."""
+        stream.write("\n".join(self.format()) + "\n")
+        stats = self.stats()
+        if self.path and stats is not None:
+            stats.dump_stats(self.path)
+            stream.write(f"Profile written to {self.path}\n")
+        stream.flush()
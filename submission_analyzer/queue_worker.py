@@ -0,0 +1,423 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import operator
+import os
+import socket
+import sys
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+from submission_analyzer.health import FIRST_RETRY_DELAY, MAX_RETRY_DELAY
+from submission_analyzer.jobqueue import DEFAULT_LEASE, Job, JobQueue, JobResult
+from submission_analyzer.monitoring import setup_sentry
+from submission_analyzer.notifiers.base import ChangeEvent
+from submission_analyzer.notifiers.registry import (
+    NotifierHub,
+    add_notify_args,
+    build_notifiers,
+    notify_specs,
+)
+from submission_analyzer.team import parse_members
+from submission_analyzer.utils import cache_path
+
+PLATFORMS = ("sherlock", "code4rena")
+# Connectors a worker keeps between runs of the same contest (their
+# caches make the next refresh cheaper); the least recently run go first.
+MAX_CONNECTORS = 16
+
+
+def parse_queue_args():
+    parser = argparse.ArgumentParser(
+        prog="analyzer-queue",
+        description=(
+            "Share contest refreshes between several analyzer processes or hosts "
+            "through a SQLite job queue."
+        ),
+    )
+    parser.add_argument(
+        "--queue",
+        metavar="PATH",
+        default=None,
+        help=(
+            "Queue database (default: SUBMISSION_ANALYZER_QUEUE, else jobs.sqlite3 "
+            "in the analyzer cache directory)."
+        ),
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="Queue a contest, or update its options.")
+    add.add_argument("platform", choices=PLATFORMS)
+    add.add_argument("contestId")
+    add.add_argument(
+        "-t",
+        "--timeout",
+        type=int,
+        default=0,
+        help="Seconds between refreshes; refreshed once when omitted.",
+    )
+    add.add_argument(
+        "-c",
+        "--comments",
+        action="store_true",
+        help="Sherlock: fetch discussion comments for each issue.",
+    )
+    add.add_argument(
+        "--comments-budget",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Sherlock, with -c: stop fetching discussions after SECONDS per refresh.",
+    )
+    add.add_argument(
+        "--comments-limit",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Sherlock, with -c: fetch at most N discussions per refresh.",
+    )
+    add.add_argument(
+        "-u",
+        "--user",
+        default=None,
+        help="Code4rena: your handle, or a comma-separated list (yours first).",
+    )
+    add.add_argument(
+        "-p",
+        "--prize-pool",
+        type=float,
+        default=None,
+        help="Code4rena: high/medium prize pool allocation (USD).",
+    )
+    add.add_argument(
+        "--leaderboard",
+        action="store_true",
+        help="Code4rena: rank every warden in the audit by expected payout.",
+    )
+
+    remove = commands.add_parser("remove", help="Stop refreshing a contest.")
+    remove.add_argument("platform", choices=PLATFORMS)
+    remove.add_argument("contestId")
+
+    commands.add_parser("status", help="List queued contests, their leases and latest results.")
+
+    result = commands.add_parser("result", help="Print a contest's latest report as JSON.")
+    result.add_argument("platform", choices=PLATFORMS)
+    result.add_argument("contestId")
+
+    work = commands.add_parser("work", help="Refresh queued contests until interrupted.")
+    work.add_argument(
+        "--lease",
+        type=float,
+        default=DEFAULT_LEASE,
+        metavar="SECONDS",
+        help=(
+            "How long a claimed contest stays reserved for this worker; renewed while "
+            f"the refresh runs (default: {DEFAULT_LEASE:.0f})."
+        ),
+    )
+    work.add_argument(
+        "--idle",
+        type=float,
+        default=5.0,
+        metavar="SECONDS",
+        help="Longest wait between checks for due jobs (default: 5).",
+    )
+    work.add_argument(
+        "--once",
+        action="store_true",
+        help="Exit once no job is due instead of waiting for more.",
+    )
+    work.add_argument(
+        "--name",
+        default=None,
+        help="Worker name shown in leases and results (default: host:pid).",
+    )
+    add_notify_args(work)
+
+    args = parser.parse_args()
+    if args.command == "add":
+        budgeted = args.comments_budget is not None or args.comments_limit is not None
+        if args.platform == "sherlock":
+            if args.user or args.prize_pool is not None or args.leaderboard:
+                parser.error("-u/-p/--leaderboard only apply to code4rena")
+            if not args.contestId.isdigit():
+                parser.error("Sherlock contest ids are numbers")
+            if budgeted and not args.comments:
+                parser.error("--comments-budget/--comments-limit need -c")
+        elif args.comments or budgeted:
+            parser.error("-c/--comments-budget/--comments-limit only apply to sherlock")
+        if args.timeout < 0:
+            parser.error("-t must not be negative")
+    if args.command == "work" and args.lease <= 0:
+        parser.error("--lease must be positive")
+    return args
+
+
+def job_options(args) -> dict[str, Any]:
+    """The connector options `add` stores with a job."""
+    if args.platform == "sherlock":
+        return {
+            "comments": args.comments,
+            "comments_budget": args.comments_budget,
+            "comments_limit": args.comments_limit,
+        }
+    return {
+        "user": args.user,
+        "prize_pool": args.prize_pool,
+        "leaderboard": args.leaderboard,
+    }
+
+
+def open_connector(job: Job):
+    """A connector for `job`; credentials come from this worker's environment."""
+    options = job.options
+    if job.platform == "sherlock":
+        from submission_analyzer.platforms.sherlock.connector import SherlockConnector
+
+        return SherlockConnector(
+            int(job.contest_id),
+            os.getenv("SESSION_SHERLOCK"),
+            members=parse_members(os.getenv("SESSION_SHERLOCK_TEAM")),
+            comments_budget=options.get("comments_budget"),
+            comments_limit=options.get("comments_limit"),
+            handle=os.getenv("SHERLOCK_HANDLE"),
+        )
+    from submission_analyzer.platforms.code4rena.connector import Code4renaConnector
+
+    users = options.get("user") or os.getenv("CODE4_USER") or ""
+    handles = [h.strip() for h in users.split(",") if h.strip()]
+    return Code4renaConnector(
+        job.contest_id,
+        (os.getenv("CODE4_USER") or "").strip(),
+        (os.getenv("CODE4_PASS") or "").strip(),
+        prize_pool=options.get("prize_pool"),
+        handle=handles[0] if handles else "",
+        team=handles[1:],
+        leaderboard=bool(options.get("leaderboard")),
+    )
+
+
+def build_report(connector, job: Job):
+    if job.platform == "sherlock":
+        return connector.build_report(include_comments=bool(job.options.get("comments")))
+    return connector.build_report()
+
+
+def notification_summary(report, connector, job: Job) -> str:
+    if job.platform == "sherlock":
+        from submission_analyzer.platforms.sherlock.main import _build_notification_summary
+
+        return _build_notification_summary(report)
+    from submission_analyzer.platforms.code4rena.main import _build_notification_summary
+
+    return _build_notification_summary(report, connector.handle)
+
+
+def report_digest(report) -> str:
+    """Same for the same report in any process (PYTHONHASHSEED orders sets)."""
+    return hashlib.sha256(repr(_canonical(report.snapshot())).encode()).hexdigest()
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical(item) for item in value), key=repr)
+    if isinstance(value, dict):
+        return sorted(((repr(k), _canonical(v)) for k, v in value.items()), key=operator.itemgetter(0))
+    if isinstance(value, (tuple, list)):
+        return [_canonical(item) for item in value]
+    return value
+
+
+class QueueWorker:
+    """
+    Claims due jobs one at a time, refreshes them and publishes the report
+    to the queue. The lease is renewed while a refresh runs, so a slow
+    contest isn't handed to a second worker; when the worker dies, the lease
+    lapses and another one picks the contest up.
+
+    Queue calls can wait for the SQLite write lock, so they run in a thread
+    like the refresh itself, keeping notifications and lease renewal going.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        name: str | None = None,
+        lease: float = DEFAULT_LEASE,
+        notifications: NotifierHub | None = None,
+    ):
+        self.queue = queue
+        # Unique even when two workers share a name, so leases never mix up.
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.worker_id = f"{self.name}:{uuid.uuid4().hex[:8]}"
+        self.lease = lease
+        self.notifications = notifications
+        self._connectors: OrderedDict[str, tuple[dict[str, Any], Any]] = OrderedDict()
+
+    def close(self) -> None:
+        for _, connector in self._connectors.values():
+            connector.close()
+        self._connectors.clear()
+
+    async def run(self, idle: float = 5.0, once: bool = False) -> None:
+        while True:
+            job = await asyncio.to_thread(self.queue.claim, self.worker_id, self.lease)
+            if job is not None:
+                await self.refresh(job)
+                continue
+            if once:
+                return
+            due = await asyncio.to_thread(self.queue.next_due)
+            wait = idle if due is None else min(max(due - time.time(), 0.1), idle)
+            await asyncio.sleep(wait)
+
+    async def refresh(self, job: Job) -> None:
+        renewing = asyncio.create_task(self._keep_lease(job))
+        try:
+            connector = await self._connector(job)
+            report = await asyncio.to_thread(build_report, connector, job)
+        except Exception as exc:
+            delay = min(FIRST_RETRY_DELAY * 2**job.failures, MAX_RETRY_DELAY)
+            print(
+                f"[{job.key}] error while refreshing data: {exc}; retrying in {delay:.0f}s",
+                file=sys.stderr,
+            )
+            traceback.print_exc()
+            self._drop_connector(job.key)
+            error = str(exc) or type(exc).__name__
+            await asyncio.to_thread(self.queue.fail, job, error, delay)
+            return
+        finally:
+            renewing.cancel()
+
+        summary, changed = await asyncio.to_thread(self._publish, job, report, connector)
+        if changed is None:
+            print(f"[{job.key}] lease lost to another worker; result dropped", file=sys.stderr)
+            return
+        print(f"[{job.key}] refreshed{' (changed)' if changed else ''}: {summary}", file=sys.stderr)
+        if changed and self.notifications is not None:
+            # One worker notifies about many contests: say which one.
+            self.notifications.push(
+                ChangeEvent(
+                    platform=job.platform,
+                    contest_id=report.contest_id,
+                    summary=f"[{job.key}] {summary}",
+                )
+            )
+
+    async def _keep_lease(self, job: Job) -> None:
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            if not await asyncio.to_thread(self.queue.renew, job, self.lease):
+                print(f"[{job.key}] lease lost to another worker", file=sys.stderr)
+                return
+
+    def _publish(self, job: Job, report, connector) -> tuple[str, bool | None]:
+        summary = notification_summary(report, connector, job)
+        changed = self.queue.complete(job, report.to_dict(), summary, report_digest(report))
+        return summary, changed
+
+    async def _connector(self, job: Job):
+        cached = self._connectors.pop(job.key, None)
+        if cached is not None and cached[0] == job.options:
+            self._connectors[job.key] = cached
+            return cached[1]
+        if cached is not None:
+            cached[1].close()
+        # Code4rena logs in here: a network round trip, kept off the loop.
+        connector = await asyncio.to_thread(open_connector, job)
+        self._connectors[job.key] = (job.options, connector)
+        while len(self._connectors) > MAX_CONNECTORS:
+            _, (_, oldest) = self._connectors.popitem(last=False)
+            oldest.close()
+        return connector
+
+    def _drop_connector(self, key: str) -> None:
+        cached = self._connectors.pop(key, None)
+        if cached is not None:
+            cached[1].close()
+
+
+def format_status(queue: JobQueue) -> list[str]:
+    now = time.time()
+    results = {(r.platform, r.contest_id): r for r in queue.results()}
+    lines = []
+    for job in queue.jobs():
+        if job.lease_owner and job.lease_expires and job.lease_expires > now:
+            state = f"leased by {job.lease_owner} ({job.lease_expires - now:.0f}s left)"
+        elif job.due <= now:
+            state = "due"
+        else:
+            state = f"due in {job.due - now:.0f}s"
+        every = f"every {job.interval:.0f}s" if job.interval > 0 else "once"
+        lines.append(f"{job.key:<30} {every:<12} {state}")
+        if job.failures:
+            lines.append(f"    {job.failures} failed refreshes: {job.last_error}")
+        result = results.pop((job.platform, job.contest_id), None)
+        if result is not None:
+            lines.append(_format_result(result, now))
+    for result in results.values():
+        # One-off jobs are gone from the queue once done.
+        lines.append(f"{result.platform + ':' + result.contest_id:<30} {'done':<12}")
+        lines.append(_format_result(result, now))
+    return lines or ["Queue is empty."]
+
+
+def _format_result(result: JobResult, now: float) -> str:
+    return f"    {now - result.finished_at:.0f}s ago by {result.worker}: {result.summary}"
+
+
+async def main():
+    args = parse_queue_args()
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    queue = JobQueue(
+        args.queue or os.getenv("SUBMISSION_ANALYZER_QUEUE") or cache_path("jobs.sqlite3")
+    )
+    try:
+        if args.command == "add":
+            added = queue.add(args.platform, args.contestId, job_options(args), args.timeout)
+            print(f"{'Queued' if added else 'Updated'} {args.platform}:{args.contestId}")
+        elif args.command == "remove":
+            if not queue.remove(args.platform, args.contestId):
+                sys.exit(f"{args.platform}:{args.contestId} is not queued")
+        elif args.command == "status":
+            print("\n".join(format_status(queue)))
+        elif args.command == "result":
+            result = queue.result(args.platform, args.contestId)
+            if result is None:
+                sys.exit(f"No result for {args.platform}:{args.contestId} yet")
+            print(json.dumps(result.report, indent=2))
+        else:
+            await _work(queue, args)
+    finally:
+        queue.close()
+
+
+async def _work(queue: JobQueue, args) -> None:
+    setup_sentry()
+    notifications = NotifierHub(build_notifiers(notify_specs(args.notify)), coalesce=True)
+    worker = QueueWorker(queue, args.name, lease=args.lease, notifications=notifications)
+    notifications.start()
+    try:
+        await worker.run(idle=args.idle, once=args.once)
+    finally:
+        worker.close()
+        await notifications.close()
+
+
+def main_sync():
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    main_sync()
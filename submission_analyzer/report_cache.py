@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Any
+
+CACHE_VERSION = 3
+
+
+class ReportCache:
+    """
+    The last report of a contest, pickled so that a restarted watcher can
+    show it immediately while the first refresh is still running.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def load(self) -> tuple[Any, float] | None:
+        """`(report, saved_at)`, or None when nothing usable is cached."""
+        try:
+            with open(self.path, "rb") as fh:
+                state = pickle.load(fh)
+        except Exception:
+            # Missing, truncated, or written by an incompatible version.
+            return None
+        if not isinstance(state, dict) or state.get("version") != CACHE_VERSION:
+            return None
+        return state["report"], state["saved_at"]
+
+    def save(self, report: Any) -> None:
+        state = {"version": CACHE_VERSION, "saved_at": time.time(), "report": report}
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "wb") as fh:
+            pickle.dump(state, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import gc
+import json
+import os
+import sys
+import time
+from collections import Counter
+from typing import Any, TextIO
+
+# Samples taken before the baseline: the first refresh legitimately
+# allocates the whole contest, so growth is measured from after it.
+WARMUP_SAMPLES = 2
+MB = 1024 * 1024
+
+
+def add_resource_args(parser) -> None:
+    parser.add_argument(
+        "--monitor-resources",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Sample RSS, model object counts and gc state every refresh (with -t) and "
+            "log the trend to stderr, or as JSON lines to PATH."
+        ),
+    )
+    parser.add_argument(
+        "--rss-warn",
+        type=float,
+        default=200.0,
+        metavar="MB",
+        help=(
+            "With --monitor-resources: warn (and notify) each time RSS grows another "
+            "MB megabytes past its level after the first refresh (default: 200)."
+        ),
+    )
+    parser.add_argument(
+        "--trace-allocs",
+        type=int,
+        default=0,
+        metavar="N",
+        help=(
+            "With --monitor-resources: trace allocations (tracemalloc, slow) and "
+            "report the N source lines whose memory grew most each refresh."
+        ),
+    )
+
+
+def open_resource_args(args) -> ResourceMonitor | None:
+    if args.monitor_resources is None:
+        return None
+    return ResourceMonitor(
+        args.monitor_resources or None,
+        warn_growth=args.rss_warn * MB,
+        trace=args.trace_allocs,
+    )
+
+
+def current_rss() -> int | None:
+    """Resident set size of this process in bytes, when the OS tells us."""
+    try:
+        with open("/proc/self/statm", "rb") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Not available without /proc: the peak is the closest stand-in.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def model_counts(prefix: str = "submission_analyzer.") -> dict[str, int]:
+    """Live objects per class defined in this package (walks the gc heap)."""
+    counts: Counter[str] = Counter()
+    for obj in gc.get_objects():
+        cls = type(obj)
+        module = getattr(cls, "__module__", None)
+        if isinstance(module, str) and module.startswith(prefix):
+            counts[cls.__qualname__] += 1
+    return dict(counts)
+
+
+class ResourceMonitor:
+    """
+    Per-refresh resource samples of a long-running watcher: RSS, live model
+    objects by type, gc counters and, with `trace`, the source lines whose
+    allocations grew most since the previous sample. Each time RSS grows
+    another `warn_growth` bytes past the baseline (taken after the first
+    refresh), `sample` returns a warning.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        warn_growth: float = 200 * MB,
+        trace: int = 0,
+        stream: TextIO | None = None,
+    ):
+        self.path = path
+        self.warn_growth = warn_growth
+        self.trace = trace
+        self.stream = stream
+        self.samples = 0
+        self.baseline: int | None = None
+        self._warned_at = 0.0
+        self._models: dict[str, int] = {}
+        self._snapshot = None
+        if trace:
+            import tracemalloc
+
+            tracemalloc.start()
+            self._snapshot = tracemalloc.take_snapshot()
+
+    def close(self) -> None:
+        if self.trace:
+            import tracemalloc
+
+            tracemalloc.stop()
+            self._snapshot = None
+
+    def sample(self) -> str | None:
+        """Record one sample; returns a warning when RSS crossed the next threshold."""
+        self.samples += 1
+        rss = current_rss()
+        models = model_counts()
+        record: dict[str, Any] = {
+            "time": time.time(),
+            "sample": self.samples,
+            "rss": rss,
+            "rss_growth": None,
+            "gc_counts": gc.get_count(),
+            "gc_collections": [stats["collections"] for stats in gc.get_stats()],
+            "models": models,
+            "models_growth": {
+                name: models.get(name, 0) - self._models.get(name, 0)
+                for name in models.keys() | self._models.keys()
+                if models.get(name, 0) != self._models.get(name, 0)
+            },
+        }
+        self._models = models
+        if self.trace:
+            record["allocations"] = self._allocation_growth()
+
+        warning = None
+        if rss is not None:
+            if self.samples == WARMUP_SAMPLES:
+                self.baseline = rss
+            if self.baseline is not None:
+                growth = rss - self.baseline
+                record["rss_growth"] = growth
+                if growth >= self._warned_at + self.warn_growth:
+                    self._warned_at = growth - growth % self.warn_growth
+                    refreshes = self.samples - WARMUP_SAMPLES
+                    warning = (
+                        f"RSS grew {growth / MB:.0f} MB since the first refresh "
+                        f"(now {rss / MB:.0f} MB, {refreshes} "
+                        f"refresh{'es' if refreshes != 1 else ''} later)"
+                    )
+        record["warning"] = warning
+        self._write(record)
+        return warning
+
+    def _allocation_growth(self) -> list[dict[str, Any]]:
+        import tracemalloc
+
+        # Leave out the monitor's own sampling.
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            )
+        )
+        previous, self._snapshot = self._snapshot, snapshot
+        if previous is None:
+            return []
+        top = snapshot.compare_to(previous, "lineno")[: self.trace]
+        return [
+            {
+                "where": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_diff": stat.size_diff,
+                "count_diff": stat.count_diff,
+            }
+            for stat in top
+        ]
+
+    def _write(self, record: dict[str, Any]) -> None:
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(record) + "\n")
+            return
+        stream = self.stream or sys.stderr
+        rss = record["rss"]
+        line = f"[resources] sample {record['sample']}: RSS "
+        line += f"{rss / MB:.1f} MB" if rss is not None else "n/a"
+        if record["rss_growth"] is not None:
+            line += f" ({record['rss_growth'] / MB:+.1f} MB)"
+        grown = sorted(record["models_growth"].items(), key=lambda kv: -abs(kv[1]))[:4]
+        if grown:
+            line += " | " + ", ".join(f"{name} {delta:+d}" for name, delta in grown)
+        for alloc in record.get("allocations", [])[:3]:
+            line += f" | {alloc['where']} {alloc['size_diff'] / 1024:+.0f} KiB"
+        stream.write(line + "\n")
+        stream.flush()
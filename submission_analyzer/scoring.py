@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+S = TypeVar("S", bound=Hashable)
+
+
+class IncrementalScorer(Generic[K, S]):
+    """
+    Contest points kept up to date across polls.
+
+    Every family is identified by a key and described by a signature: the
+    inputs its points depend on (severity, validity, number of duplicates).
+    A family whose signature didn't change since the previous poll reuses its
+    cached points; only new, changed and removed families move the running
+    total. `weight(signature)` is how many times a family's points count
+    towards the total (Sherlock scores every issue of a family).
+
+    The running total is re-summed exactly with `math.fsum` once the number
+    of deltas applied since the last resync exceeds the number of families,
+    so rounding drift stays bounded at amortized O(1) cost per change.
+
+    One poll is a series of `score` calls followed by `finish`.
+    """
+
+    def __init__(
+        self,
+        points: Callable[[S], float],
+        weight: Callable[[S], int] | None = None,
+    ):
+        self._points = points
+        self._weight = weight
+        self._families: dict[K, tuple[S, float, float]] = {}
+        self._seen: set[K] = set()
+        self._total = 0.0
+        self._deltas = 0
+        self._changed = 0
+        # Families scored anew (or dropped) by the last finished poll.
+        self.last_changed = 0
+
+    @property
+    def total(self) -> float:
+        return self._total
+
+    def score(self, key: K, signature: S) -> float:
+        """Points of one family, recomputed only if its signature changed."""
+        self._seen.add(key)
+        cached = self._families.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        points = self._points(signature)
+        contribution = points * (self._weight(signature) if self._weight else 1)
+        self._deltas += 1
+        self._total += contribution - (cached[2] if cached else 0.0)
+        self._families[key] = (signature, points, contribution)
+        self._changed += 1
+        return points
+
+    def finish(self) -> float:
+        """Drop families missing from this poll and return the total points."""
+        if len(self._seen) != len(self._families):
+            for key in self._families.keys() - self._seen:
+                self._deltas += 1
+                self._total -= self._families.pop(key)[2]
+                self._changed += 1
+        self._seen = set()
+        self.last_changed, self._changed = self._changed, 0
+        if self._deltas > len(self._families):
+            self._total = math.fsum(family[2] for family in self._families.values())
+            self._deltas = 0
+        return self._total
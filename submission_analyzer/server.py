@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import deque
+from collections.abc import Iterable
+from typing import Any
+
+from .health import RefreshHealth
+
+DEFAULT_PORT = 8765
+EVENT_HISTORY = 256
+SUBSCRIBER_BACKLOG = 64
+KEEPALIVE_INTERVAL = 15.0
+
+
+def add_serve_args(parser) -> None:
+    parser.add_argument(
+        "--serve",
+        metavar="ADDRESS",
+        default=None,
+        help=(
+            "Share this poller with other clients over HTTP: HOST:PORT, PORT or "
+            "unix:/path/to.sock. Serves /report, /events (server-sent events) "
+            "and /healthz. Requires -t."
+        ),
+    )
+
+
+class ReportServer:
+    """
+    Minimal HTTP/1.1 server exposing the latest report of one poller.
+
+    The report is serialized once per change and every client receives the
+    same cached bytes; change events are encoded once and fanned out to the
+    subscribers of the `/events` stream. Clients that fall behind are dropped
+    instead of buffering without bound.
+    """
+
+    def __init__(self, address: str, health: RefreshHealth | None = None):
+        self.address = address
+        self.health = health
+        self._server: asyncio.AbstractServer | None = None
+        self._report_body = b'{"status": "pending"}'
+        self._report_etag = '"0"'
+        self._updated_at: float | None = None
+        self._sequence = 0
+        self._history: deque[tuple[int, bytes]] = deque(maxlen=EVENT_HISTORY)
+        self._subscribers: set[asyncio.Queue[bytes | None]] = set()
+
+    async def start(self) -> None:
+        if self.address.startswith("unix:"):
+            path = self.address[len("unix:") :]
+            if os.path.exists(path):
+                os.unlink(path)
+            self._server = await asyncio.start_unix_server(self._handle, path=path)
+        else:
+            host, _, port = self.address.rpartition(":")
+            self._server = await asyncio.start_server(
+                self._handle, host or "127.0.0.1", int(port or DEFAULT_PORT)
+            )
+
+    async def close(self) -> None:
+        for queue in list(self._subscribers):
+            _offer(queue, None, force=True)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def publish(
+        self,
+        report: dict[str, Any],
+        event: dict[str, Any],
+        changes: Iterable[tuple[str, Any]] = (),
+    ) -> None:
+        """
+        Replace the served report and notify subscribers. Initial `snapshot`
+        records are left out of the event; clients fetch `/report` for those.
+        """
+        body = json.dumps(report, default=str).encode()
+        self._report_body = body
+        self._report_etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+        self._updated_at = time.time()
+
+        self._sequence += 1
+        data = json.dumps(
+            {
+                "id": self._sequence,
+                **event,
+                "changes": [
+                    {"event": kind, "id": key}
+                    for kind, key in changes
+                    if kind != "snapshot"
+                ],
+            },
+            default=str,
+        )
+        frame = f"id: {self._sequence}\nevent: change\ndata: {data}\n\n".encode()
+        self._history.append((self._sequence, frame))
+        for queue in list(self._subscribers):
+            if not _offer(queue, frame):
+                self._subscribers.discard(queue)
+                _offer(queue, None, force=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), 10)
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            headers: dict[str, str] = {}
+            while True:
+                line = await asyncio.wait_for(reader.readline(), 10)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            path = target.partition("?")[0]
+            if method != "GET":
+                await self._respond(writer, 405, b'{"error": "method not allowed"}')
+            elif path == "/report":
+                if headers.get("if-none-match") == self._report_etag:
+                    await self._respond(writer, 304, b"", etag=self._report_etag)
+                else:
+                    await self._respond(
+                        writer, 200, self._report_body, etag=self._report_etag
+                    )
+            elif path == "/events":
+                await self._stream_events(writer, headers.get("last-event-id"))
+            elif path == "/healthz":
+                body = json.dumps(
+                    {
+                        "status": "ok",
+                        **(self.health.to_dict() if self.health else {}),
+                        "updated_at": self._updated_at,
+                        "subscribers": len(self._subscribers),
+                    }
+                ).encode()
+                await self._respond(writer, 200, body)
+            else:
+                await self._respond(writer, 404, b'{"error": "not found"}')
+        except (ConnectionError, asyncio.TimeoutError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes,
+        etag: str | None = None,
+    ) -> None:
+        head = [
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            "Connection: close",
+        ]
+        if etag:
+            head.append(f"ETag: {etag}")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+        await writer.drain()
+
+    async def _stream_events(
+        self, writer: asyncio.StreamWriter, last_event_id: str | None
+    ) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        if last_event_id and last_event_id.isdigit():
+            for sequence, frame in self._history:
+                if sequence > int(last_event_id):
+                    writer.write(frame)
+        await writer.drain()
+
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=SUBSCRIBER_BACKLOG)
+        self._subscribers.add(queue)
+        try:
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    frame = b": keepalive\n\n"
+                if frame is None:
+                    return
+                writer.write(frame)
+                await writer.drain()
+        finally:
+            self._subscribers.discard(queue)
+
+
+_REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    404: "Not Found",
+    405: "Method Not Allowed",
+}
+
+
+def _offer(queue: asyncio.Queue, item: Any, force: bool = False) -> bool:
+    if queue.full():
+        if not force:
+            return False
+        queue.get_nowait()
+    queue.put_nowait(item)
+    return True
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import math
+import operator
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import compress, groupby, repeat
+from typing import Any, NamedTuple
+
+SEVERITIES = ("high", "medium", "low", "none")
+
+COLUMNS = (
+    "issue_id",
+    "family_id",
+    "severity",
+    "valid",
+    "duplicates",
+    "owner",
+    "mine",
+    "escalated",
+    "escalation_resolved",
+    "points",
+    "reward",
+)
+
+FLAGS = ("valid", "mine", "escalated", "escalation_resolved")
+
+_first = operator.itemgetter(0)
+_second = operator.itemgetter(1)
+
+
+class TableRow(NamedTuple):
+    """One issue of a ContestTable, exportable like the platform models."""
+
+    issue_id: str
+    family_id: str
+    severity: str
+    valid: bool
+    duplicates: int
+    owner: str
+    mine: bool
+    escalated: bool
+    escalation_resolved: bool
+    points: float
+    reward: float
+
+    def snapshot(self) -> tuple[Any, ...]:
+        return tuple(round(v, 8) if isinstance(v, float) else v for v in self)
+
+    @classmethod
+    def record_fields(cls) -> tuple[str, ...]:
+        return COLUMNS
+
+    def to_record(self) -> dict[str, Any]:
+        return self._asdict()
+
+
+class ContestSummary(NamedTuple):
+    """Contest-wide totals of a ContestTable."""
+
+    issues: int
+    valid: int
+    escalated: int
+    resolved: int
+    points: float
+    reward: float
+    my_issues: int
+    my_valid: int
+    my_points: float
+    my_reward: float
+
+    def snapshot(self) -> tuple[Any, ...]:
+        return tuple(round(v, 8) if isinstance(v, float) else v for v in self)
+
+
+class ContestTable:
+    """
+    Issues of one contest in a platform-neutral, columnar layout: one row per
+    submitted issue, with its family (Sherlock family / Code4rena finding).
+
+    Numeric and flag columns are `array.array`s and the string columns are
+    lists, so masks and sums run as single C-level passes (`map`,
+    `itertools.compress`, `math.fsum`) instead of Python loops over
+    dataclasses, and group-bys as one sort. `to_numpy()` hands the same columns to NumPy, when it's
+    installed, without copying.
+    """
+
+    def __init__(self, platform: str, contest_id: Any):
+        self.platform = platform
+        self.contest_id = contest_id
+        self.issue_id: list[str] = []
+        self.family_id: list[str] = []
+        self.severity = array("B")  # index into SEVERITIES
+        self.valid = array("B")
+        self.duplicates = array("I")
+        self.owner: list[str] = []
+        self.mine = array("B")
+        self.escalated = array("B")
+        self.escalation_resolved = array("B")
+        self.points = array("d")
+        self.reward = array("d")
+        # Report totals that `summary()` uses instead of the column sums, for
+        # a platform that pays once per finding rather than per row.
+        self.totals: dict[str, Any] = {}
+
+    def append(
+        self,
+        issue_id: str,
+        family_id: str,
+        severity: str,
+        valid: bool,
+        duplicates: int,
+        owner: str = "",
+        mine: bool = False,
+        escalated: bool = False,
+        escalation_resolved: bool = False,
+        points: float = 0.0,
+        reward: float = 0.0,
+    ) -> None:
+        self.issue_id.append(issue_id)
+        self.family_id.append(family_id)
+        self.severity.append(severity_code(severity))
+        self.valid.append(bool(valid))
+        self.duplicates.append(max(int(duplicates or 1), 1))
+        self.owner.append(owner or "")
+        self.mine.append(bool(mine))
+        self.escalated.append(bool(escalated))
+        self.escalation_resolved.append(bool(escalation_resolved))
+        self.points.append(points)
+        self.reward.append(reward)
+
+    def __len__(self) -> int:
+        return len(self.issue_id)
+
+    def column(self, name: str) -> Sequence[Any]:
+        if name not in COLUMNS:
+            raise KeyError(f"Unknown column: {name}")
+        return getattr(self, name)
+
+    def mask(self, **equals: Any) -> list[bool]:
+        """Rows whose columns equal the given values, e.g. `mask(owner="alice", valid=True)`."""
+        selected: Iterable[bool] = repeat(True, len(self))
+        for name, value in equals.items():
+            if name == "severity":
+                value = severity_code(value)
+            matches = map(operator.eq, self.column(name), repeat(value))
+            selected = map(operator.and_, selected, matches)
+        return list(selected)
+
+    def select(self, mask: Iterable[bool]) -> ContestTable:
+        mask = list(mask)
+        table = ContestTable(self.platform, self.contest_id)
+        for name in COLUMNS:
+            column = self.column(name)
+            picked = compress(column, mask)
+            if isinstance(column, array):
+                getattr(table, name).extend(picked)
+            else:
+                setattr(table, name, list(picked))
+        return table
+
+    def count(self, mask: Iterable[bool] | None = None) -> int:
+        return len(self) if mask is None else sum(mask)
+
+    def total(self, name: str, mask: Iterable[bool] | None = None) -> float:
+        column = self.column(name)
+        return math.fsum(column if mask is None else compress(column, mask))
+
+    def group_total(
+        self, key: str, name: str, mask: Iterable[bool] | None = None
+    ) -> dict[Any, float]:
+        """
+        Sum of column `name` per distinct value of column `key`, in key
+        order. With NumPy installed this is one `unique` + `bincount`;
+        otherwise the rows are sorted and summed per group in C, so Python
+        only loops over the groups.
+        """
+        keys: Sequence[Any] = self.column(key)
+        values: Sequence[float] = self.column(name)
+        if mask is not None:
+            mask = list(mask)
+            keys, values = list(compress(keys, mask)), array("d", compress(values, mask))
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        if np is not None and len(keys):
+            groups, inverse = np.unique(np.asarray(keys), return_inverse=True)
+            sums = np.bincount(inverse, weights=np.asarray(values, dtype=float))
+            totals = dict(zip(groups.tolist(), sums.tolist()))
+        else:
+            pairs = sorted(zip(keys, values), key=_first)
+            totals = {
+                group: math.fsum(map(_second, rows))
+                for group, rows in groupby(pairs, key=_first)
+            }
+        if key == "severity":
+            return {SEVERITIES[code]: total for code, total in totals.items()}
+        return totals
+
+    def summary(self) -> ContestSummary:
+        """Contest totals from the columns, with `totals` taking precedence."""
+        valid = self.valid
+        mine = self.mine
+        my_valid = list(map(operator.and_, mine, valid))
+        return ContestSummary(
+            issues=len(self),
+            valid=self.count(valid),
+            escalated=self.count(self.escalated),
+            resolved=self.count(self.escalation_resolved),
+            points=self.total("points", valid),
+            reward=self.total("reward", valid),
+            my_issues=self.count(mine),
+            my_valid=self.count(my_valid),
+            my_points=self.total("points", my_valid),
+            my_reward=self.total("reward", my_valid),
+        )._replace(**self.totals)
+
+    def rows(self) -> Iterator[TableRow]:
+        return map(
+            TableRow._make,
+            zip(
+                self.issue_id,
+                self.family_id,
+                map(SEVERITIES.__getitem__, self.severity),
+                map(bool, self.valid),
+                self.duplicates,
+                self.owner,
+                map(bool, self.mine),
+                map(bool, self.escalated),
+                map(bool, self.escalation_resolved),
+                self.points,
+                self.reward,
+            ),
+        )
+
+    def to_numpy(self) -> dict[str, Any]:
+        """
+        The columns as NumPy arrays; numeric ones share this table's memory
+        and flags are viewed as booleans. NumPy is optional and only
+        imported here.
+        """
+        import numpy as np
+
+        columns: dict[str, Any] = {}
+        for name in COLUMNS:
+            column = self.column(name)
+            if isinstance(column, array):
+                columns[name] = np.frombuffer(column, dtype=column.typecode)
+            else:
+                columns[name] = np.asarray(column, dtype=object)
+        for name in FLAGS:
+            columns[name] = columns[name].view(bool)
+        return columns
+
+
+def severity_code(severity: str | None) -> int:
+    severity = (severity or "").lower()
+    if severity in SEVERITIES:
+        return SEVERITIES.index(severity)
+    return SEVERITIES.index("none")
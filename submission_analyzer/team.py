@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+
+@dataclass
+class MemberTally:
+    """One tracked team member's share of a contest."""
+
+    name: str
+    submissions: int = 0
+    valid: int = 0
+    reward: float = 0.0
+    # Why this member's data couldn't be refreshed (e.g. an expired session).
+    # The counts are then those of the last refresh that worked (`stale`),
+    # or zero when there was none.
+    error: str | None = None
+    stale: bool = False
+
+    def snapshot(self) -> tuple[Any, ...]:
+        return (
+            self.name,
+            self.submissions,
+            self.valid,
+            round(self.reward, 6),
+            self.error is None,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def parse_members(spec: str | None) -> dict[str, str]:
+    """Parse `name=secret,name=secret` (e.g. SESSION_SHERLOCK_TEAM)."""
+    members: dict[str, str] = {}
+    for item in (spec or "").split(","):
+        name, sep, secret = item.partition("=")
+        if sep and name.strip() and secret.strip():
+            members[name.strip()] = secret.strip()
+    return members
+
+
+def format_team(members: Iterable[MemberTally], show_reward: bool = True) -> list[str]:
+    members = sorted(members, key=lambda m: (-m.reward, -m.valid, m.name.lower()))
+    if not members:
+        return []
+    width = max(12, *(len(m.name) for m in members))
+    header = f"{'Member':<{width}} {'Subs':>5} {'Valid':>5}"
+    if show_reward:
+        header += f" {'Reward':>12}"
+    lines = ["Team:", header, "-" * len(header)]
+    for member in members:
+        row = f"{member.name:<{width}} {member.submissions:>5} {member.valid:>5}"
+        if show_reward:
+            row += f" {f'${member.reward:,.2f}':>12}"
+        if member.error is not None:
+            row += f"  ({'stale' if member.stale else 'unavailable'}: {member.error})"
+        lines.append(row)
+    return lines
@@ -1,6 +1,12 @@
+from __future__ import annotations
+
+import os
 import time
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-import requests
+if TYPE_CHECKING:
+    import requests
 
 
 def truncate(text: str, max_len: int = 70) -> str:
@@ -13,21 +19,63 @@ def yesno(flag: bool) -> str:
     return "Y" if flag else ""
 
 
+def cache_path(*parts: str) -> Path:
+    """
+    Location for persistent analyzer state, under SUBMISSION_ANALYZER_CACHE
+    (default: $XDG_CACHE_HOME/submission-analyzer). Parent dirs are created.
+    """
+    base = os.getenv("SUBMISSION_ANALYZER_CACHE")
+    if base:
+        root = Path(base)
+    else:
+        xdg = os.getenv("XDG_CACHE_HOME")
+        root = (Path(xdg) if xdg else Path.home() / ".cache") / "submission-analyzer"
+    path = root.joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
 def get_json_with_retry(
     url: str,
     headers: dict[str, str] | None = None,
-    max_attempts: int = 15,
+    max_attempts: int = 6,
     first_timeout: float = 1.0,
     session: requests.sessions.Session | None = None,
+    max_timeout: float = 30.0,
 ):
+    return get_with_retry(
+        url,
+        headers=headers,
+        max_attempts=max_attempts,
+        first_timeout=first_timeout,
+        session=session,
+        max_timeout=max_timeout,
+    ).json()
+
+
+def get_with_retry(
+    url: str,
+    headers: dict[str, str] | None = None,
+    max_attempts: int = 6,
+    first_timeout: float = 1.0,
+    session: requests.sessions.Session | None = None,
+    max_timeout: float = 30.0,
+) -> requests.Response:
+    """
+    GET `url`, retrying non-200 responses with doubling sleeps capped at
+    `max_timeout`. Kept short on purpose: longer outages are handled by the
+    watcher loops, which keep showing the last good report meanwhile.
+    """
+    import requests
+
     attempts = 0
     headers = headers or {}
     resp = None
     while attempts < max_attempts:
         resp = session.get(url) if session else  requests.get(url, headers=headers)
         if resp.status_code == 200:
-            return resp.json()
-        sleep_time = first_timeout * (2 ** attempts)
+            return resp
+        sleep_time = min(first_timeout * (2 ** attempts), max_timeout)
 
         print(
             f"NETWORK ERROR: attempt {attempts}, retrying in {sleep_time}s - {resp.status_code} {resp.text}"
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import traceback
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from submission_analyzer.alerts import AlertEngine, add_alert_args, compile_alert_args
+from submission_analyzer.archive import add_archive_args
+from submission_analyzer.dashboard import (
+    LiveDashboard,
+    add_dashboard_args,
+    render_report,
+    stale_banner,
+)
+from submission_analyzer.export import (
+    ChangeTracker,
+    add_export_args,
+    export_changes,
+    open_record_writer,
+)
+from submission_analyzer.health import RefreshHealth
+from submission_analyzer.notifiers.base import ChangeEvent
+from submission_analyzer.notifiers.registry import (
+    NotifierHub,
+    add_notify_args,
+    build_notifiers,
+    notify_specs,
+)
+from submission_analyzer.profiling import add_profile_args, open_profile_args, phase
+from submission_analyzer.report_cache import ReportCache
+from submission_analyzer.resources import add_resource_args, open_resource_args
+from submission_analyzer.server import ReportServer, add_serve_args
+from submission_analyzer.utils import cache_path
+from submission_analyzer.workers import add_worker_args
+
+# One-shot runs give up after this many failed attempts; watchers (-t) never
+# do, they keep showing the last good report until the platform recovers.
+MAX_RETRIES = 5
+
+
+def add_watch_args(parser) -> None:
+    """The options every platform's CLI shares (output, notify, serve, ...)."""
+    add_dashboard_args(parser)
+    add_export_args(parser)
+    add_notify_args(parser)
+    add_serve_args(parser)
+    add_worker_args(parser)
+    add_archive_args(parser)
+    add_profile_args(parser)
+    add_resource_args(parser)
+    add_alert_args(parser)
+
+
+def check_watch_args(parser, args) -> None:
+    """Validate the `add_watch_args` options; compiles `args.alert_rules`."""
+    if args.serve and args.timeout is None:
+        parser.error("--serve needs a polling interval (-t)")
+    if args.replay and args.timeout is not None:
+        parser.error("--replay builds a single report; drop -t")
+    if args.replay_at is not None and not args.replay:
+        parser.error("--replay-at needs --replay")
+    if args.monitor_resources is not None and args.timeout is None:
+        parser.error("--monitor-resources needs a polling interval (-t)")
+    if args.rss_warn <= 0:
+        parser.error("--rss-warn must be positive")
+    try:
+        args.alert_rules = compile_alert_args(args)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    if args.alert_rules and args.timeout is None:
+        parser.error("--alert/--alerts need a polling interval (-t)")
+
+
+@dataclass
+class Watch:
+    """What the refresh loop needs from a platform, besides the parsed args."""
+
+    platform: str
+    args: Any
+    # Creates the connector; runs in a thread and is retried like a refresh
+    # (Code4rena logs in here).
+    connect: Callable[[], Any]
+    # Builds a report with the connector; runs in a thread.
+    build: Callable[[Any], Any]
+    format_report: Callable[[Any, Any], list[str]]
+    # The change notification for a report, given the connector.
+    summary: Callable[[Any, Any], str]
+    # The records streamed by --format/--serve: (items, key, key field).
+    export_items: Callable[[Any], tuple[Iterable[Any], Callable[[Any], str], str]]
+    export_fields: tuple[str, ...]
+    # What decides whether a report changed; `report.snapshot()` by default.
+    snapshot: Callable[[Any], Any] | None = None
+
+
+async def watch(spec: Watch) -> None:
+    """
+    Refresh the contest once, or every `-t` seconds, and hand each changed
+    report to the table/dashboard, the exporter, the notifiers, the alert
+    rules and --serve. A failed refresh is retried with backoff while the
+    last good report stays on screen.
+    """
+    args = spec.args
+    platform = spec.platform
+    timeout = args.timeout
+    notifications = NotifierHub(
+        build_notifiers(notify_specs(args.notify)),
+        coalesce=timeout is not None,
+    )
+
+    exporting = args.format != "table"
+    dashboard = LiveDashboard() if args.live and not exporting else None
+    exporter = (
+        open_record_writer(args.format, args.output, spec.export_fields)
+        if exporting
+        else None
+    )
+
+    def render(report, **kwargs) -> list[str]:
+        return render_report(report, args, spec.format_report, dashboard, **kwargs)
+
+    # Warm start (watchers only): show the last known report right away,
+    # marked stale; the first refresh then only prints what changed since.
+    # A one-shot run prints just the fresh report, in full.
+    report_cache = (
+        ReportCache(cache_path(platform, f"{args.contestId}.report.pickle"))
+        if timeout is not None and not exporting and not args.replay
+        else None
+    )
+    health = RefreshHealth()
+    last_report = None
+    last_snapshot = None
+    shown_rows: list[str] | None = None
+    if report_cache is not None and args.warm_start:
+        cached = report_cache.load()
+        if cached is not None:
+            last_report, health.last_success = cached
+            shown_rows = render(last_report, banner=stale_banner(health.last_success))
+    changes = ChangeTracker(track=timeout is not None)
+    profile = open_profile_args(args)
+    monitor = open_resource_args(args)
+    alerts = AlertEngine(args.alert_rules) if args.alert_rules else None
+    if alerts is not None and last_report is not None:
+        # Changes since the previous run are alerted on the first refresh.
+        try:
+            alerts.evaluate(last_report.to_table())
+        except ValueError:
+            # That run didn't keep the table's rows (it had no alerts).
+            pass
+    server = ReportServer(args.serve, health=health) if args.serve else None
+    connector = None
+    notifications.start()
+    try:
+        if server is not None:
+            await server.start()
+        while True:
+            if monitor is not None:
+                # Between refreshes, so failed ones are accounted for too.
+                warning = monitor.sample()
+                if warning:
+                    print(f"[{platform}] {warning}", file=sys.stderr)
+                    notifications.push(
+                        ChangeEvent(
+                            platform=platform,
+                            contest_id=args.contestId,
+                            summary=f"Memory: {warning}",
+                        )
+                    )
+            try:
+                if connector is None:
+                    # Kept off the event loop, after the warm-start render.
+                    connector = await asyncio.to_thread(spec.connect)
+                if profile is not None:
+                    profile.start()
+                # Off the event loop, so notifications and --serve clients
+                # are still handled while a refresh is running.
+                report = await asyncio.to_thread(spec.build, connector)
+                recovered = health.succeeded()
+                if recovered:
+                    print(
+                        f"[{platform}] recovered after {recovered} failed refreshes",
+                        file=sys.stderr,
+                    )
+                last_report = report
+                with phase("snapshot"):
+                    snapshot = (spec.snapshot or _snapshot)(report)
+                if snapshot != last_snapshot:
+                    changed = []
+                    if exporter is not None or server is not None:
+                        items, key, key_field = spec.export_items(report)
+                        with phase("render"):
+                            changed = export_changes(
+                                exporter,
+                                changes,
+                                items,
+                                key=key,
+                                key_field=key_field,
+                                contest_id=report.contest_id,
+                            )
+                    if exporter is None:
+                        render(report, previous=shown_rows)
+                        shown_rows = None
+                    if report_cache is not None:
+                        report_cache.save(report)
+                    event = ChangeEvent(
+                        platform=platform,
+                        contest_id=report.contest_id,
+                        summary=spec.summary(report, connector),
+                    )
+                    if alerts is not None:
+                        for summary in alerts.evaluate(report.to_table()):
+                            notifications.push(
+                                ChangeEvent(
+                                    platform=platform,
+                                    contest_id=report.contest_id,
+                                    summary=summary,
+                                )
+                            )
+                    elif event.summary:
+                        notifications.push(event)
+                    if server is not None:
+                        server.publish(report.to_dict(), event.to_dict(), changed)
+                    last_snapshot = snapshot
+                elif recovered and exporter is None:
+                    # Clear the staleness marker.
+                    render(report)
+                if profile is not None:
+                    profile.stop()
+                    profile.report(sys.stderr)
+                    profile = None
+                if timeout is None:
+                    return
+                await asyncio.sleep(timeout)
+            except BrokenPipeError:
+                # Whoever was reading the exported records has exited.
+                return
+            except Exception as exc:
+                if args.replay:
+                    # Retrying can't help: the archive won't change.
+                    raise
+                delay = health.failed(exc)
+                print(f"[{platform}] error while refreshing data: {exc}", file=sys.stderr)
+                traceback.print_exc()
+                if timeout is None and health.failures >= MAX_RETRIES:
+                    raise RuntimeError("Exceeded maximum retries") from exc
+                if dashboard is not None:
+                    dashboard.invalidate()
+                    if last_report is not None:
+                        render(last_report, banner=health.banner())
+                elif exporter is None and last_report is not None:
+                    print(health.banner(), file=sys.stderr)
+                await asyncio.sleep(delay)
+    finally:
+        if monitor is not None:
+            monitor.close()
+        if connector is not None:
+            connector.close()
+        await notifications.close()
+        if server is not None:
+            await server.close()
+        if dashboard is not None:
+            dashboard.close()
+        if exporter is not None:
+            exporter.close()
+
+
+def _snapshot(report) -> Any:
+    return report.snapshot()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future, ProcessPoolExecutor
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def add_worker_args(parser) -> None:
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="?",
+        const=0,
+        default=None,
+        metavar="N",
+        help=(
+            "Decode payloads and build models in N worker processes "
+            "(all cores when N is omitted or 0) instead of inline."
+        ),
+    )
+
+
+def make_pool(workers: int | None) -> ProcessPoolExecutor | None:
+    """
+    Process pool for CPU-bound payload parsing, or None to parse inline.
+    `workers` follows `--workers`: None disables the pool, 0 uses every core.
+    """
+    if workers is None:
+        return None
+    # multiprocessing is only worth importing when --workers is used.
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(max_workers=pool_size(workers))
+
+
+def pool_size(workers: int) -> int:
+    return workers or os.cpu_count() or 1
+
+
+def imap_bounded(
+    pool: Executor,
+    fn: Callable[..., R],
+    items: Iterable[T],
+    *args: Any,
+    in_flight: int,
+) -> Iterator[R]:
+    """
+    `fn(item, *args)` for every item, in order, with at most `in_flight`
+    tasks (and the items they were given) alive at a time, so a long input
+    is consumed only as fast as the pool keeps up with it.
+    """
+    pending: deque[Future[R]] = deque()
+    for item in items:
+        if len(pending) >= in_flight:
+            yield pending.popleft().result()
+        pending.append(pool.submit(fn, item, *args))
+    while pending:
+        yield pending.popleft().result()
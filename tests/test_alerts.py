@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from submission_analyzer.alerts import AlertEngine, compile_rule
+from submission_analyzer.table import ContestTable
+
+
+def _table(rows: dict[str, int]) -> ContestTable:
+    table = ContestTable("sherlock", 1)
+    for issue_id, duplicates in rows.items():
+        table.append(issue_id, issue_id, "high", True, duplicates, mine=True)
+    return table
+
+
+def test_issue_rules_only_see_what_changed():
+    engine = AlertEngine([compile_rule("dup = issue: duplicates > old.duplicates or new")])
+
+    assert engine.evaluate(_table({"1": 1, "2": 1})) == []
+    assert engine.evaluate(_table({"1": 1, "2": 3})) == ["dup: issue 2 (duplicates 1 → 3)"]
+    assert engine.evaluate(_table({"1": 1, "2": 3})) == []
+    # Dropped, then back: it's new again.
+    assert engine.evaluate(_table({"1": 1})) == []
+    assert engine.evaluate(_table({"1": 1, "2": 3})) == ["dup: issue 2 (new)"]
+
+
+def test_report_rules_read_the_summary_totals():
+    engine = AlertEngine([compile_rule("reward = report: my_reward > old.my_reward")])
+    table = _table({"1": 1})
+    engine.evaluate(table)
+    table = _table({"1": 1})
+    table.totals = {"my_reward": 5.0}
+
+    assert engine.evaluate(table) == ["reward: contest (my_reward 0.00 → 5.00)"]
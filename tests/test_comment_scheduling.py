@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from collections import Counter
+
+from submission_analyzer.platforms.sherlock.connector import SherlockConnector, _comment_priority
+
+ISSUES = 300
+
+
+class _DiscussionsAPI:
+    """300 issues: a few of them mine, the rest spread over every tier."""
+
+    def __init__(self):
+        self.fetched: Counter[str] = Counter()
+        self.titles = {str(i): {"number": i, "title": f"Issue {i}"} for i in range(1, ISSUES + 1)}
+        families = []
+        for main in range(1, ISSUES + 1, 3):
+            members = [{"issue": i, "was_submitted_by_user": i <= 15} for i in range(main, main + 3)]
+            families.append(
+                {
+                    "primary_severity": 1 if main % 2 else 3,
+                    "main": members[0],
+                    "duplicates": members[1:],
+                }
+            )
+        self.judge = {"families": families}
+
+    def getTitles(self):
+        return self.titles
+
+    def getJudge(self):
+        return self.judge
+
+    def getContest(self):
+        return {"prize_pool": 10_000}
+
+    def getDiscussions(self, issueId):
+        self.fetched[issueId] += 1
+        return {"comments": [{"id": int(issueId), "body": "hi", "created_at": 1}]}
+
+
+def test_comment_limit_eventually_fetches_every_discussion():
+    api = _DiscussionsAPI()
+    connector = SherlockConnector(0, None, api=api, comments_limit=20)
+
+    reports = [connector.build_report(include_comments=True) for _ in range(20)]
+
+    assert len(api.fetched) == ISSUES
+    # Never fetched discussions go first, 20 per poll.
+    assert [report.comments_pending for report in reports[:16]] == [
+        ISSUES - 20 * poll for poll in range(1, 16)
+    ] + [0]
+    # After that, higher tiers are refreshed more often than lower ones.
+    fetches: dict[int, list[int]] = {}
+    for issue in reports[-1].issues.values():
+        fetches.setdefault(_comment_priority(issue), []).append(api.fetched[issue.id])
+    averages = [sum(counts) / len(counts) for _, counts in sorted(fetches.items())]
+    assert averages == sorted(averages, reverse=True)
+    assert averages[0] > averages[-1]
+
+
+def test_unfetched_discussions_keep_previous_comments():
+    api = _DiscussionsAPI()
+    connector = SherlockConnector(0, None, api=api, comments_limit=ISSUES)
+    connector.build_report(include_comments=True)
+    connector.comments_limit = 10
+
+    report = connector.build_report(include_comments=True)
+
+    assert report.comments_pending == 0
+    assert all(issue.comments for issue in report.issues.values())
+    assert sum(api.fetched.values()) == ISSUES + 10
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+import sys
+
+import pytest
+
+from submission_analyzer.platforms.code4rena import api
+from submission_analyzer.platforms.code4rena.connector import Code4renaConnector
+from submission_analyzer.platforms.code4rena.models import Code4renaIssue
+from submission_analyzer.table import ContestTable
+
+
+def _submission(uid: int, finding: str, handle: str, primary: bool, duplicates: int) -> dict:
+    return {
+        "uid": f"S-{uid}",
+        "title": f"Sub {uid}",
+        "severity": "high",
+        "user": {"handle": handle},
+        "evaluations": [],
+        "latestEvaluations": {"severity": "high", "validity": "valid"},
+        "finding": {"uid": finding, "duplicates": duplicates},
+        "isPrimary": primary,
+    }
+
+
+_PAGES = [
+    [
+        _submission(1, "F-1", "alice", True, 2),
+        _submission(2, "F-1", "bob", False, 2),
+        _submission(3, "F-2", "alice", True, 1),
+    ],
+    [_submission(4, "F-3", "carol", False, 2)],
+]
+
+
+@pytest.fixture
+def contest(monkeypatch):
+    def raw_pages(self):
+        for number, page in enumerate(_PAGES, start=1):
+            yield number, json.dumps({"data": {"submissions": page}}).encode()
+
+    monkeypatch.setattr(api.Code4renaAPI, "login", lambda self, user, password: None)
+    monkeypatch.setattr(api.Code4renaAPI, "iterRawSubmissionPages", raw_pages)
+    monkeypatch.setattr(
+        api.Code4renaAPI,
+        "iterSubmissionPages",
+        lambda self: (
+            [Code4renaIssue.from_api(payload) for payload in page] for page in _PAGES
+        ),
+    )
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_code4rena_rows_only_kept_for_the_table(contest, workers):
+    plain = Code4renaConnector("c", "", "", handle="alice", workers=workers)
+    try:
+        report = plain.build_report()
+    finally:
+        plain.close()
+    assert report.submissions is None
+    with pytest.raises(ValueError):
+        report.to_table()
+
+    connector = Code4renaConnector("c", "", "", handle="alice", workers=workers, table=True)
+    try:
+        table = connector.build_report().to_table()
+    finally:
+        connector.close()
+    assert table.issue_id == ["S-1", "S-2", "S-3", "S-4"]
+    assert table.owner == ["alice", "bob", "alice", "carol"]
+    assert list(table.mine) == [1, 0, 1, 0]
+    # F-3's primary isn't visible, so its row has no severity.
+    assert table.group_total("owner", "duplicates") == {"alice": 3.0, "bob": 2.0, "carol": 1.0}
+
+
+def test_group_total():
+    table = ContestTable("sherlock", 1)
+    for i in range(10):
+        table.append(
+            str(i),
+            str(i % 3),
+            ("high", "medium", "low")[i % 3],
+            i % 2 == 0,
+            1,
+            owner="ab"[i % 2],
+            points=float(i),
+        )
+    assert table.group_total("owner", "points") == {"a": 20.0, "b": 25.0}
+    assert table.group_total("severity", "points") == {"high": 18.0, "medium": 12.0, "low": 15.0}
+    assert table.group_total("family_id", "points", table.valid) == {"0": 6.0, "1": 4.0, "2": 10.0}
+    assert ContestTable("sherlock", 1).group_total("owner", "points") == {}
+
+
+def test_code4rena_summary_pays_a_self_duplicated_finding_once(contest, monkeypatch):
+    monkeypatch.setattr(
+        sys.modules[__name__],
+        "_PAGES",
+        [
+            [
+                _submission(1, "F-1", "alice", True, 3),
+                _submission(2, "F-1", "alice", False, 3),
+                _submission(3, "F-1", "bob", False, 3),
+                _submission(4, "F-2", "bob", True, 1),
+            ]
+        ],
+    )
+    connector = Code4renaConnector("c", "", "", prize_pool=1000, handle="alice", table=True)
+    report = connector.build_report()
+    summary = report.to_table().summary()
+
+    assert summary.my_issues == 2
+    assert summary.my_valid == report.my_valid_findings == 1
+    assert summary.my_reward == pytest.approx(report.my_reward)
+    assert summary.my_points == pytest.approx(report.findings["F-1"].getSinglePoints())
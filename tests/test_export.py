@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+
+import pytest
+
+from submission_analyzer.export import EVENT_FIELDS, ChangeTracker, RecordWriter, export_changes
+from submission_analyzer.table import COLUMNS, ContestTable
+
+
+def _table(*issue_ids: str) -> ContestTable:
+    table = ContestTable("sherlock", 1)
+    for issue_id in issue_ids:
+        table.append(issue_id, issue_id, "high", True, 1)
+    return table
+
+
+@pytest.mark.parametrize("fmt", ["jsonl", "csv"])
+def test_removed_rows_are_named_by_their_key_field(fmt):
+    stream = io.StringIO()
+    writer = RecordWriter(fmt, stream, (*EVENT_FIELDS, *COLUMNS))
+    tracker = ChangeTracker()
+    for table in (_table("1", "2"), _table("1")):
+        export_changes(
+            writer,
+            tracker,
+            table.rows(),
+            key=lambda row: row.issue_id,
+            key_field="issue_id",
+            contest_id=1,
+        )
+
+    if fmt == "csv":
+        records = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    else:
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    removed = records[-1]
+    assert removed["event"] == "removed"
+    assert removed["issue_id"] == "2"
+    assert "id" not in removed
+
+
+def test_removed_wardens_are_named_by_handle():
+    from submission_analyzer.platforms.code4rena.main import _export_items
+    from submission_analyzer.platforms.code4rena.models import WardenStanding
+
+    class Report:
+        def __init__(self, *handles):
+            self.standings = [WardenStanding(handle) for handle in handles]
+
+        def ranked_leaderboard(self):
+            return self.standings
+
+    class Args:
+        leaderboard = True
+        schema = "platform"
+
+    stream = io.StringIO()
+    writer = RecordWriter("csv", stream, (*EVENT_FIELDS, *WardenStanding.record_fields()))
+    tracker = ChangeTracker()
+    for report in (Report("alice", "bob"), Report("alice")):
+        items, key, key_field = _export_items(report, Args())
+        export_changes(writer, tracker, items, key=key, key_field=key_field, contest_id="c")
+
+    removed = list(csv.DictReader(io.StringIO(stream.getvalue())))[-1]
+    assert (removed["event"], removed["handle"]) == ("removed", "bob")
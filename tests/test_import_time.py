@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Only needed once a refresh runs (requests) or when SENTRY_DSN / BOT_TOKEN
+# are configured.
+LAZY_MODULES = ("requests", "sentry_sdk", "telegram")
+
+# Far above the ~100 ms it takes, so only a real regression trips it.
+MAX_IMPORT_MS = 1500
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds of every module `module` loads."""
+    pythonpath = [str(REPO_ROOT), os.environ.get("PYTHONPATH", "")]
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, pythonpath))},
+    )
+    times: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "submission_analyzer.platforms.sherlock.main",
+        "submission_analyzer.platforms.code4rena.main",
+    ],
+)
+def test_cli_imports_stay_lazy(module):
+    times = _import_times(module)
+    assert module in times
+    assert [name for name in LAZY_MODULES if name in times] == []
+    assert times[module] / 1000 < MAX_IMPORT_MS
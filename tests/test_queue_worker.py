@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from submission_analyzer import queue_worker
+from submission_analyzer.jobqueue import JobQueue
+from submission_analyzer.queue_worker import QueueWorker
+
+
+class _Report:
+    contest_id = "7"
+
+    def to_dict(self):
+        return {"contest_id": self.contest_id}
+
+    def snapshot(self):
+        return (self.contest_id,)
+
+
+class _Connector:
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite3", timeout=5.0)
+    yield queue
+    queue.close()
+
+
+def test_queue_is_usable_from_other_threads(queue):
+    queue.add("code4rena", "7")
+    claimed = []
+    thread = threading.Thread(target=lambda: claimed.append(queue.claim("w1")))
+    thread.start()
+    thread.join()
+    assert claimed[0] is not None and claimed[0].contest_id == "7"
+    assert queue.complete(claimed[0], {}, "done", "d1") is True
+    assert queue.result("code4rena", "7").summary == "done"
+
+
+def test_worker_keeps_the_loop_free_while_the_queue_is_locked(queue, tmp_path, monkeypatch):
+    monkeypatch.setattr(queue_worker, "open_connector", lambda job: _Connector())
+    monkeypatch.setattr(queue_worker, "build_report", lambda connector, job: _Report())
+    monkeypatch.setattr(queue_worker, "notification_summary", lambda *args: "summary")
+    queue.add("code4rena", "7")
+    # Another process holds the write lock for a while.
+    other = sqlite3.connect(
+        tmp_path / "jobs.sqlite3", isolation_level=None, check_same_thread=False
+    )
+    other.execute("BEGIN IMMEDIATE")
+    threading.Timer(0.5, other.execute, ("COMMIT",)).start()
+
+    async def run():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.05)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        await QueueWorker(queue).run(once=True)
+        ticker.cancel()
+        return ticks
+
+    started = time.monotonic()
+    ticks = asyncio.run(run())
+    assert time.monotonic() - started >= 0.5
+    assert ticks >= 5
+    assert queue.result("code4rena", "7").summary == "summary"
+    other.close()
+
+
+def test_report_digest_is_the_same_in_every_process():
+    code = (
+        "from submission_analyzer.queue_worker import report_digest\n"
+        "class Report:\n"
+        "    def snapshot(self):\n"
+        "        ids = frozenset(str(i) for i in range(50))\n"
+        "        return ('7', {str(i): (i, ids) for i in range(20)})\n"
+        "print(report_digest(Report()))\n"
+    )
+    digests = {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parents[1],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+        ).stdout
+        for seed in ("1", "2", "3")
+    }
+    assert len(digests) == 1
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import math
+import random
+
+import pytest
+
+from submission_analyzer.platforms.sherlock.connector import SherlockConnector
+from submission_analyzer.scoring import IncrementalScorer
+
+
+class _ContestAPI:
+    """A Sherlock contest whose families the test reshuffles between polls."""
+
+    def __init__(self, issues: int, rnd: random.Random):
+        self.titles = {str(i): {"number": i, "title": f"Issue {i}"} for i in range(1, issues + 1)}
+        ids = list(range(1, issues + 1))
+        rnd.shuffle(ids)
+        families = []
+        while ids:
+            members = [ids.pop() for _ in range(min(rnd.randint(1, 12), len(ids)))]
+            families.append(
+                {
+                    "primary_severity": rnd.choice((1, 2, 3)),
+                    "main": {"issue": members[0], "was_submitted_by_user": rnd.random() < 0.05},
+                    "duplicates": [{"issue": issue} for issue in members[1:]],
+                }
+            )
+        self.judge = {"families": families}
+        self.removed: list[dict] = []
+
+    def mutate(self, rnd: random.Random, changes: int) -> None:
+        families = self.judge["families"]
+        for _ in range(changes):
+            kind = rnd.random()
+            family = rnd.choice(families)
+            if kind < 0.4:
+                family["primary_severity"] = rnd.choice((1, 2, 3))
+            elif kind < 0.8 and family["duplicates"]:
+                rnd.choice(families)["duplicates"].append(family["duplicates"].pop())
+            elif kind < 0.9 and len(families) > 1:
+                families.remove(family)
+                self.removed.append(family)
+            elif self.removed:
+                families.append(self.removed.pop())
+
+    def getTitles(self):
+        return self.titles
+
+    def getJudge(self):
+        return self.judge
+
+    def getContest(self):
+        return {"prize_pool": 100_000}
+
+
+def _close(a: float, b: float) -> bool:
+    return math.isclose(a, b, rel_tol=1e-12, abs_tol=1e-9)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_incremental_sherlock_scoring_matches_full_recomputation(seed):
+    rnd = random.Random(seed)
+    api = _ContestAPI(1_500, rnd)
+    incremental = SherlockConnector(0, None, api=api)
+
+    for poll in range(40):
+        api.mutate(rnd, changes=rnd.randint(0, 6))
+        report = incremental.build_report()
+        expected = SherlockConnector(0, None, api=api).build_report()
+
+        assert _close(report.total_points, expected.total_points), f"poll {poll}"
+        assert _close(report.my_total_reward, expected.my_total_reward), f"poll {poll}"
+        for issue_id, issue in expected.issues.items():
+            assert report.issues[issue_id].points == issue.points, f"poll {poll}"
+            assert _close(report.issues[issue_id].reward, issue.reward), f"poll {poll}"
+
+
+def test_scorer_total_tracks_changes_and_removals():
+    rnd = random.Random(7)
+    scorer: IncrementalScorer[int, tuple[int, int]] = IncrementalScorer(
+        lambda sig: sig[0] / sig[1], weight=lambda sig: sig[1]
+    )
+    families = {key: (rnd.randint(1, 9), rnd.randint(1, 5)) for key in range(200)}
+    for key, sig in families.items():
+        scorer.score(key, sig)
+    scorer.finish()
+
+    for _ in range(300):
+        for key in rnd.sample(sorted(families), 5):
+            if rnd.random() < 0.2:
+                del families[key]
+            else:
+                families[key] = (rnd.randint(1, 9), rnd.randint(1, 5))
+        families.setdefault(rnd.randint(200, 260), (rnd.randint(1, 9), rnd.randint(1, 5)))
+
+        for key, sig in families.items():
+            assert scorer.score(key, sig) == sig[0] / sig[1]
+        total = scorer.finish()
+
+        assert _close(total, math.fsum(sig[0] for sig in families.values()))
+        # At most 5 changed or removed families and one added.
+        assert scorer.last_changed <= 6
+
+
+def test_scorer_reuses_points_of_unchanged_families():
+    calls = []
+    scorer: IncrementalScorer[str, int] = IncrementalScorer(lambda sig: calls.append(sig) or sig)
+
+    for key in "abc":
+        scorer.score(key, 1)
+    assert scorer.finish() == 3
+    for key in "abc":
+        scorer.score(key, 2 if key == "b" else 1)
+    assert scorer.finish() == 4
+
+    assert calls == [1, 1, 1, 2]
+    assert scorer.last_changed == 1
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from submission_analyzer.watch import Watch, add_watch_args, check_watch_args, watch
+
+
+@dataclass
+class _Report:
+    contest_id: str
+    value: int
+
+    def snapshot(self):
+        return (self.value,)
+
+    def to_dict(self):
+        return {"value": self.value}
+
+
+class _Connector:
+    def __init__(self):
+        self.builds = 0
+        self.closed = False
+
+    def build_report(self) -> _Report:
+        self.builds += 1
+        return _Report("7", self.builds)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _parse(*argv: str):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("contestId")
+    parser.add_argument("-t", "--timeout", type=int, default=None)
+    add_watch_args(parser)
+    args = parser.parse_args(["7", *argv])
+    check_watch_args(parser, args)
+    return args
+
+
+def _watch(args, connector: _Connector) -> Watch:
+    return Watch(
+        platform="test",
+        args=args,
+        connect=lambda: connector,
+        build=lambda c: c.build_report(),
+        format_report=lambda report, args: ["header", f"value {report.value}"],
+        summary=lambda report, c: f"value {report.value}",
+        export_items=lambda report: ([], str, "id"),
+        export_fields=("event", "contest_id"),
+    )
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [("--serve", "127.0.0.1:0"), ("--monitor-resources",), ("--alert", "report: valid > 0")],
+)
+def test_watch_only_options_need_a_timeout(argv, capsys):
+    with pytest.raises(SystemExit):
+        _parse(*argv)
+    assert "polling interval (-t)" in capsys.readouterr().err
+
+
+def test_one_shot_prints_the_fresh_report_in_full(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("SUBMISSION_ANALYZER_CACHE", str(tmp_path))
+    for _ in range(2):
+        connector = _Connector()
+        asyncio.run(watch(_watch(_parse(), connector)))
+        assert connector.closed
+        assert capsys.readouterr().out == "header\nvalue 1\n"
+    # Only watchers (-t) keep a warm-start cache.
+    assert not list(tmp_path.rglob("*.pickle"))
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from submission_analyzer.notifiers.base import ChangeEvent
+from submission_analyzer.notifiers.registry import NotifierHub
+from submission_analyzer.notifiers.webhook_notifier import WebhookNotifier
+
+
+class _Hook(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:
+            server.received.append(body)
+            response = server.responses.pop(0) if server.responses else (200, {}, 0.0)
+        status, headers, delay = response
+        time.sleep(delay)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def hook():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Hook)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.received = []
+    server.responses = []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/hook"
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _event(summary: str) -> ChangeEvent:
+    return ChangeEvent(platform="sherlock", contest_id=42, summary=summary)
+
+
+async def _deliver(hub: NotifierHub, *events: ChangeEvent, start_first: bool = True) -> float:
+    if start_first:
+        hub.start()
+    for event in events:
+        hub.push(event)
+    if not start_first:
+        hub.start()
+    started = time.monotonic()
+    await hub.close(timeout=10)
+    return time.monotonic() - started
+
+
+def test_delivers_event_as_json(hook):
+    hub = NotifierHub([WebhookNotifier(hook.url)], coalesce=False)
+    asyncio.run(_deliver(hub, _event("2 new duplicates")))
+
+    assert len(hook.received) == 1
+    assert hook.received[0]["platform"] == "sherlock"
+    assert hook.received[0]["contest_id"] == 42
+    assert hook.received[0]["summary"] == "2 new duplicates"
+
+
+def test_send_timeout_bounds_a_hanging_endpoint(hook):
+    hook.responses = [(200, {}, 2.0)]
+    # The request itself gives up after 0.5s, so the worker thread is freed.
+    notifier = WebhookNotifier(hook.url, timeout=0.5)
+    hub = NotifierHub([notifier], coalesce=False, send_timeout=0.2)
+    queue = hub._queues[0]
+    queue.max_attempts = 1
+
+    elapsed = asyncio.run(_deliver(hub, _event("slow")))
+
+    assert len(hook.received) == 1
+    assert elapsed < 0.5
+
+
+def test_retry_after_is_honoured(hook):
+    hook.responses = [(429, {"Retry-After": "0.2"}, 0.0)]
+    hub = NotifierHub([WebhookNotifier(hook.url)], coalesce=False)
+    # Without the hint, the queue's own backoff would outlast close().
+    hub._queues[0].first_retry_delay = 60.0
+
+    elapsed = asyncio.run(_deliver(hub, _event("rate limited")))
+
+    assert [body["summary"] for body in hook.received] == ["rate limited"] * 2
+    assert 0.2 <= elapsed < 5.0
+
+
+def test_full_queue_drops_the_oldest_events(hook):
+    hub = NotifierHub([WebhookNotifier(hook.url)], coalesce=False, max_pending=2)
+    events = [_event(f"poll {n}") for n in range(5)]
+
+    asyncio.run(_deliver(hub, *events, start_first=False))
+
+    assert [body["summary"] for body in hook.received] == ["poll 3", "poll 4"]
+
+
+def test_coalescing_keeps_contests_apart(hook):
+    hub = NotifierHub([WebhookNotifier(hook.url)])
+    hub._queues[0].coalesce_window = 0.5
+    hub._queues[0].min_interval = 0.0
+    events = [
+        ChangeEvent(platform="sherlock", contest_id=964, summary="964 first"),
+        ChangeEvent(platform="sherlock", contest_id=1001, summary="1001 only"),
+        ChangeEvent(platform="sherlock", contest_id=964, summary="964 second"),
+    ]
+
+    asyncio.run(_deliver(hub, *events))
+
+    received = {body["contest_id"]: body["summary"] for body in hook.received}
+    assert len(hook.received) == 2
+    assert received == {964: "964 first\n964 second", 1001: "1001 only"}